@@ -0,0 +1,117 @@
+import logging
+import time
+import asyncio
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class AccountCache:
+    """
+    Short-TTL cache of getAccountInfo results with request coalescing
+
+    All methods run on the RPC event loop, so the cache needs no locking.
+    Concurrent callers asking for the same account share one in-flight
+    request (singleflight).
+    """
+    def __init__(self, async_client, ttl=0.5, max_entries=4096):
+        """
+        Initialize account cache
+
+        Args:
+            async_client (AsyncClient): RPC client used for fetches
+            ttl (float): Seconds a fetched account stays valid
+            max_entries (int): Maximum number of cached accounts
+        """
+        self.async_client = async_client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (response, fetched_at)
+        self._inflight = {}  # key -> asyncio.Future
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(public_key, commitment, encoding):
+        if hasattr(public_key, 'value'):
+            public_key = public_key.value
+        return (str(public_key), commitment, encoding)
+
+    async def get(self, public_key, commitment="confirmed", encoding="base64"):
+        """
+        Get account info, from cache if fresh
+
+        Args:
+            public_key: Account public key
+            commitment (str): Commitment level
+            encoding (str): Account data encoding
+
+        Returns:
+            ClientResponse: Account info response
+        """
+        key = self._key(public_key, commitment, encoding)
+
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self.hits += 1
+            return entry[0]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self.async_client.get_account_info(key[0], encoding=encoding, commitment=commitment)
+            # Errors come back as an empty response; do not cache those
+            if response is not None and response.value is not None:
+                self._store(key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when no other caller is waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key, response):
+        self._entries[key] = (response, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, public_key, response, commitment="confirmed", encoding="base64"):
+        """Store a pushed account update (e.g. from accountSubscribe)"""
+        self._store(self._key(public_key, commitment, encoding), response)
+
+    def invalidate(self, public_key=None):
+        """
+        Drop cached entries
+
+        Args:
+            public_key: Account to drop (all commitments); drops everything if omitted
+        """
+        if public_key is None:
+            self._entries.clear()
+            return
+        if hasattr(public_key, 'value'):
+            public_key = public_key.value
+        for key in [key for key in self._entries if key[0] == str(public_key)]:
+            del self._entries[key]
+
+    def stats(self):
+        """Get hit/miss counters"""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced
+        }
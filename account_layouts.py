@@ -0,0 +1,152 @@
+import base64
+import struct
+import hashlib
+import logging
+import base58
+
+logger = logging.getLogger(__name__)
+
+def account_discriminator(name):
+    """Anchor account discriminator: sha256("account:<Name>")[:8]"""
+    return hashlib.sha256(f"account:{name}".encode('utf-8')).digest()[:8]
+
+class AccountLayout:
+    """
+    Precompiled binary layout of an Anchor account
+
+    Fields are unpacked straight out of the account buffer with
+    struct.unpack_from, after an 8-byte discriminator check, without
+    slicing or copying the buffer.
+    """
+    __slots__ = ('name', 'discriminator', 'fields', 'struct', 'size', '_b64_prefix')
+
+    def __init__(self, name, fields):
+        """
+        Initialize account layout
+
+        Args:
+            name (str): Anchor account name (determines the discriminator)
+            fields (list): (field name, struct format character) pairs, in order
+        """
+        self.name = name
+        self.discriminator = account_discriminator(name)
+        self.fields = tuple(field for field, _ in fields)
+        self.struct = struct.Struct('<' + ''.join(fmt for _, fmt in fields))
+        self.size = 8 + self.struct.size
+        # Base64 characters that cover the discriminator and every field
+        self._b64_prefix = -(-self.size // 3) * 4
+
+    def matches(self, buffer):
+        return len(buffer) >= self.size and buffer[:8] == self.discriminator
+
+    def unpack(self, buffer):
+        """
+        Unpack the layout's fields
+
+        Args:
+            buffer: bytes or memoryview of the account data
+
+        Returns:
+            tuple: Field values, or None if the discriminator does not match
+        """
+        if not self.matches(buffer):
+            return None
+        return self.struct.unpack_from(buffer, 8)
+
+    def head(self, data):
+        """
+        Get just enough decoded bytes to unpack the layout
+
+        Base64 account data is decoded only as far as the fields reach;
+        the rest of the payload stays encoded until someone asks for it.
+
+        Args:
+            data: Account data in any form RPC returns it (see account_data_bytes)
+
+        Returns:
+            memoryview: Leading account bytes, or None if the data is unusable
+        """
+        if isinstance(data, (list, tuple)) and len(data) == 2 and data[1] == 'base64':
+            data = data[0]
+        if isinstance(data, str):
+            try:
+                return memoryview(base64.b64decode(data[:self._b64_prefix]))
+            except ValueError:
+                return None
+        return memoryview(data) if data else None
+
+    def memcmp_filter(self):
+        """getProgramAccounts filter selecting accounts of this type"""
+        return {'memcmp': {'offset': 0, 'bytes': base58.b58encode(self.discriminator).decode('ascii')}}
+
+def account_data_bytes(data):
+    """
+    Decode account data as returned by RPC
+
+    Args:
+        data: [base64 string, "base64"], a base64 string, or bytes
+
+    Returns:
+        bytes: Raw account data, or None if the data is missing or not base64
+    """
+    if data is None:
+        return None
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    if isinstance(data, (list, tuple)):
+        if len(data) != 2 or data[1] != 'base64':
+            logger.warning(f"Unsupported account data encoding: {data[1] if len(data) > 1 else None}")
+            return None
+        data = data[0]
+    try:
+        return base64.b64decode(data)
+    except (TypeError, ValueError):
+        return None
+
+def account_data_field(account):
+    """Get the data field of an account value (RPC dict or AccountInfo-like object)"""
+    if account is None:
+        return None
+    if isinstance(account, dict):
+        return account.get('data')
+    return getattr(account, 'data', None)
+
+class RawAccountData:
+    """
+    Holds an account's raw data in the form RPC delivered it
+
+    Decoding to bytes and encoding to base64 both happen at most once,
+    and only when someone asks for them.
+    """
+    __slots__ = ('_data', '_bytes')
+
+    def __init__(self, data):
+        self._data = data
+        self._bytes = None
+
+    @property
+    def raw_bytes(self):
+        if self._bytes is None:
+            self._bytes = account_data_bytes(self._data)
+        return self._bytes
+
+    @property
+    def raw_data(self):
+        """Base64 account data, reusing the RPC payload when it already is base64"""
+        data = self._data
+        if isinstance(data, (list, tuple)) and len(data) == 2 and data[1] == 'base64':
+            return data[0]
+        if isinstance(data, str):
+            return data
+        raw = self.raw_bytes
+        return base64.b64encode(raw).decode('ascii') if raw is not None else None
+
+# Pump.fun bonding curve account
+BONDING_CURVE_LAYOUT = AccountLayout("BondingCurve", [
+    ('virtual_token_reserves', 'Q'),
+    ('virtual_sol_reserves', 'Q'),
+    ('real_token_reserves', 'Q'),
+    ('real_sol_reserves', 'Q'),
+    ('token_total_supply', 'Q'),
+    ('complete', '?'),
+])
@@ -0,0 +1,66 @@
+import logging
+import functools
+from wallet import PublicKey
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+ASSOCIATED_TOKEN_PROGRAM_ID = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+
+# Derived addresses never change, so an entry only leaves the cache when
+# enough other tokens and wallets have pushed it out
+CACHE_SIZE = 4096
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def bonding_curve_address(mint, program_id):
+    """
+    Bonding curve PDA of a token
+
+    Args:
+        mint (str): Token mint address
+        program_id (str): Pump.fun program ID
+
+    Returns:
+        PublicKey: Bonding curve account address
+    """
+    return PublicKey.find_program_address(["bonding_curve", mint], program_id)[0]
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def associated_token_address(owner, mint):
+    """
+    Associated token account of an owner for a mint
+
+    Args:
+        owner (str): Owner address (a wallet or the bonding curve)
+        mint (str): Token mint address
+
+    Returns:
+        PublicKey: Associated token account address
+    """
+    return PublicKey.find_program_address([owner, TOKEN_PROGRAM_ID, mint], ASSOCIATED_TOKEN_PROGRAM_ID)[0]
+
+def associated_bonding_curve(mint, program_id):
+    """Token account holding the bonding curve's unsold tokens"""
+    return associated_token_address(str(bonding_curve_address(mint, program_id)), mint)
+
+def warm(mint, owners, program_id):
+    """
+    Derive every address a campaign's trades need ahead of time
+
+    Args:
+        mint (str): Token mint address
+        owners (list): Wallet public keys that will trade the token
+        program_id (str): Pump.fun program ID
+    """
+    mint = str(mint)
+    associated_bonding_curve(mint, program_id)
+    for owner in owners:
+        associated_token_address(str(owner), mint)
+
+def cache_stats():
+    """Get hit/miss counters of the derivation caches"""
+    stats = {}
+    for name, cached in (('bonding_curve', bonding_curve_address), ('token_account', associated_token_address)):
+        info = cached.cache_info()
+        stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+    return stats
@@ -0,0 +1,154 @@
+import time
+import logging
+import threading
+from solana_client import get_event_loop
+from wallet import Transaction
+
+logger = logging.getLogger(__name__)
+
+class ArmedBuy:
+    """A finished buy for one wallet, kept signed against the current blockhash"""
+    def __init__(self, token_address, wallet, amount_sol, transaction, quote=None):
+        self.token_address = token_address
+        self.wallet = wallet
+        self.amount_sol = amount_sol
+        self.quote = quote
+        self.transaction = transaction  # unsigned template
+        # (blockhash, serialized transaction) - replaced as a whole on re-sign
+        self.signed = None
+
+class BuyArmer:
+    """
+    Prepares signed buy transactions ahead of the trigger
+
+    Accounts, PDA, instruction data and amount are built once when a buy is
+    armed. Every time the shared BlockhashProvider sees a new blockhash the
+    armed transactions are re-signed and re-serialized on the event loop, so
+    firing is a single sendTransaction of bytes that already exist.
+    """
+    def __init__(self, solana_client, pump_api):
+        """
+        Initialize buy armer
+
+        Args:
+            solana_client (SolanaClient): Client whose blockhash provider drives re-signing
+            pump_api (PumpFunAPI): Builds the buy transactions
+        """
+        self.solana_client = solana_client
+        self.pump_api = pump_api
+        self._armed = set()
+        self._lock = threading.Lock()
+        self.resigns = 0
+        self.fired = 0
+        self.stale_fires = 0
+        self._listening = False
+
+    def arm(self, token_address, wallet, amount_sol, slippage=10.0, quote=None):
+        """
+        Build and sign a buy so it can be fired later
+
+        Args:
+            token_address (str): Token mint address
+            wallet (Wallet): Wallet instance
+            amount_sol (float): Amount of SOL to spend
+            slippage (float): Slippage tolerance percentage
+            quote (dict): Bonding-curve quote fixing the token amount and max SOL cost (optional)
+
+        Returns:
+            ArmedBuy: The armed buy, or None if no blockhash is available
+        """
+        transaction = self.pump_api.build_buy_transaction(token_address, wallet, amount_sol, slippage, quote)
+        armed = ArmedBuy(str(token_address), wallet, amount_sol, transaction, quote)
+        blockhash = self.solana_client.get_blockhash()
+        if not blockhash:
+            logger.warning(f"Cannot arm buy for {token_address}: no recent blockhash")
+            return None
+
+        self._sign(armed, blockhash)
+        with self._lock:
+            self._armed.add(armed)
+            if not self._listening:
+                self._listening = True
+                get_event_loop().call_soon_threadsafe(
+                    self.solana_client.blockhash_provider.add_listener, self._on_blockhash)
+        return armed
+
+    def disarm(self, armed):
+        """Stop re-signing an armed buy"""
+        with self._lock:
+            self._armed.discard(armed)
+
+    def fire(self, armed, trace=None):
+        """
+        Send an armed buy
+
+        Args:
+            armed (ArmedBuy): Buy returned by arm()
+            trace (TradeTrace): Timeline to mark stages on (optional); sign only
+                                shows up if the buy had to be re-signed here
+
+        Returns:
+            tuple: (success, transaction_info or error message)
+        """
+        self.disarm(armed)
+        blockhash, payload = armed.signed
+        provider = self.solana_client.blockhash_provider
+        if blockhash != provider.blockhash or not provider.is_fresh():
+            # The rotation has not been picked up yet, or refreshes stalled and
+            # the blockhash is near expiry; sign inline rather than send a stale hash
+            self.stale_fires += 1
+            current = self.solana_client.get_blockhash()
+            if not current:
+                return False, "No recent blockhash available"
+            if trace is not None:
+                trace.mark('blockhash')
+            self._sign(armed, current)
+            blockhash, payload = armed.signed
+            if trace is not None:
+                trace.mark('sign')
+        elif trace is not None:
+            trace.mark('blockhash')
+
+        result = self.solana_client.send_raw_transaction(payload)
+        if trace is not None:
+            trace.mark('send')
+        signature = result.value if result is not None and hasattr(result, 'value') else None
+        if not signature:
+            return False, "Failed to send transaction"
+        self.fired += 1
+        return True, {
+            'transaction_hash': signature,
+            'amount_sol': armed.amount_sol,
+            'quote': armed.quote
+        }
+
+    def _sign(self, armed, blockhash):
+        # Sign a copy so a re-sign on the event loop never races an inline one
+        transaction = Transaction()
+        transaction.instructions = armed.transaction.instructions
+        armed.wallet.sign_with_blockhash(transaction, blockhash)
+        armed.signed = (blockhash, transaction.serialize())
+
+    def _on_blockhash(self, blockhash):
+        """Re-sign every armed buy (runs on the event loop)"""
+        with self._lock:
+            armed_buys = list(self._armed)
+        start = time.perf_counter()
+        for armed in armed_buys:
+            try:
+                self._sign(armed, blockhash)
+            except Exception as e:
+                logger.error(f"Error re-signing armed buy for {armed.token_address}: {str(e)}")
+        self.resigns += len(armed_buys)
+        if armed_buys:
+            logger.debug(f"Re-signed {len(armed_buys)} armed buy(s) in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def stats(self):
+        with self._lock:
+            armed = len(self._armed)
+        return {
+            'armed': armed,
+            'resigns': self.resigns,
+            'fired': self.fired,
+            'stale_fires': self.stale_fires
+        }
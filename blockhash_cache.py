@@ -0,0 +1,146 @@
+import logging
+import time
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+# Fastest a block is assumed to be produced; projecting block height at this
+# rate overestimates it, so a blockhash is retired early rather than late
+MIN_BLOCK_TIME = 0.4
+
+# Blocks of headroom kept before lastValidBlockHeight for the send to land
+SAFETY_BLOCKS = 10
+
+class BlockhashProvider:
+    """
+    Keeps a recent blockhash fresh in the background for all wallets
+
+    Freshness follows block height: each refresh also reads the node's
+    block height, which is projected forward from then on, and a blockhash
+    is retired SAFETY_BLOCKS before its lastValidBlockHeight. If refreshes
+    stall, the projection still runs, so an expired blockhash is never
+    handed out. max_age is only a backstop for nodes that report no height.
+    """
+    def __init__(self, async_client, refresh_interval=0.4, max_age=30.0, commitment="confirmed"):
+        """
+        Initialize blockhash provider
+
+        Args:
+            async_client (AsyncClient): RPC client used for refreshes
+            refresh_interval (float): Seconds between background refreshes
+            max_age (float): Age in seconds after which the cached blockhash
+                             is not used and a fresh one is fetched inline
+            commitment (str): Commitment level for getLatestBlockhash
+        """
+        self.async_client = async_client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.commitment = commitment
+        # (blockhash, last_valid_block_height, fetched_at, block_height) - replaced as a whole
+        self._current = None
+        self._task = None
+        self._listeners = []
+
+    @property
+    def blockhash(self):
+        current = self._current
+        return current[0] if current else None
+
+    @property
+    def last_valid_block_height(self):
+        current = self._current
+        return current[1] if current else None
+
+    def estimated_block_height(self):
+        """Block height now, projected from the last refresh (None if unknown)"""
+        current = self._current
+        if current is None or current[3] is None:
+            return None
+        return current[3] + int((time.monotonic() - current[2]) / MIN_BLOCK_TIME)
+
+    def is_fresh(self):
+        current = self._current
+        if current is None or time.monotonic() - current[2] >= self.max_age:
+            return False
+        last_valid = current[1]
+        height = self.estimated_block_height()
+        if last_valid is None or height is None:
+            return True
+        return height + SAFETY_BLOCKS <= last_valid
+
+    async def refresh(self):
+        """
+        Fetch the latest blockhash
+
+        Returns:
+            str: Blockhash, or None on error
+        """
+        # One round trip for the blockhash and the height it is measured against
+        batch = self.async_client.batch()
+        blockhash_result = batch.get_latest_blockhash(commitment=self.commitment)
+        height_result = batch.add("getBlockHeight", [{"commitment": self.commitment}])
+        await batch.execute()
+        response = blockhash_result.result()
+        height = height_result.result().get('result')
+        try:
+            value = response['result']['value']
+            previous = self.blockhash
+            self._current = (value['blockhash'], value.get('lastValidBlockHeight'), time.monotonic(),
+                             height if isinstance(height, int) else None)
+        except (KeyError, TypeError):
+            logger.warning(f"Blockhash refresh failed: {response.get('error', response)}")
+            return None
+        if value['blockhash'] != previous:
+            self._notify(value['blockhash'])
+        return value['blockhash']
+
+    def add_listener(self, callback):
+        """Call callback(blockhash) on the event loop whenever the blockhash rotates"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, blockhash):
+        for callback in list(self._listeners):
+            try:
+                callback(blockhash)
+            except Exception as e:
+                logger.error(f"Error in blockhash listener: {str(e)}")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing blockhash: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start background refreshes (must be called on the event loop)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        """Stop background refreshes (must be called on the event loop)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def get_blockhash(self):
+        """
+        Get a usable blockhash, fetching inline only if the cache is stale
+
+        Returns:
+            str: Blockhash, or None if no unexpired one could be fetched
+        """
+        self.start()
+        if self.is_fresh():
+            return self._current[0]
+        blockhash = await self.refresh()
+        if blockhash is not None and not self.is_fresh():
+            # A lagging node answered with a blockhash that is about to expire
+            logger.warning(f"Latest blockhash {blockhash} expires before a send could land")
+            return None
+        return blockhash
@@ -0,0 +1,230 @@
+import logging
+from account_layouts import BONDING_CURVE_LAYOUT, RawAccountData
+
+logger = logging.getLogger(__name__)
+
+LAMPORTS_PER_SOL = 10 ** 9
+TOKEN_DECIMALS = 6
+TOKEN_UNIT = 10 ** TOKEN_DECIMALS
+
+# Protocol fee charged on both sides of the curve, in basis points
+FEE_BASIS_POINTS = 100
+
+# Reserves every Pump.fun curve starts from
+INITIAL_VIRTUAL_TOKEN_RESERVES = 1_073_000_000_000_000
+INITIAL_VIRTUAL_SOL_RESERVES = 30_000_000_000
+INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+TOKEN_TOTAL_SUPPLY = 1_000_000_000_000_000
+
+def slippage_basis_points(slippage):
+    """Convert a slippage percentage (e.g. 10.0) to basis points"""
+    return max(0, int(round(slippage * 100)))
+
+class BondingCurve:
+    """
+    Reserves of a Pump.fun constant-product bonding curve
+
+    All amounts are integers in base units (lamports and raw token units),
+    and every quote uses the same integer floor division as the on-chain
+    program, so quotes match what a trade would actually fill at.
+    """
+    __slots__ = ('virtual_token_reserves', 'virtual_sol_reserves', 'real_token_reserves', 'real_sol_reserves',
+                 'token_total_supply', 'complete', 'fee_basis_points', '_raw')
+
+    def __init__(self, virtual_token_reserves, virtual_sol_reserves, real_token_reserves=None,
+                 real_sol_reserves=0, token_total_supply=TOKEN_TOTAL_SUPPLY, complete=False,
+                 fee_basis_points=FEE_BASIS_POINTS):
+        """
+        Initialize bonding curve
+
+        Args:
+            virtual_token_reserves (int): Virtual token reserves (raw units)
+            virtual_sol_reserves (int): Virtual SOL reserves (lamports)
+            real_token_reserves (int): Tokens left to sell on the curve (raw units)
+            real_sol_reserves (int): SOL held by the curve (lamports)
+            token_total_supply (int): Total token supply (raw units)
+            complete (bool): True once the curve has migrated and no longer trades
+            fee_basis_points (int): Protocol fee in basis points
+        """
+        self.virtual_token_reserves = virtual_token_reserves
+        self.virtual_sol_reserves = virtual_sol_reserves
+        self.real_token_reserves = (real_token_reserves if real_token_reserves is not None
+                                    else virtual_token_reserves)
+        self.real_sol_reserves = real_sol_reserves
+        self.token_total_supply = token_total_supply
+        self.complete = complete
+        self.fee_basis_points = fee_basis_points
+        self._raw = None
+
+    @classmethod
+    def initial(cls):
+        """Curve of a token that has just launched"""
+        return cls(INITIAL_VIRTUAL_TOKEN_RESERVES, INITIAL_VIRTUAL_SOL_RESERVES, INITIAL_REAL_TOKEN_RESERVES)
+
+    @classmethod
+    def from_account_data(cls, data):
+        """
+        Decode a bonding curve account
+
+        Only the bytes the layout covers are decoded; the full account data
+        is kept as delivered and decoded on first use of raw_bytes.
+
+        Args:
+            data: Account data as RPC returns it ([base64, "base64"]) or bytes
+
+        Returns:
+            BondingCurve: Decoded curve, or None if the data is not a bonding curve
+        """
+        head = BONDING_CURVE_LAYOUT.head(data)
+        fields = BONDING_CURVE_LAYOUT.unpack(head) if head is not None else None
+        if fields is None:
+            return None
+        virtual_token, virtual_sol, real_token, real_sol, supply, complete = fields
+        if virtual_token == 0 or virtual_sol == 0:
+            return None
+        curve = cls(virtual_token, virtual_sol, real_token, real_sol, supply, complete)
+        curve._raw = RawAccountData(data)
+        return curve
+
+    @property
+    def raw_bytes(self):
+        """Full account data, decoded on first access (None for computed curves)"""
+        return self._raw.raw_bytes if self._raw is not None else None
+
+    @property
+    def raw_data(self):
+        """Full account data as base64 (None for computed curves)"""
+        return self._raw.raw_data if self._raw is not None else None
+
+    def spot_price(self):
+        """Marginal price in SOL per whole token"""
+        return (self.virtual_sol_reserves * TOKEN_UNIT) / (self.virtual_token_reserves * LAMPORTS_PER_SOL)
+
+    def _fee(self, lamports):
+        return lamports * self.fee_basis_points // 10000
+
+    def quote_buy(self, lamports, slippage_bps=0):
+        """
+        Quote a buy spending a fixed amount of SOL (fee included)
+
+        Args:
+            lamports (int): SOL to spend including the fee
+            slippage_bps (int): Slippage tolerance in basis points
+
+        Returns:
+            dict: Quote with tokens out, fee, price impact and the slippage bound
+        """
+        # The fee is charged on top of the curve input: spend = input + fee(input)
+        sol_in = lamports * 10000 // (10000 + self.fee_basis_points)
+        tokens_out = self.virtual_token_reserves * sol_in // (self.virtual_sol_reserves + sol_in)
+        tokens_out = 0 if self.complete else min(tokens_out, self.real_token_reserves)
+        return self._quote(lamports, sol_in, tokens_out, self._fee(sol_in), slippage_bps, buy=True)
+
+    def quote_sell(self, tokens, slippage_bps=0):
+        """
+        Quote selling a fixed amount of tokens
+
+        Args:
+            tokens (int): Raw token units to sell
+            slippage_bps (int): Slippage tolerance in basis points
+
+        Returns:
+            dict: Quote with SOL out (after fee), fee, price impact and the slippage bound
+        """
+        sol_out = self.virtual_sol_reserves * tokens // (self.virtual_token_reserves + tokens)
+        fee = self._fee(sol_out)
+        return self._quote(tokens, sol_out, sol_out - fee, fee, slippage_bps, buy=False)
+
+    def _quote(self, amount_in, curve_amount, amount_out, fee, slippage_bps, buy):
+        spot = self.spot_price()
+        if buy:
+            tokens, lamports = amount_out, amount_in
+        else:
+            tokens, lamports = amount_in, amount_out
+        price = (lamports * TOKEN_UNIT) / (tokens * LAMPORTS_PER_SOL) if tokens else 0.0
+        quote = {
+            'amount_in': amount_in,
+            'amount_out': amount_out,
+            'fee': fee,
+            'price': price,
+            'price_impact': abs(price - spot) / spot if spot and price else 0.0,
+        }
+        if buy:
+            # Buy exactly amount_out tokens, paying at most max_sol_cost
+            quote['max_sol_cost'] = amount_in * (10000 + slippage_bps) // 10000
+            quote['min_amount_out'] = amount_out * (10000 - min(slippage_bps, 10000)) // 10000
+        else:
+            quote['min_sol_output'] = amount_out * (10000 - min(slippage_bps, 10000)) // 10000
+        quote['curve_amount'] = curve_amount
+        return quote
+
+    def after_buy(self, quote):
+        """Curve state once a quoted buy has filled"""
+        sol_in, tokens_out = quote['curve_amount'], quote['amount_out']
+        return BondingCurve(
+            self.virtual_token_reserves - tokens_out, self.virtual_sol_reserves + sol_in,
+            self.real_token_reserves - tokens_out, self.real_sol_reserves + sol_in,
+            self.token_total_supply, self.complete, self.fee_basis_points
+        )
+
+    def after_sell(self, quote):
+        """Curve state once a quoted sell has filled"""
+        tokens_in, sol_out = quote['amount_in'], quote['curve_amount']
+        return BondingCurve(
+            self.virtual_token_reserves + tokens_in, self.virtual_sol_reserves - sol_out,
+            self.real_token_reserves + tokens_in, self.real_sol_reserves - sol_out,
+            self.token_total_supply, self.complete, self.fee_basis_points
+        )
+
+    def quote_buys(self, amounts_lamports, slippage_bps=0, sequential=False):
+        """
+        Quote many buys in one call
+
+        Args:
+            amounts_lamports (list): SOL to spend per buy, including fees
+            slippage_bps (int): Slippage tolerance in basis points
+            sequential (bool): Each buy sees the curve moved by the buys before it
+                               (e.g. several wallets buying the same launch)
+
+        Returns:
+            list: One quote per amount
+        """
+        curve = self
+        quotes = []
+        for lamports in amounts_lamports:
+            quote = curve.quote_buy(lamports, slippage_bps)
+            quotes.append(quote)
+            if sequential:
+                curve = curve.after_buy(quote)
+        return quotes
+
+    def quote_sells(self, amounts_tokens, slippage_bps=0, sequential=False):
+        """
+        Quote many sells in one call
+
+        Args:
+            amounts_tokens (list): Raw token units to sell per sell
+            slippage_bps (int): Slippage tolerance in basis points
+            sequential (bool): Each sell sees the curve moved by the sells before it
+
+        Returns:
+            list: One quote per amount
+        """
+        curve = self
+        quotes = []
+        for tokens in amounts_tokens:
+            quote = curve.quote_sell(tokens, slippage_bps)
+            quotes.append(quote)
+            if sequential:
+                curve = curve.after_sell(quote)
+        return quotes
+
+    def to_dict(self):
+        return {
+            'virtual_token_reserves': self.virtual_token_reserves,
+            'virtual_sol_reserves': self.virtual_sol_reserves,
+            'real_token_reserves': self.real_token_reserves,
+            'real_sol_reserves': self.real_sol_reserves,
+            'token_total_supply': self.token_total_supply,
+            'complete': self.complete
+        }
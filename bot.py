@@ -1,307 +1,342 @@
-import os
-import time
 import threading
 import logging
-import configparser
-from datetime import datetime
 from wallet import Wallet
 from solana_client import SolanaClient
 from pump_api import PumpFunAPI
-from utils import calculate_profit_percentage
+from campaign import CampaignManager, SellRules
+from launch_detector import LaunchDetector, LaunchFilters
+from tx_history import TransactionHistory
+from trade_journal import TradeJournal
+from status_stream import publisher
+from bot_config import config_store
+import addresses
 
 logger = logging.getLogger(__name__)
 
 class PumpBot:
-    def __init__(self):
-        """Initialize Pump.fun sniper bot"""
-        self.running = False
-        self.token_address = None
+    def __init__(self, config_store=config_store):
+        """
+        Initialize Pump.fun sniper bot
+        
+        Args:
+            config_store (ConfigStore): Source of the parsed config (defaults to the shared store)
+        """
+        self.token_address = None  # Most recently started token
         self.wallets = []
         self.solana_client = None
         self.pump_api = None
+        self.campaigns = None
+        self.launch_detector = None
         self.config = None
-        self.thread = None
-        self.transactions = []
+        self.config_store = config_store
+        self.journal = None
+        self.transactions = TransactionHistory(100)
         self.lock = threading.Lock()
         self.test_mode = False  # Flag for test mode
+        self._client_settings = None  # (RpcConfig, campaign_workers) the client was built from
+        self._wallet_cache = {}  # private key -> Wallet on the current client
+        config_store.add_listener(self._on_config_reload)
+        publisher.touch()
     
     def load_config(self):
-        """Load configuration from config.ini"""
-        config = configparser.ConfigParser()
-        if not os.path.exists('config.ini'):
-            raise Exception("Config file not found! Please configure the bot first.")
-        
-        config.read('config.ini')
-        self.config = config
-        
-        # Initialize Solana client
-        rpc_url = config.get('SETTINGS', 'rpc_url', fallback='https://api.mainnet-beta.solana.com')
-        self.solana_client = SolanaClient(rpc_url)
-        
-        # Initialize Pump.fun API
-        self.pump_api = PumpFunAPI(self.solana_client)
+        """
+        Apply the current config
         
-        # Load wallets
-        self.wallets = []
-        for key, value in config['WALLETS'].items():
-            if key.startswith('wallet_') and value.strip():
-                wallet = Wallet(value.strip(), self.solana_client)
-                self.wallets.append(wallet)
-                
+        The config store parses config.ini once per change, so this only
+        compares settings: the client and wallets are rebuilt only when the
+        settings they were made from changed.
+        """
+        config = self.config_store.get()
+        with self.lock:
+            self._apply_config(config)
+            
         if not self.wallets:
             raise Exception("No wallets configured! Please add at least one wallet.")
             
-        logger.info(f"Loaded {len(self.wallets)} wallet(s)")
-        
         return True
         
-    def start(self, token_address):
-        """Start the sniper bot with the specified token"""
-        if self.running:
-            return False, "Bot is already running"
+    def _on_config_reload(self, config, previous):
+        """Pick up an edited config.ini once the bot has been configured"""
+        if self.config is None:
+            return
+        with self.lock:
+            self._apply_config(config)
+            
+    def _apply_config(self, config):
+        """Bring the journal, client and wallets in line with a config (call with self.lock held)"""
+        changed = config is not self.config
+        self.config = config
+        
+        # The journal outlives clients and campaigns; it is opened once
+        if self.journal is None and config.journal_path:
+            self.journal = TradeJournal(config.journal_path)
+            self.transactions.journal = self.journal
+            
+        # Running campaigns keep the shared client; RPC settings apply once idle
+        client_settings = (config.rpc, config.campaign_workers)
+        if self.solana_client is None or (client_settings != self._client_settings and not self.running):
+            # Release the previous client's connection pool
+            if self.campaigns:
+                self.campaigns.shutdown()
+            if self.solana_client:
+                self.solana_client.close()
+                
+            # Initialize Solana client
+            rpc = config.rpc
+            self.solana_client = SolanaClient(rpc.url, hedge=rpc.hedge, ws_url=rpc.ws_url, rate_limit=rpc.rate_limit)
+            self.solana_client.start_blockhash_refresh()
+            self._client_settings = client_settings
+            
+            # Initialize Pump.fun API
+            self.pump_api = PumpFunAPI(self.solana_client)
             
+            # Every campaign shares the client, its caches and the worker pool
+            self.campaigns = CampaignManager(self.solana_client, self.pump_api, max_workers=config.campaign_workers,
+                                             journal=self.journal)
+            
+            # Wallets are bound to the client they were made with
+            self._wallet_cache = {}
+            changed = True
+            
+        # Reuse wallets whose key is still configured
+        if changed or len(self.wallets) != len(config.wallet_keys):
+            wallets = []
+            for key in config.wallet_keys:
+                wallet = self._wallet_cache.get(key)
+                if wallet is None:
+                    wallet = Wallet(key, self.solana_client)
+                wallets.append(wallet)
+            self._wallet_cache = dict(zip(config.wallet_keys, wallets))
+            self.wallets = wallets
+            logger.info(f"Loaded {len(self.wallets)} wallet(s)")
+            publisher.touch()
+            
+    @property
+    def running(self):
+        """True while any campaign is active or launches are being watched"""
+        if self.launch_detector is not None and self.launch_detector.running:
+            return True
+        return self.campaigns is not None and self.campaigns.active_count() > 0
+        
+    def start(self, token_address):
+        """Start a campaign for the specified token, alongside any already running"""
+        token_address = str(token_address)
+        if self.campaigns is not None:
+            campaign = self.campaigns.get_campaign(token_address)
+            if campaign is not None and campaign.running:
+                return False, f"Already monitoring token {token_address}"
+                
         try:
             # Load configuration
             self.load_config()
             
+            self.campaigns.add_campaign(token_address, **self._campaign_settings())
             self.token_address = token_address
-            self.running = True
-            self.transactions = []
-            
-            # Start bot in a separate thread
-            self.thread = threading.Thread(target=self._run)
-            self.thread.daemon = True
-            self.thread.start()
             
             logger.info(f"Bot started for token: {token_address}")
+            self.publish_summary()
             return True, f"Monitoring token {token_address} with {len(self.wallets)} wallet(s)"
         except Exception as e:
             logger.error(f"Failed to start bot: {str(e)}")
-            self.running = False
             return False, str(e)
     
-    def stop(self):
-        """Stop the bot"""
-        self.running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=2.0)
-        logger.info("Bot stopped")
+    def _campaign_settings(self):
+        """Campaign arguments (wallets, amounts, sell rules) from the loaded config"""
+        return {
+            'wallets': self.wallets,
+            'amounts': self.config.amounts_for(len(self.wallets)),
+            'sell_rules': SellRules.from_config(self.config),
+            'slippage': self.config.slippage,
+            'buy_delay': self.config.buy_delay,
+            'fan_out': self.config.fan_out,
+            'armed': self.config.armed_buys
+        }
         
-    def get_status(self):
-        """Get current bot status"""
-        with self.lock:
-            return {
-                'running': self.running,
-                'token': self.token_address,
-                'wallets': len(self.wallets) if self.wallets else 0,
-                'transactions': self.transactions
-            }
+    def start_launch_detector(self):
+        """Watch the Pump.fun program and start a campaign for every matching launch"""
+        if self.launch_detector is not None and self.launch_detector.running:
+            return False, "Launch detector is already running"
             
-    def add_transaction(self, wallet_idx, tx_type, amount, token_amount=None, tx_hash=None):
-        """Add a transaction to the history"""
-        with self.lock:
-            tx = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'wallet': f"Wallet {wallet_idx+1}",
-                'type': tx_type,
-                'amount': amount,
-                'token_amount': token_amount,
-                'tx_hash': tx_hash
-            }
-            self.transactions.append(tx)
-            # Keep only the latest 100 transactions
-            if len(self.transactions) > 100:
-                self.transactions = self.transactions[-100:]
-    
-    def _run(self):
-        """Main bot loop"""
         try:
-            logger.info(f"Bot running for token: {self.token_address}")
-            
-            # Get configuration values
-            slippage = self.config.getfloat('SETTINGS', 'slippage', fallback=10.0)
-            buy_delay = self.config.getfloat('SETTINGS', 'buy_delay', fallback=2.0)
-            
-            # Buy amounts for each wallet
-            buy_amounts = []
-            for i in range(1, 5):
-                amount_key = f'amount{i}'
-                if amount_key in self.config['BUY_AMOUNTS']:
-                    buy_amounts.append(self.config.getfloat('BUY_AMOUNTS', amount_key))
+            self.load_config()
             
-            # Ensure we have enough buy amounts for all wallets
-            while len(buy_amounts) < len(self.wallets):
-                buy_amounts.append(0.01)  # Default amount
-                
-            # Check if token exists on Pump.fun
-            token_info = self.pump_api.get_token_info(self.token_address)
+            # Snapshot the settings so launches are handed off without touching the config
+            settings = self._campaign_settings()
+            max_campaigns = self.config.launch_filters.max_campaigns
             
-            if not token_info:
-                logger.info(f"Token {self.token_address} not yet available on Pump.fun. Waiting for launch...")
-                
-            # Buy tokens for each wallet
-            buy_results = {}
-            for wallet_idx, wallet in enumerate(self.wallets):
-                if not self.running:
-                    break
-                    
-                buy_amount = buy_amounts[wallet_idx]
-                
-                # Skip wallets with 0 buy amount
-                if buy_amount <= 0:
-                    continue
-                    
-                # Check wallet balance
-                balance = wallet.get_balance()
-                if balance < buy_amount:
-                    logger.warning(f"Wallet {wallet_idx+1} has insufficient balance: {balance} SOL, need {buy_amount} SOL")
-                    self.add_transaction(wallet_idx, "ERROR", buy_amount, 
-                                        tx_hash=None, 
-                                        token_amount=f"Insufficient balance: {balance} SOL")
-                    continue
-                
-                logger.info(f"Buying with wallet {wallet_idx+1}, amount: {buy_amount} SOL")
-                
-                # Add buy delay
-                if buy_delay > 0 and wallet_idx > 0:
-                    time.sleep(buy_delay)
-                    
-                # Buy token
-                success, tx_info = self.pump_api.buy_token(self.token_address, wallet, buy_amount, slippage)
-                
-                if success:
-                    logger.info(f"Buy successful for wallet {wallet_idx+1}: {tx_info}")
-                    buy_results[wallet_idx] = tx_info
-                    self.add_transaction(wallet_idx, "BUY", buy_amount, 
-                                        tx_hash=tx_info.get('transaction_hash'), 
-                                        token_amount=tx_info.get('token_amount'))
-                else:
-                    logger.error(f"Buy failed for wallet {wallet_idx+1}: {tx_info}")
-                    self.add_transaction(wallet_idx, "BUY FAILED", buy_amount, 
-                                        tx_hash=None, 
-                                        token_amount=f"Error: {tx_info}")
-            
-            # If no buys were successful, exit
-            if not buy_results:
-                logger.warning("No successful buys, stopping bot")
-                self.running = False
-                return
-                
-            # Monitor and execute auto-sell
-            self._monitor_and_sell(buy_results)
+            def on_launch(event):
+                if self.campaigns.active_count() >= max_campaigns:
+                    logger.warning(f"Skipping launch {event.mint}: {max_campaigns} campaigns already active")
+                    return
+                self.campaigns.add_campaign(
+                    event.mint,
+                    detected_at=event.detected_at,
+                    on_submitted=lambda submitted_at: detector.record_submission(event, submitted_at),
+                    **settings
+                )
+                self.token_address = event.mint
                 
+            detector = LaunchDetector(
+                self.solana_client,
+                on_launch,
+                filters=LaunchFilters.from_config(self.config),
+                record_path=self.config.launch_filters.record_path
+            )
+            if not detector.start():
+                return False, "Could not subscribe to program logs"
+            self.launch_detector = detector
+            self.publish_summary()
+            return True, f"Watching for new launches with {len(self.wallets)} wallet(s)"
         except Exception as e:
-            logger.error(f"Error in bot thread: {str(e)}")
-        finally:
-            self.running = False
-            logger.info("Bot thread stopped")
+            logger.error(f"Failed to start launch detector: {str(e)}")
+            return False, str(e)
+            
+    def stop_launch_detector(self):
+        """Stop watching for launches; campaigns already started keep running"""
+        if self.launch_detector is not None:
+            self.launch_detector.stop()
+            self.publish_summary()
             
-    def _monitor_and_sell(self, buy_results):
-        """Monitor token price and sell based on conditions"""
+    def stop(self, token_address=None):
+        """Stop one campaign, or every campaign if no token is given"""
+        if not token_address:
+            self.stop_launch_detector()
+        if self.campaigns is None:
+            return
+        if token_address:
+            self.campaigns.stop_campaign(token_address)
+        else:
+            self.campaigns.stop_all()
+        logger.info("Bot stopped")
+        self.publish_summary()
         
-        # Get sell conditions from config
-        profit_threshold = self.config.getfloat('SELL_CONDITIONS', 'profit_percentage', fallback=50.0)
-        timeout_seconds = self.config.getfloat('SELL_CONDITIONS', 'timeout_seconds', fallback=300.0)
-        min_buyers = self.config.getint('SELL_CONDITIONS', 'num_buyers', fallback=10)
+    def remove_campaign(self, token_address):
+        """Stop a campaign and drop it from the status list"""
+        return self.campaigns is not None and self.campaigns.remove_campaign(token_address)
         
-        logger.info(f"Monitoring for sell conditions: profit >= {profit_threshold}%, timeout: {timeout_seconds}s, buyers: {min_buyers}")
+    def get_campaign_status(self, token_address):
+        """Get one campaign's status, or None if unknown"""
+        return self.campaigns.get_status(token_address) if self.campaigns is not None else None
         
-        # Start time for timeout calculation
-        start_time = time.time()
+    def counters_key(self):
+        """
+        Fingerprint of the summary counters that change without a status event
         
-        slippage = self.config.getfloat('SETTINGS', 'slippage', fallback=10.0)
+        Detector, armed-buy and journal counters move on every notification,
+        re-sign and commit, too often to publish; /bot_status folds this key
+        into its cache key and ETag instead, so those counters are never stale.
         
-        while self.running and time.time() - start_time < timeout_seconds:
-            try:
-                # Get current token info
-                token_info = self.pump_api.get_token_info(self.token_address)
-                
-                if not token_info:
-                    logger.warning("Could not get token info, retrying...")
-                    time.sleep(5)
-                    continue
-                
-                current_price = token_info.get('price', 0)
-                buyers_count = token_info.get('buyers_count', 0)
-                
-                # Check sell conditions for each wallet that bought successfully
-                for wallet_idx, buy_info in buy_results.items():
-                    # Skip already sold positions
-                    if buy_info.get('sold', False):
-                        continue
-                        
-                    buy_price = buy_info.get('price', 0)
-                    profit_percentage = calculate_profit_percentage(buy_price, current_price)
-                    
-                    # Check if sell conditions are met
-                    sell_reason = None
-                    if profit_percentage >= profit_threshold:
-                        sell_reason = f"Profit target reached: {profit_percentage:.2f}%"
-                    elif buyers_count >= min_buyers:
-                        sell_reason = f"Buyer count target reached: {buyers_count} buyers"
-                    elif time.time() - start_time >= timeout_seconds:
-                        sell_reason = f"Timeout reached: {int(time.time() - start_time)}s"
-                        
-                    if sell_reason:
-                        logger.info(f"Selling token for wallet {wallet_idx+1}: {sell_reason}")
-                        
-                        wallet = self.wallets[wallet_idx]
-                        token_balance = buy_info.get('token_amount', 0)
-                        
-                        # Sell token
-                        success, tx_info = self.pump_api.sell_token(self.token_address, wallet, token_balance, slippage)
-                        
-                        if success:
-                            logger.info(f"Sell successful for wallet {wallet_idx+1}: {tx_info}")
-                            self.add_transaction(wallet_idx, "SELL", tx_info.get('amount_sol', 0), 
-                                                tx_hash=tx_info.get('transaction_hash'), 
-                                                token_amount=token_balance)
-                            buy_info['sold'] = True
-                        else:
-                            logger.error(f"Sell failed for wallet {wallet_idx+1}: {tx_info}")
-                            self.add_transaction(wallet_idx, "SELL FAILED", 0, 
-                                                tx_hash=None, 
-                                                token_amount=f"Error: {tx_info}")
-                
-                # Check if all positions are sold
-                all_sold = all(buy_info.get('sold', False) for buy_info in buy_results.values())
-                if all_sold:
-                    logger.info("All positions sold, stopping bot")
-                    self.running = False
-                    break
-                    
-                # Sleep to avoid hammering the API
-                time.sleep(5)
-                
-            except Exception as e:
-                logger.error(f"Error in monitoring thread: {str(e)}")
-                time.sleep(5)
-                
-        # Force sell any remaining positions at timeout
-        if self.running:
-            logger.info("Timeout reached, selling remaining positions")
+        Returns:
+            tuple: Current counter values
+        """
+        key = ()
+        detector = self.launch_detector
+        if detector is not None:
+            key += (detector.running, detector.notifications, detector.detected, detector.filtered,
+                    detector.launched, detector.latency.count)
+        if self.campaigns is not None:
+            key += tuple(self.campaigns.armer.stats().values())
+        if self.journal is not None:
+            key += tuple(self.journal.stats().values())
+        return key
+        
+    def get_summary(self):
+        """Get bot status without the transaction history or campaign list"""
+        return {
+            'running': self.running,
+            'token': self.token_address,
+            'wallets': len(self.wallets) if self.wallets else 0,
+            'launch_detector': self.launch_detector.stats() if self.launch_detector is not None else None,
+            'armed_buys': self.campaigns.armer.stats() if self.campaigns is not None else None,
+            'journal': self.journal.stats() if self.journal is not None else None
+        }
+        
+    def get_status(self):
+        """Get current bot status"""
+        status = self.get_summary()
+        status['transactions'] = [tx.to_dict() for tx in self.recent_transactions()]
+        status['last_seq'] = status['transactions'][-1]['seq'] if status['transactions'] else 0
+        status['campaigns'] = (self.campaigns.get_statuses(include_transactions=False)
+                               if self.campaigns is not None else [])
+        return status
+        
+    def collect_metrics(self):
+        """
+        Gauges and cache counters read at scrape time (see metrics.render)
+        
+        Returns:
+            list: (name, kind, help, [(labels dict, value)]) metric families
+        """
+        def ratio(hits, misses):
+            return hits / (hits + misses) if hits + misses else None
             
-            for wallet_idx, buy_info in buy_results.items():
-                if buy_info.get('sold', False):
-                    continue
-                    
-                wallet = self.wallets[wallet_idx]
-                token_balance = buy_info.get('token_amount', 0)
-                
-                logger.info(f"Selling remaining token for wallet {wallet_idx+1} (timeout)")
-                
-                # Sell token
-                success, tx_info = self.pump_api.sell_token(self.token_address, wallet, token_balance, slippage)
-                
-                if success:
-                    logger.info(f"Timeout sell successful for wallet {wallet_idx+1}: {tx_info}")
-                    self.add_transaction(wallet_idx, "SELL (TIMEOUT)", tx_info.get('amount_sol', 0), 
-                                        tx_hash=tx_info.get('transaction_hash'), 
-                                        token_amount=token_balance)
-                else:
-                    logger.error(f"Timeout sell failed for wallet {wallet_idx+1}: {tx_info}")
-                    self.add_transaction(wallet_idx, "SELL FAILED (TIMEOUT)", 0, 
-                                        tx_hash=None, 
-                                        token_amount=f"Error: {tx_info}")
+        families = []
+        if self.solana_client is not None:
+            cache = self.solana_client.account_cache.stats()
+            families += [
+                ('pumpbot_account_cache_hits_total', 'counter', 'Account reads served from the cache',
+                 [({}, cache['hits'])]),
+                ('pumpbot_account_cache_misses_total', 'counter', 'Account reads that went to RPC',
+                 [({}, cache['misses'])]),
+                ('pumpbot_account_cache_coalesced_total', 'counter', 'Account reads that joined an in-flight fetch',
+                 [({}, cache['coalesced'])]),
+                ('pumpbot_account_cache_hit_ratio', 'gauge', 'Share of account reads served from the cache',
+                 [({}, ratio(cache['hits'], cache['misses']))]),
+            ]
+        derivations = addresses.cache_stats()
+        families += [
+            ('pumpbot_address_cache_hits_total', 'counter', 'Address derivations served from the cache',
+             [({'cache': name}, stats['hits']) for name, stats in derivations.items()]),
+            ('pumpbot_address_cache_misses_total', 'counter', 'Addresses that had to be derived',
+             [({'cache': name}, stats['misses']) for name, stats in derivations.items()]),
+            ('pumpbot_address_cache_hit_ratio', 'gauge', 'Share of address lookups served from the cache',
+             [({'cache': name}, ratio(stats['hits'], stats['misses'])) for name, stats in derivations.items()]),
+            ('pumpbot_status_subscribers', 'gauge', 'Connected status streams',
+             [({}, publisher.stats()['subscribers'])]),
+        ]
+        if self.campaigns is not None:
+            families += [
+                ('pumpbot_campaigns_active', 'gauge', 'Campaigns buying or monitoring',
+                 [({}, self.campaigns.active_count())]),
+                ('pumpbot_armed_buys', 'gauge', 'Buys signed and waiting to fire',
+                 [({}, self.campaigns.armer.stats()['armed'])]),
+            ]
+        if self.journal is not None:
+            families.append(('pumpbot_journal_queued', 'gauge', 'Trades waiting to be written to the journal',
+                             [({}, self.journal.stats()['queued'])]))
+        return families
+        
+    def publish_summary(self):
+        """Push the bot summary to connected status streams"""
+        publisher.publish('status', self.get_summary)
+            
+    def recent_transactions(self, limit=100):
+        """
+        Snapshot of the latest transactions across the bot and every campaign
+        
+        Args:
+            limit (int): Maximum number of transactions
             
-            self.running = False
+        Returns:
+            list: TransactionRecord instances, oldest first
+        """
+        records = list(self.transactions.snapshot())
+        if self.campaigns is not None:
+            records.extend(self.campaigns.transactions())
+            records.sort(key=lambda record: record.seq)
+        return records[-limit:]
+        
+    def get_trades(self, **filters):
+        """
+        Page through the trade journal (see TradeJournal.query for filters)
+        
+        Returns:
+            tuple: (list of trade dicts, next_cursor or None on the last page)
+        """
+        if self.journal is None:
+            return [], None
+        return self.journal.query(**filters)
+        
+    def add_transaction(self, wallet_idx, tx_type, amount, token_amount=None, tx_hash=None):
+        """Add a transaction to the history"""
+        return self.transactions.append(wallet_idx, tx_type, amount, token_amount, tx_hash)
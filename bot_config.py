@@ -0,0 +1,312 @@
+import os
+import re
+import logging
+import threading
+import configparser
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Tuple, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = 'config.ini'
+DEFAULT_RPC_URL = 'https://api.mainnet-beta.solana.com'
+
+# Buy amount used for wallets without an amountN entry
+DEFAULT_BUY_AMOUNT = 0.01
+
+class ConfigError(Exception):
+    """The config file is missing or holds an invalid value"""
+
+@dataclass(frozen=True)
+class RpcConfig:
+    """Settings a SolanaClient is built from; equal settings can share a client"""
+    url: str = DEFAULT_RPC_URL
+    ws_url: Optional[str] = None
+    hedge: int = 1
+    rate_limit: float = 50.0
+
+@dataclass(frozen=True)
+class SellConfig:
+    profit_percentage: float = 50.0
+    timeout_seconds: float = 300.0
+    num_buyers: int = 10
+
+@dataclass(frozen=True)
+class LaunchFilterConfig:
+    name_pattern: Optional[str] = None
+    symbol_pattern: Optional[str] = None
+    allow_creators: Tuple[str, ...] = ()
+    deny_creators: Tuple[str, ...] = ()
+    require_uri: bool = False
+    max_campaigns: int = 20
+    record_path: Optional[str] = None
+
+@dataclass(frozen=True)
+class BotConfig:
+    """
+    Validated, immutable view of config.ini
+
+    Built once per version of the file and shared by everyone who needs a
+    setting; nothing re-reads or re-parses the file to look one up.
+    """
+    rpc: RpcConfig
+    wallet_keys: Tuple[str, ...]
+    buy_amounts: Tuple[float, ...]
+    sell: SellConfig
+    launch_filters: LaunchFilterConfig
+    slippage: float = 10.0
+    buy_delay: float = 2.0
+    fan_out: bool = True
+    armed_buys: bool = True
+    campaign_workers: int = 32
+    journal_path: Optional[str] = 'trades.db'
+    # Raw section values, read-only, for the settings form
+    sections: Mapping[str, Mapping[str, str]] = field(default_factory=lambda: MappingProxyType({}),
+                                                      compare=False, repr=False)
+
+    @classmethod
+    def from_parser(cls, parser):
+        """
+        Build a config from a parsed config.ini
+
+        Raises:
+            ConfigError: If a value has the wrong type or is out of range
+        """
+        def get(section, key, cast=str, fallback=None, check=None, message=None):
+            if not parser.has_option(section, key):
+                return fallback
+            raw = parser.get(section, key).strip()
+            if raw == '':
+                return fallback
+            try:
+                value = cast(raw)
+            except ValueError:
+                raise ConfigError(f"[{section}] {key} = {raw!r} is not a valid {cast.__name__}")
+            if check is not None and not check(value):
+                raise ConfigError(f"[{section}] {key} = {raw!r}: {message}")
+            return value
+
+        def boolean(raw):
+            value = parser.BOOLEAN_STATES.get(raw.lower())
+            if value is None:
+                raise ValueError(raw)
+            return value
+        boolean.__name__ = 'boolean'
+
+        def addresses(key):
+            value = get('LAUNCH_FILTERS', key, fallback='')
+            return tuple(address.strip() for address in value.split(',') if address.strip())
+
+        def pattern(key):
+            value = get('LAUNCH_FILTERS', key)
+            if value is not None:
+                try:
+                    re.compile(value)
+                except re.error as e:
+                    raise ConfigError(f"[LAUNCH_FILTERS] {key} = {value!r} is not a valid regex: {e}")
+            return value
+
+        non_negative = (lambda value: value >= 0, "must not be negative")
+        positive = (lambda value: value > 0, "must be positive")
+
+        rpc_url = get('SETTINGS', 'rpc_url', fallback=DEFAULT_RPC_URL)
+        if not rpc_url.startswith(('http://', 'https://')):
+            raise ConfigError(f"[SETTINGS] rpc_url = {rpc_url!r} is not an http(s) URL")
+
+        wallet_keys = ()
+        if parser.has_section('WALLETS'):
+            wallet_keys = tuple(value.strip() for key, value in parser.items('WALLETS')
+                                if key.startswith('wallet_') and value.strip())
+
+        # amount1..amount4; wallets past the last amount get the default
+        buy_amounts = []
+        for i in range(1, 5):
+            amount = get('BUY_AMOUNTS', f'amount{i}', float, None, *non_negative)
+            if amount is not None:
+                buy_amounts.append(amount)
+
+        return cls(
+            rpc=RpcConfig(
+                url=rpc_url,
+                ws_url=get('SETTINGS', 'ws_url'),
+                hedge=get('SETTINGS', 'rpc_hedge', int, 1, *positive),
+                rate_limit=get('SETTINGS', 'rpc_rate_limit', float, 50.0, *positive)
+            ),
+            wallet_keys=wallet_keys,
+            buy_amounts=tuple(buy_amounts),
+            sell=SellConfig(
+                profit_percentage=get('SELL_CONDITIONS', 'profit_percentage', float, 50.0),
+                timeout_seconds=get('SELL_CONDITIONS', 'timeout_seconds', float, 300.0, *positive),
+                num_buyers=get('SELL_CONDITIONS', 'num_buyers', int, 10, *non_negative)
+            ),
+            launch_filters=LaunchFilterConfig(
+                name_pattern=pattern('name_pattern'),
+                symbol_pattern=pattern('symbol_pattern'),
+                allow_creators=addresses('allow_creators'),
+                deny_creators=addresses('deny_creators'),
+                require_uri=get('LAUNCH_FILTERS', 'require_uri', boolean, False),
+                max_campaigns=get('LAUNCH_FILTERS', 'max_campaigns', int, 20, *positive),
+                record_path=get('LAUNCH_FILTERS', 'record_path')
+            ),
+            slippage=get('SETTINGS', 'slippage', float, 10.0, *non_negative),
+            buy_delay=get('SETTINGS', 'buy_delay', float, 2.0, *non_negative),
+            fan_out=get('SETTINGS', 'fan_out', boolean, True),
+            armed_buys=get('SETTINGS', 'armed_buys', boolean, True),
+            campaign_workers=get('SETTINGS', 'campaign_workers', int, 32, *positive),
+            # An explicitly empty journal_path turns the journal off
+            journal_path=(parser.get('SETTINGS', 'journal_path').strip() or None
+                          if parser.has_option('SETTINGS', 'journal_path') else 'trades.db'),
+            sections=MappingProxyType({
+                section: MappingProxyType(dict(parser.items(section))) for section in parser.sections()
+            })
+        )
+
+    def amounts_for(self, wallet_count):
+        """Buy amount per wallet, padding wallets without an amount with the default"""
+        amounts = list(self.buy_amounts)
+        while len(amounts) < wallet_count:
+            amounts.append(DEFAULT_BUY_AMOUNT)
+        return amounts
+
+    # Read-only configparser-style access for templates
+
+    def has_section(self, section):
+        return section in self.sections
+
+    def __getitem__(self, section):
+        return self.sections[section]
+
+class ConfigStore:
+    """
+    Holds the current BotConfig and swaps in a new one when the file changes
+
+    The file is parsed only when its modification time or size moves. A new
+    config replaces the old one with a single reference assignment, so
+    readers always see one complete version. A file that fails validation is
+    logged and ignored; the last good config stays in effect.
+    """
+    def __init__(self, path=DEFAULT_CONFIG_PATH, poll_interval=1.0):
+        """
+        Initialize config store
+
+        Args:
+            path (str): Config file path
+            poll_interval (float): Seconds between checks of the file while watching
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.current = None
+        self.reloads = 0
+        self._stamp = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def add_listener(self, callback):
+        """Call callback(new_config, old_config) after every reload"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self, force=False):
+        """
+        Re-read the file if it changed since the last load
+
+        Returns:
+            bool: True if a new config was loaded
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp is None or (stamp == self._stamp and not force):
+                return False
+            parser = configparser.ConfigParser()
+            try:
+                parser.read(self.path)
+                config = BotConfig.from_parser(parser)
+            except (configparser.Error, ConfigError) as e:
+                # Remember the stamp so a broken file is reported once, not every tick
+                self._stamp = stamp
+                logger.error(f"Ignoring invalid config {self.path}: {str(e)}")
+                return False
+            self._stamp = stamp
+            previous, self.current = self.current, config
+            self.reloads += 1
+
+        if previous is not None:
+            logger.info(f"Reloaded {self.path}")
+        for callback in list(self._listeners):
+            try:
+                callback(config, previous)
+            except Exception as e:
+                logger.error(f"Error applying reloaded config: {str(e)}")
+        return True
+
+    def get(self):
+        """
+        Get the current config
+
+        Without a watcher running, the file's modification time is checked
+        first (a stat, not a parse).
+
+        Raises:
+            ConfigError: If no valid config has been loaded
+        """
+        if self._watcher is None:
+            self.reload()
+        config = self.current
+        if config is None:
+            if self._file_stamp() is None:
+                raise ConfigError("Config file not found! Please configure the bot first.")
+            raise ConfigError(f"Config file {self.path} is invalid; see the log for details")
+        return config
+
+    def start_watching(self):
+        """Reload in the background whenever the file changes"""
+        if self._watcher is not None:
+            return
+        self.reload()
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        self._watcher = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Error watching {self.path}: {str(e)}")
+
+    def write(self, parser):
+        """
+        Replace the config file and load it right away
+
+        The file is written beside the original and renamed over it, so the
+        watcher never reads a half-written file.
+
+        Raises:
+            ConfigError: If the new settings do not validate (the file is left untouched)
+        """
+        BotConfig.from_parser(parser)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            parser.write(f)
+        os.replace(temp_path, self.path)
+        self.reload(force=True)
+
+# Shared by the web app and the bot
+config_store = ConfigStore()
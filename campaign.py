@@ -0,0 +1,775 @@
+import time
+import heapq
+import itertools
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils import calculate_profit_percentage
+from armed_buys import BuyArmer
+from tx_history import TransactionHistory
+from status_stream import publisher
+from metrics import SEND_TO_CONFIRM, BUY_FAN_OUT, MONITOR_LAG, TIMER_LAG
+from trade_trace import traces
+
+logger = logging.getLogger(__name__)
+
+# Campaign states
+PENDING = "pending"
+BUYING = "buying"
+MONITORING = "monitoring"
+DONE = "done"
+STOPPED = "stopped"
+
+ACTIVE_STATES = (PENDING, BUYING, MONITORING)
+
+class SellRules:
+    """Exit conditions for a campaign's positions"""
+    def __init__(self, profit_percentage=50.0, timeout_seconds=300.0, num_buyers=10):
+        """
+        Initialize sell rules
+
+        Args:
+            profit_percentage (float): Sell once profit reaches this percentage
+            timeout_seconds (float): Sell everything this long after buying
+            num_buyers (int): Sell once the token has this many buyers
+        """
+        self.profit_percentage = profit_percentage
+        self.timeout_seconds = timeout_seconds
+        self.num_buyers = num_buyers
+
+    @classmethod
+    def from_config(cls, config):
+        """Build sell rules from a BotConfig's SELL_CONDITIONS settings"""
+        return cls(
+            profit_percentage=config.sell.profit_percentage,
+            timeout_seconds=config.sell.timeout_seconds,
+            num_buyers=config.sell.num_buyers
+        )
+
+    def sell_reason(self, profit_percentage, buyers_count):
+        """
+        Check whether a position should be sold
+
+        Returns:
+            str: Reason to sell, or None to keep holding
+        """
+        if profit_percentage >= self.profit_percentage:
+            return f"Profit target reached: {profit_percentage:.2f}%"
+        # Sources without a buyer count (decoded curves) report None
+        if buyers_count is not None and buyers_count >= self.num_buyers:
+            return f"Buyer count target reached: {buyers_count} buyers"
+        return None
+
+    def to_dict(self):
+        return {
+            'profit_percentage': self.profit_percentage,
+            'timeout_seconds': self.timeout_seconds,
+            'num_buyers': self.num_buyers
+        }
+
+class Campaign:
+    """One token being sniped and managed with its own wallets and sell rules"""
+    def __init__(self, token_address, wallets, amounts, sell_rules, slippage=10.0, buy_delay=0.0, fan_out=True,
+                 detected_at=None, on_submitted=None, armed=False, journal=None):
+        """
+        Initialize campaign
+
+        Args:
+            token_address (str): Token mint address
+            wallets (list): Wallet instances to buy with
+            amounts (list): SOL to spend per wallet (0 skips the wallet)
+            sell_rules (SellRules): Exit conditions
+            slippage (float): Slippage tolerance percentage
+            buy_delay (float): Seconds between consecutive wallets' buys
+            fan_out (bool): Stagger buys by buy_delay instead of running them one after another
+            detected_at (float): time.perf_counter() when the launch was detected (optional)
+            on_submitted (callable): Called with time.perf_counter() once the first buy is sent (optional)
+            armed (bool): Pre-build and pre-sign each wallet's buy before it is due
+            journal (TradeJournal): Durable trade log (optional)
+        """
+        self.token_address = str(token_address)
+        self.wallets = list(wallets)
+        self.amounts = list(amounts)
+        self.sell_rules = sell_rules
+        self.slippage = slippage
+        self.buy_delay = buy_delay
+        self.fan_out = fan_out
+        self.detected_at = detected_at
+        # Buy timelines start at the launch, or at the request for manual campaigns
+        self.triggered_ns = (int(detected_at * 1e9) if detected_at is not None
+                             else time.perf_counter_ns())
+        self.checked_ns = None  # when the balance checks and arming finished
+        self.on_submitted = on_submitted
+        self.submitted_at = None
+        self.armed = armed
+
+        self.state = PENDING
+        self.reason = None
+        self.created_at = time.time()
+        self.deadline = None  # monotonic time of the forced exit
+        self.positions = {}  # wallet index -> buy info
+        self.transactions = TransactionHistory(100, self.token_address, journal)
+        self.last_price = None
+        self.last_update = 0.0  # monotonic time of the last token info
+        self.subscription = None
+        self.lock = threading.RLock()
+
+        self._plan = []
+        self._armed_buys = {}  # wallet index -> ArmedBuy
+        self._pending_buys = 0
+        self._latest = None
+        self._latest_at = None  # perf_counter() when _latest arrived
+        self._buys_started = None
+        self._evaluating = False
+        self._dirty = False
+        self._selling = set()
+        self._timed_out = False
+
+    @property
+    def running(self):
+        return self.state in ACTIVE_STATES
+
+    def set_state(self, state, reason=None):
+        """Move to a new state and tell any connected status streams"""
+        with self.lock:
+            self.state = state
+            if reason is not None:
+                self.reason = reason
+        publisher.publish('campaign', lambda: self.get_status(include_transactions=False))
+
+    def add_transaction(self, wallet_idx, tx_type, amount, token_amount=None, tx_hash=None, latency=None):
+        """Add a transaction to the campaign history"""
+        wallet = str(self.wallets[wallet_idx].get_public_key()) if wallet_idx < len(self.wallets) else None
+        return self.transactions.append(wallet_idx, tx_type, amount, token_amount, tx_hash, latency, wallet)
+
+    def get_status(self, include_transactions=True):
+        """Get campaign status"""
+        with self.lock:
+            status = {
+                'token': self.token_address,
+                'state': self.state,
+                'running': self.running,
+                'reason': self.reason,
+                'created_at': datetime.fromtimestamp(self.created_at).strftime("%Y-%m-%d %H:%M:%S"),
+                'seconds_left': (round(max(0.0, self.deadline - time.monotonic()), 1)
+                                 if self.deadline is not None and self.running else None),
+                # Wall-clock deadline, so cached statuses can still count down
+                'ends_at': (time.time() + self.deadline - time.monotonic()
+                            if self.deadline is not None and self.running else None),
+                'wallets': len(self.wallets),
+                'positions': len(self.positions),
+                'sold': sum(1 for buy_info in self.positions.values() if buy_info.get('sold', False)),
+                'last_price': self.last_price,
+                'detection_to_submission_ms': (round((self.submitted_at - self.detected_at) * 1000, 3)
+                                               if self.detected_at is not None and self.submitted_at is not None
+                                               else None),
+                'sell_rules': self.sell_rules.to_dict()
+            }
+        if include_transactions:
+            status['transactions'] = [tx.to_dict() for tx in self.transactions.snapshot()]
+        return status
+
+class CampaignManager:
+    """
+    Runs many token campaigns at once on shared infrastructure
+
+    Every campaign uses the same SolanaClient, so they share its connection
+    pool, account cache, blockhash provider and confirmation tracker. No
+    campaign owns a thread: blocking steps (balance checks, buys, sells) run
+    on one bounded worker pool, delays run off a single timer thread, price
+    changes arrive as accountSubscribe pushes, and campaigns without a recent
+    push are polled together with one bulk account read.
+    """
+    def __init__(self, solana_client, pump_api, max_workers=32, poll_interval=5.0, confirm_timeout=30.0,
+                 journal=None):
+        """
+        Initialize campaign manager
+
+        Args:
+            solana_client (SolanaClient): Shared Solana client
+            pump_api (PumpFunAPI): Shared Pump.fun API client
+            max_workers (int): Worker threads for blocking campaign steps
+            poll_interval (float): Seconds without a push before a token is polled
+            confirm_timeout (float): Seconds to wait for a sell to confirm
+            journal (TradeJournal): Durable log of every campaign's trades (optional)
+        """
+        self.solana_client = solana_client
+        self.pump_api = pump_api
+        self.poll_interval = poll_interval
+        self.confirm_timeout = confirm_timeout
+        self.journal = journal
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="campaign")
+        self.campaigns = {}  # token address -> Campaign
+        self.armer = BuyArmer(solana_client, pump_api)
+        self.lock = threading.Lock()
+
+        self._timers = []  # heap of (when, seq, fn, args)
+        self._seq = itertools.count()
+        self._timer_wakeup = threading.Condition()
+        self._closed = False
+        self._timer_thread = threading.Thread(target=self._run_timers, name="campaign-timers", daemon=True)
+        self._timer_thread.start()
+        self._call_later(poll_interval, self._poll_stale)
+
+    # Campaign registry
+
+    def add_campaign(self, token_address, wallets, amounts, sell_rules, slippage=10.0, buy_delay=0.0, fan_out=True,
+                     detected_at=None, on_submitted=None, armed=False):
+        """
+        Start a new campaign
+
+        Args:
+            token_address (str): Token mint address
+            wallets (list): Wallet instances to buy with
+            amounts (list): SOL to spend per wallet
+            sell_rules (SellRules): Exit conditions
+            slippage (float): Slippage tolerance percentage
+            buy_delay (float): Seconds between consecutive wallets' buys
+            fan_out (bool): Stagger buys instead of running them one after another
+            detected_at (float): time.perf_counter() when the launch was detected (optional)
+            on_submitted (callable): Called with time.perf_counter() once the first buy is sent (optional)
+            armed (bool): Pre-build and pre-sign each wallet's buy before it is due
+
+        Returns:
+            Campaign: The started campaign
+
+        Raises:
+            ValueError: If the token already has an active campaign
+        """
+        campaign = Campaign(token_address, wallets, amounts, sell_rules, slippage, buy_delay, fan_out,
+                            detected_at, on_submitted, armed, self.journal)
+        with self.lock:
+            if self._closed:
+                raise RuntimeError("Campaign manager is shut down")
+            existing = self.campaigns.get(campaign.token_address)
+            if existing is not None and existing.running:
+                raise ValueError(f"Token {campaign.token_address} already has an active campaign")
+            self.campaigns[campaign.token_address] = campaign
+
+        # Derive the curve and token accounts now so no trade has to
+        self.pump_api.warm_addresses(campaign.token_address, campaign.wallets)
+        logger.info(f"Campaign started for token {campaign.token_address} with {len(campaign.wallets)} wallet(s)")
+        publisher.publish('campaign', lambda: campaign.get_status(include_transactions=False))
+        self._submit(self._prepare, campaign)
+        return campaign
+
+    def stop_campaign(self, token_address):
+        """
+        Stop a campaign without selling its open positions
+
+        Returns:
+            bool: True if an active campaign was stopped
+        """
+        campaign = self.get_campaign(token_address)
+        if campaign is None or not campaign.running:
+            return False
+        self._finish(campaign, STOPPED, "Stopped by user")
+        return True
+
+    def remove_campaign(self, token_address):
+        """
+        Stop a campaign and forget it
+
+        Returns:
+            bool: True if the campaign existed
+        """
+        self.stop_campaign(token_address)
+        with self.lock:
+            removed = self.campaigns.pop(str(token_address), None) is not None
+        if removed:
+            publisher.publish('campaign_removed', {'token': str(token_address)})
+        return removed
+
+    def get_campaign(self, token_address):
+        with self.lock:
+            return self.campaigns.get(str(token_address))
+
+    def get_status(self, token_address):
+        """Get one campaign's status, or None if unknown"""
+        campaign = self.get_campaign(token_address)
+        return campaign.get_status() if campaign is not None else None
+
+    def get_statuses(self, include_transactions=True):
+        """Get every campaign's status"""
+        with self.lock:
+            campaigns = list(self.campaigns.values())
+        return [campaign.get_status(include_transactions) for campaign in campaigns]
+
+    def transactions(self):
+        """Snapshot of every campaign's transaction history, in sequence order"""
+        with self.lock:
+            campaigns = list(self.campaigns.values())
+        records = []
+        for campaign in campaigns:
+            records.extend(campaign.transactions.snapshot())
+        records.sort(key=lambda record: record.seq)
+        return records
+
+    def active_count(self):
+        with self.lock:
+            return sum(1 for campaign in self.campaigns.values() if campaign.running)
+
+    def stop_all(self):
+        """Stop every active campaign"""
+        with self.lock:
+            campaigns = [campaign for campaign in self.campaigns.values() if campaign.running]
+        for campaign in campaigns:
+            self._finish(campaign, STOPPED, "Stopped by user")
+
+    def shutdown(self):
+        """Stop all campaigns and release the worker pool and timer thread"""
+        self.stop_all()
+        with self.lock:
+            self._closed = True
+        with self._timer_wakeup:
+            self._timers = []
+            self._timer_wakeup.notify()
+        self.executor.shutdown(wait=False)
+
+    # Scheduling
+
+    def _submit(self, fn, *args):
+        def run():
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f"Error in campaign task {fn.__name__}: {str(e)}")
+        try:
+            self.executor.submit(run)
+        except RuntimeError:
+            # Pool shut down
+            pass
+
+    def _call_later(self, delay, fn, *args):
+        """Run fn(*args) on the worker pool after delay seconds"""
+        if delay <= 0:
+            self._submit(fn, *args)
+            return
+        with self._timer_wakeup:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), fn, args))
+            self._timer_wakeup.notify()
+
+    def _run_timers(self):
+        while not self._closed:
+            with self._timer_wakeup:
+                now = time.monotonic()
+                due = []
+                while self._timers and self._timers[0][0] <= now:
+                    due.append(heapq.heappop(self._timers))
+                if not due:
+                    timeout = self._timers[0][0] - now if self._timers else None
+                    self._timer_wakeup.wait(timeout)
+                    continue
+            for when, _, fn, args in due:
+                TIMER_LAG.observe(now - when)
+                self._submit(fn, *args)
+
+    # Campaign lifecycle
+
+    def _prepare(self, campaign):
+        """Check every wallet's balance in one batch and schedule the buys"""
+        if not campaign.running:
+            return
+
+        batch = self.solana_client.client.batch()
+        token_result = batch.get_account_info(campaign.token_address)
+        balance_results = [batch.get_balance(wallet.get_public_key()) for wallet in campaign.wallets]
+        batch.execute()
+
+        if not self.pump_api.parse_token_info(campaign.token_address, token_result.result()):
+            logger.info(f"Token {campaign.token_address} not yet available on Pump.fun. Waiting for launch...")
+
+        plan = []
+        for wallet_idx, wallet in enumerate(campaign.wallets):
+            buy_amount = campaign.amounts[wallet_idx] if wallet_idx < len(campaign.amounts) else 0
+
+            # Skip wallets with 0 buy amount
+            if buy_amount <= 0:
+                continue
+
+            # Check wallet balance
+            balance = (balance_results[wallet_idx].result().value or 0) / 1e9  # Convert lamports to SOL
+            if balance < buy_amount:
+                logger.warning(f"Wallet {wallet_idx+1} has insufficient balance: {balance} SOL, need {buy_amount} SOL")
+                campaign.add_transaction(wallet_idx, "ERROR", buy_amount,
+                                         tx_hash=None,
+                                         token_amount=f"Insufficient balance: {balance} SOL")
+                continue
+
+            plan.append((wallet_idx, wallet, buy_amount))
+
+        # Later wallets in the stagger fire pre-signed transactions
+        armed_buys = {}
+        if campaign.armed and plan:
+            # One curve read quotes every wallet, each after the buys ahead of it
+            quotes = self.pump_api.quote_buys(campaign.token_address, [buy_amount for _, _, buy_amount in plan],
+                                              campaign.slippage, sequential=True,
+                                              fresh_launch=campaign.detected_at is not None)
+            # Without a readable curve, arm unquoted buys like the legacy path sends
+            quotes = quotes or [None] * len(plan)
+            for (wallet_idx, wallet, buy_amount), quote in zip(plan, quotes):
+                armed = self.armer.arm(campaign.token_address, wallet, buy_amount, campaign.slippage, quote)
+                if armed is not None:
+                    armed_buys[wallet_idx] = armed
+
+        with campaign.lock:
+            if not campaign.running:
+                for armed in armed_buys.values():
+                    self.armer.disarm(armed)
+                return
+            campaign.set_state(BUYING)
+            campaign._plan = plan
+            campaign._armed_buys = armed_buys
+            campaign._pending_buys = len(plan)
+            campaign._buys_started = time.perf_counter()
+            campaign.checked_ns = time.perf_counter_ns()
+
+        if not plan:
+            self._start_monitoring(campaign)
+        elif campaign.fan_out:
+            # buy_delay is a stagger schedule, not a serial gate
+            for position, (wallet_idx, wallet, buy_amount) in enumerate(plan):
+                self._call_later(position * campaign.buy_delay, self._buy, campaign, position)
+        else:
+            self._submit(self._buy, campaign, 0)
+
+    def _buy(self, campaign, position):
+        wallet_idx, wallet, buy_amount = campaign._plan[position]
+        with campaign.lock:
+            armed = campaign._armed_buys.pop(wallet_idx, None)
+        if not campaign.running:
+            if armed is not None:
+                self.armer.disarm(armed)
+        else:
+            logger.info(f"Buying {campaign.token_address} with wallet {wallet_idx+1}, amount: {buy_amount} SOL")
+            trace = traces.start(campaign.token_address, wallet_idx, 'buy', campaign.triggered_ns)
+            trace.mark('pre-checks', campaign.checked_ns)
+            started = time.perf_counter()
+            if armed is not None:
+                success, tx_info = self.armer.fire(armed, trace)
+            else:
+                success, tx_info = self.pump_api.send_buy(campaign.token_address, wallet, buy_amount, campaign.slippage,
+                                                          trace=trace, fresh_launch=campaign.detected_at is not None)
+            if success:
+                self._on_buy_sent(campaign)
+                try:
+                    future = self.solana_client.track_signature(tx_info['transaction_hash'], self.confirm_timeout,
+                                                                lambda: trace.mark('first-seen'))
+                    # Done callbacks run on the RPC event loop; hand the bookkeeping back to the pool,
+                    # so no worker sits waiting while the buy confirms
+                    future.add_done_callback(
+                        lambda future: self._submit(self._on_buy_confirmed, campaign, position, tx_info, future,
+                                                    started, trace))
+                    return
+                except Exception as e:
+                    success, tx_info = False, str(e)
+            traces.finish(trace, False, error=str(tx_info))
+            self._record_buy(campaign, wallet_idx, buy_amount, False, tx_info)
+
+        self._on_buy_done(campaign, position)
+
+    def _on_buy_confirmed(self, campaign, position, tx_info, future, started, trace):
+        wallet_idx, wallet, buy_amount = campaign._plan[position]
+        try:
+            try:
+                confirmed, error = future.result()
+            except Exception as e:
+                confirmed, error = False, f"Confirmation error: {str(e) or type(e).__name__}"
+
+            signature = tx_info['transaction_hash']
+            if confirmed:
+                trace.mark('confirmed')
+                success, result = self.pump_api.settle_buy(campaign.token_address, tx_info)
+            else:
+                success, result = False, error
+            traces.finish(trace, success, signature, None if success else str(result))
+            self._record_buy(campaign, wallet_idx, buy_amount, success, result,
+                             time.perf_counter() - started if success else None)
+        finally:
+            self._on_buy_done(campaign, position)
+
+    def _record_buy(self, campaign, wallet_idx, buy_amount, success, tx_info, latency=None):
+        if success:
+            SEND_TO_CONFIRM.observe(latency, 'buy')
+            logger.info(f"Buy successful for wallet {wallet_idx+1}: {tx_info}")
+            with campaign.lock:
+                campaign.positions[wallet_idx] = tx_info
+            campaign.add_transaction(wallet_idx, "BUY", buy_amount,
+                                     tx_hash=tx_info.get('transaction_hash'),
+                                     token_amount=tx_info.get('token_amount'),
+                                     latency=latency)
+        else:
+            logger.error(f"Buy failed for wallet {wallet_idx+1}: {tx_info}")
+            campaign.add_transaction(wallet_idx, "BUY FAILED", buy_amount,
+                                     tx_hash=None,
+                                     token_amount=f"Error: {tx_info}")
+
+    def _on_buy_done(self, campaign, position):
+        """Count a finished buy; the last one starts monitoring"""
+        with campaign.lock:
+            campaign._pending_buys -= 1
+            remaining = campaign._pending_buys
+
+        if remaining == 0:
+            BUY_FAN_OUT.observe(time.perf_counter() - campaign._buys_started)
+            self._start_monitoring(campaign)
+        elif not campaign.fan_out:
+            self._call_later(campaign.buy_delay, self._buy, campaign, position + 1)
+
+    def _on_buy_sent(self, campaign):
+        """Note when the campaign's first buy went out"""
+        submitted_at = time.perf_counter()
+        with campaign.lock:
+            if campaign.submitted_at is not None:
+                return
+            campaign.submitted_at = submitted_at
+        if campaign.on_submitted is not None:
+            try:
+                campaign.on_submitted(submitted_at)
+            except Exception as e:
+                logger.error(f"Error in submission callback: {str(e)}")
+
+    def _start_monitoring(self, campaign):
+        with campaign.lock:
+            if not campaign.running:
+                return
+            if not campaign.positions:
+                logger.warning(f"No successful buys for {campaign.token_address}, ending campaign")
+                campaign.set_state(DONE, "No successful buys")
+                return
+            campaign.deadline = time.monotonic() + campaign.sell_rules.timeout_seconds
+            campaign.set_state(MONITORING)
+
+        rules = campaign.sell_rules
+        logger.info(f"Monitoring {campaign.token_address} for sell conditions: profit >= {rules.profit_percentage}%, "
+                    f"timeout: {rules.timeout_seconds}s, buyers: {rules.num_buyers}")
+
+        subscription = self.pump_api.subscribe_token_info(
+            campaign.token_address, lambda token_info: self._on_token_update(campaign, token_info))
+        with campaign.lock:
+            if campaign.running:
+                campaign.subscription = subscription
+                subscription = None
+        if subscription is not None:
+            # Stopped while subscribing
+            self.solana_client.unsubscribe(subscription)
+            return
+
+        self._call_later(rules.timeout_seconds, self._on_timeout, campaign)
+        self._request_evaluation(campaign)
+
+    def _on_token_update(self, campaign, token_info):
+        """Account push for a campaign's token (runs on the RPC event loop; must not block)"""
+        with campaign.lock:
+            campaign._latest = token_info
+            if campaign._latest_at is None:
+                campaign._latest_at = time.perf_counter()
+            campaign.last_update = time.monotonic()
+        self._request_evaluation(campaign)
+
+    def _request_evaluation(self, campaign):
+        """Queue a sell check, coalescing updates that arrive while one is running"""
+        with campaign.lock:
+            if campaign.state != MONITORING:
+                return
+            if campaign._evaluating:
+                campaign._dirty = True
+                return
+            campaign._evaluating = True
+        self._submit(self._evaluate, campaign)
+
+    def _evaluate(self, campaign):
+        try:
+            while True:
+                with campaign.lock:
+                    token_info = campaign._latest
+                    latest_at = campaign._latest_at
+                    campaign._latest = None
+                    campaign._latest_at = None
+                    campaign._dirty = False
+                if latest_at is not None:
+                    MONITOR_LAG.observe(time.perf_counter() - latest_at)
+
+                if token_info is None:
+                    token_info = self.pump_api.get_token_info(campaign.token_address)
+                    if token_info:
+                        with campaign.lock:
+                            campaign.last_update = time.monotonic()
+
+                if token_info:
+                    self._check_positions(campaign, token_info)
+                else:
+                    logger.warning(f"Could not get token info for {campaign.token_address}, retrying...")
+
+                with campaign.lock:
+                    if not campaign._dirty or campaign.state != MONITORING:
+                        return
+        finally:
+            with campaign.lock:
+                campaign._evaluating = False
+
+    def _check_positions(self, campaign, token_info):
+        """Sell every position whose sell conditions are met, all at once"""
+        current_price = token_info.get('price', 0)
+        buyers_count = token_info.get('buyers_count')
+        with campaign.lock:
+            price_changed = campaign.last_price != current_price
+            campaign.last_price = current_price
+            candidates = [(wallet_idx, buy_info) for wallet_idx, buy_info in campaign.positions.items()
+                          if not buy_info.get('sold', False) and wallet_idx not in campaign._selling]
+
+        if price_changed:
+            publisher.touch()
+
+        tripped = []
+        for wallet_idx, buy_info in candidates:
+            profit_percentage = calculate_profit_percentage(buy_info.get('price', 0), current_price)
+            sell_reason = campaign.sell_rules.sell_reason(profit_percentage, buyers_count)
+            if sell_reason:
+                logger.info(f"Selling {campaign.token_address} for wallet {wallet_idx+1}: {sell_reason}")
+                tripped.append(wallet_idx)
+
+        self._sell_positions(campaign, tripped, "SELL")
+
+    def _on_timeout(self, campaign):
+        with campaign.lock:
+            if campaign.state != MONITORING:
+                return
+            campaign._timed_out = True
+            remaining = [wallet_idx for wallet_idx, buy_info in campaign.positions.items()
+                         if not buy_info.get('sold', False)]
+        if remaining:
+            logger.info(f"Timeout reached for {campaign.token_address}, selling remaining positions")
+        self._sell_positions(campaign, remaining, "SELL (TIMEOUT)")
+        self._finish_if_sold(campaign)
+
+    def _sell_positions(self, campaign, wallet_indexes, label):
+        """
+        Send the sells for several positions at the same moment
+
+        Each send runs on its own worker; confirmations are then tracked
+        concurrently by the shared confirmation tracker, so no worker blocks
+        while a sell confirms and the exit takes one confirmation time rather
+        than one per wallet.
+        """
+        with campaign.lock:
+            if campaign.state != MONITORING:
+                return
+            claimed = [wallet_idx for wallet_idx in wallet_indexes
+                       if not campaign.positions[wallet_idx].get('sold', False)
+                       and wallet_idx not in campaign._selling]
+            campaign._selling.update(claimed)
+
+        triggered_ns = time.perf_counter_ns()
+        for wallet_idx in claimed:
+            trace = traces.start(campaign.token_address, wallet_idx, 'sell', triggered_ns)
+            self._submit(self._send_sell, campaign, wallet_idx, label, trace)
+
+    def _send_sell(self, campaign, wallet_idx, label, trace):
+        started = time.perf_counter()
+        try:
+            wallet = campaign.wallets[wallet_idx]
+            token_balance = campaign.positions[wallet_idx].get('token_amount', 0)
+            success, tx_info = self.pump_api.send_sell(campaign.token_address, wallet, token_balance, campaign.slippage,
+                                                       trace=trace)
+            if not success:
+                traces.finish(trace, False, error=str(tx_info))
+                self._on_sell_done(campaign, wallet_idx, label, False, tx_info)
+                return
+
+            future = self.solana_client.track_signature(tx_info['transaction_hash'], self.confirm_timeout,
+                                                        lambda: trace.mark('first-seen'))
+            # Done callbacks run on the RPC event loop; hand the bookkeeping back to the pool
+            future.add_done_callback(
+                lambda future: self._submit(self._on_sell_confirmed, campaign, wallet_idx, label, tx_info, future,
+                                            started, trace))
+        except Exception as e:
+            traces.finish(trace, False, error=str(e))
+            self._on_sell_done(campaign, wallet_idx, label, False, str(e))
+
+    def _on_sell_confirmed(self, campaign, wallet_idx, label, tx_info, future, started, trace):
+        try:
+            confirmed, error = future.result()
+        except Exception as e:
+            confirmed, error = False, f"Confirmation error: {str(e) or type(e).__name__}"
+
+        if confirmed:
+            trace.mark('confirmed')
+            traces.finish(trace, True, tx_info['transaction_hash'])
+            # The sale moved the curve; later readers must refetch
+            self.pump_api.invalidate(campaign.token_address)
+            latency = time.perf_counter() - started
+            SEND_TO_CONFIRM.observe(latency, 'sell')
+            self._on_sell_done(campaign, wallet_idx, label, True, tx_info, latency)
+        else:
+            traces.finish(trace, False, tx_info['transaction_hash'], error)
+            self._on_sell_done(campaign, wallet_idx, label, False, error)
+
+    def _on_sell_done(self, campaign, wallet_idx, label, success, tx_info, latency=None):
+        token_balance = campaign.positions[wallet_idx].get('token_amount', 0)
+        if success:
+            logger.info(f"{label} successful for wallet {wallet_idx+1}: {tx_info}")
+            campaign.add_transaction(wallet_idx, label, tx_info.get('amount_sol', 0),
+                                     tx_hash=tx_info.get('transaction_hash'),
+                                     token_amount=token_balance,
+                                     latency=latency)
+        else:
+            logger.error(f"{label} failed for wallet {wallet_idx+1}: {tx_info}")
+            failed_label = "SELL FAILED (TIMEOUT)" if label == "SELL (TIMEOUT)" else "SELL FAILED"
+            campaign.add_transaction(wallet_idx, failed_label, 0,
+                                     tx_hash=None,
+                                     token_amount=f"Error: {tx_info}")
+
+        with campaign.lock:
+            if success:
+                campaign.positions[wallet_idx]['sold'] = True
+            campaign._selling.discard(wallet_idx)
+        self._finish_if_sold(campaign)
+
+    def _finish_if_sold(self, campaign):
+        with campaign.lock:
+            all_sold = all(buy_info.get('sold', False) for buy_info in campaign.positions.values())
+            # Positions that failed to sell at the deadline are left open
+            timed_out = campaign._timed_out and not campaign._selling
+        if all_sold:
+            logger.info(f"All positions sold for {campaign.token_address}")
+            self._finish(campaign, DONE, "All positions sold")
+        elif timed_out:
+            self._finish(campaign, DONE, "Timeout reached")
+
+    def _finish(self, campaign, state, reason):
+        with campaign.lock:
+            if not campaign.running:
+                return
+            campaign.set_state(state, reason)
+            subscription = campaign.subscription
+            campaign.subscription = None
+            armed_buys, campaign._armed_buys = campaign._armed_buys, {}
+        for armed in armed_buys.values():
+            self.armer.disarm(armed)
+        if subscription is not None:
+            self.solana_client.unsubscribe(subscription)
+        logger.info(f"Campaign for {campaign.token_address} {state}: {reason}")
+
+    def _poll_stale(self):
+        """Read every token that has not had a push recently with one bulk request"""
+        try:
+            cutoff = time.monotonic() - self.poll_interval
+            with self.lock:
+                stale = [campaign for campaign in self.campaigns.values()
+                         if campaign.state == MONITORING and campaign.last_update < cutoff
+                         and not campaign._evaluating]
+            if stale:
+                tokens_info = self.pump_api.get_tokens_info([campaign.token_address for campaign in stale])
+                for campaign in stale:
+                    token_info = tokens_info.get(campaign.token_address)
+                    if not token_info:
+                        continue
+                    with campaign.lock:
+                        campaign._latest = token_info
+                        campaign.last_update = time.monotonic()
+                    self._request_evaluation(campaign)
+        finally:
+            if not self._closed:
+                self._call_later(self.poll_interval, self._poll_stale)
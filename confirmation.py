@@ -0,0 +1,178 @@
+import logging
+import time
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+# getSignatureStatuses accepts at most this many signatures per call
+MAX_SIGNATURES_PER_CALL = 256
+
+# Confirmation statuses that satisfy each commitment level
+SATISFIES = {
+    "processed": ("processed", "confirmed", "finalized"),
+    "confirmed": ("confirmed", "finalized"),
+    "finalized": ("finalized",),
+}
+
+class PendingSignature:
+    """A signature awaiting confirmation and everyone waiting on it"""
+    def __init__(self, signature, deadline):
+        self.signature = signature
+        self.deadline = deadline
+        self.futures = []
+        self.subscription = None
+        self.on_seen = []  # called once, when a status first shows up
+
+class ConfirmationTracker:
+    """
+    Confirms every pending transaction with one batched status check per tick
+
+    A signatureSubscribe notification resolves a signature as soon as it
+    arrives; the poll covers signatures the PubSub socket missed. All state
+    lives on the RPC event loop.
+    """
+    def __init__(self, async_client, get_subscriptions=None, poll_interval=0.5, commitment="confirmed"):
+        """
+        Initialize confirmation tracker
+
+        Args:
+            async_client (AsyncClient): RPC client used for status polls
+            get_subscriptions (callable): Returns a SubscriptionClient, or None (optional)
+            poll_interval (float): Seconds between batched status checks
+            commitment (str): Commitment level a transaction must reach
+        """
+        self.async_client = async_client
+        self.get_subscriptions = get_subscriptions
+        self.poll_interval = poll_interval
+        self.commitment = commitment
+        self._pending = {}
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def track(self, signature, timeout=30.0, on_seen=None):
+        """
+        Register a signature (must be called on the event loop)
+
+        Args:
+            signature (str): Transaction signature
+            timeout (float): Seconds to wait before giving up
+            on_seen (callable): Called once the transaction is first seen at any commitment (optional)
+
+        Returns:
+            asyncio.Future: Resolves to (confirmed, error message)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        deadline = time.monotonic() + timeout
+
+        entry = self._pending.get(signature)
+        if entry is None:
+            entry = PendingSignature(signature, deadline)
+            self._pending[signature] = entry
+            if self.get_subscriptions is not None:
+                asyncio.ensure_future(self._subscribe(entry))
+        else:
+            entry.deadline = max(entry.deadline, deadline)
+        entry.futures.append(future)
+        if on_seen is not None:
+            entry.on_seen.append(on_seen)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._poll())
+        return future
+
+    async def wait(self, signature, timeout=30.0, on_seen=None):
+        """Wait for a signature to be confirmed; returns (confirmed, error message)"""
+        return await self.track(signature, timeout, on_seen)
+
+    def _seen(self, entry):
+        callbacks, entry.on_seen = entry.on_seen, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in first-seen callback: {str(e)}")
+
+    async def _subscribe(self, entry):
+        try:
+            subscriptions = self.get_subscriptions()
+            if subscriptions is None:
+                return
+            subscription = await subscriptions.signature_subscribe(
+                entry.signature,
+                lambda result: self._on_notification(entry.signature, result),
+                commitment=self.commitment
+            )
+            if self._pending.get(entry.signature) is entry:
+                entry.subscription = subscription
+            else:
+                await subscriptions.unsubscribe(subscription)
+        except Exception as e:
+            logger.debug(f"Signature subscription failed: {str(e)}")
+
+    def _on_notification(self, signature, result):
+        err = ((result or {}).get('value') or {}).get('err')
+        if err:
+            self._resolve(signature, (False, f"Transaction failed: {err}"))
+        else:
+            self._resolve(signature, (True, None))
+
+    def _resolve(self, signature, outcome, seen=True):
+        entry = self._pending.pop(signature, None)
+        if entry is None:
+            return
+        if seen:
+            # A notification can be the first sign of the transaction at all
+            self._seen(entry)
+        for future in entry.futures:
+            if not future.done():
+                future.set_result(outcome)
+        if entry.subscription is not None and entry.subscription.active:
+            subscriptions = self.get_subscriptions()
+            asyncio.ensure_future(subscriptions.unsubscribe(entry.subscription))
+
+    async def _poll(self):
+        while self._pending:
+            try:
+                await self._check()
+            except Exception as e:
+                logger.error(f"Error checking signature statuses: {str(e)}")
+            if self._pending:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _check(self):
+        """Check every outstanding signature in as few RPC calls as possible"""
+        now = time.monotonic()
+        for entry in [entry for entry in self._pending.values() if entry.deadline <= now]:
+            self._resolve(entry.signature, (False, "Transaction confirmation timeout"), seen=False)
+
+        signatures = list(self._pending)
+        if not signatures:
+            return
+        chunks = [signatures[i:i + MAX_SIGNATURES_PER_CALL]
+                  for i in range(0, len(signatures), MAX_SIGNATURES_PER_CALL)]
+
+        if len(chunks) == 1:
+            responses = [await self.async_client.get_signature_statuses(chunks[0], search_transaction_history=True)]
+        else:
+            # More than 256 signatures: still one POST, as a JSON-RPC batch
+            batch = self.async_client.batch()
+            results = [batch.get_signature_statuses(chunk, search_transaction_history=True) for chunk in chunks]
+            await batch.execute()
+            responses = [result.result() for result in results]
+
+        accepted = SATISFIES.get(self.commitment, SATISFIES["confirmed"])
+        for chunk, response in zip(chunks, responses):
+            statuses = response.value if response and response.value else []
+            for signature, status in zip(chunk, statuses):
+                if not status:
+                    continue
+                entry = self._pending.get(signature)
+                if entry is not None and entry.on_seen:
+                    self._seen(entry)
+                if status.get('err'):
+                    self._resolve(signature, (False, f"Transaction failed: {status['err']}"))
+                elif status.get('confirmationStatus') in accepted:
+                    self._resolve(signature, (True, None))
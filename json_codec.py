@@ -0,0 +1,183 @@
+import re
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library codec is used without it
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+class JsonCodec:
+    """JSON encoder/decoder pair used for all RPC traffic"""
+    def __init__(self, name, dumps, loads):
+        """
+        Initialize codec
+
+        Args:
+            name (str): Codec name, for logging
+            dumps (callable): Serializes an object to bytes
+            loads (callable): Parses bytes or str into an object
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def dumps_text(self, obj):
+        """Serialize to str (WebSocket text frames)"""
+        data = self.dumps(obj)
+        return data.decode('utf-8') if isinstance(data, bytes) else data
+
+STDLIB_CODEC = JsonCodec(
+    "json",
+    lambda obj: json.dumps(obj, separators=(',', ':')).encode('utf-8'),
+    json.loads
+)
+
+ORJSON_CODEC = JsonCodec("orjson", orjson.dumps, orjson.loads) if orjson is not None else None
+
+_codec = ORJSON_CODEC or STDLIB_CODEC
+
+def get_codec():
+    """Get the codec new RPC clients use"""
+    return _codec
+
+def set_codec(codec):
+    """
+    Replace the default codec for RPC clients created afterwards
+
+    Args:
+        codec (JsonCodec): Codec to use
+    """
+    global _codec
+    _codec = codec
+    logger.info(f"Using JSON codec: {codec.name}")
+
+# Characters that change the parser state
+_STRUCTURAL = re.compile(rb'[\[\]{}"]')
+_WHITESPACE = re.compile(rb'\s*')
+
+# Key paths whose array value is streamed: plain and withContext results
+_RESULT_PATHS = ((b'result',), (b'result', b'value'))
+
+class ResultArrayParser:
+    """
+    Incremental parser yielding the elements of a JSON-RPC result array
+
+    Only the current element is buffered, so memory stays flat no matter
+    how large the response is. Elements are decoded with the codec as
+    soon as their closing brace arrives.
+    """
+    def __init__(self, codec=None):
+        self.codec = codec or get_codec()
+        self.buffer = b''
+        self.pos = 0
+        self.stack = []  # open containers: b'{' or b'['
+        self.keys = {}  # depth -> last key seen in the object at that depth
+        self.target_depth = None
+        self.element_start = None
+        self.found = False
+
+    def feed(self, chunk):
+        """
+        Feed the next chunk of the response body
+
+        Args:
+            chunk (bytes): Response bytes
+
+        Returns:
+            list: Elements completed by this chunk
+        """
+        buf = self.buffer + chunk if self.buffer else chunk
+        pos = self.pos
+        stack = self.stack
+        elements = []
+
+        while True:
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            i = match.start()
+            char = buf[i:i + 1]
+
+            if char == b'"':
+                end = self._string_end(buf, i)
+                if end is None:
+                    pos = i  # incomplete string; rescan it with the next chunk
+                    break
+                if self.element_start is None and stack and stack[-1] == b'{':
+                    after = _WHITESPACE.match(buf, end + 1).end()
+                    if after == len(buf):
+                        pos = i  # cannot tell key from value yet
+                        break
+                    if buf[after:after + 1] == b':':
+                        self.keys[len(stack)] = buf[i + 1:end]
+                pos = end + 1
+                continue
+
+            if char in b'{[':
+                stack.append(char)
+                depth = len(stack)
+                if self.element_start is None:
+                    if self.target_depth is not None and depth == self.target_depth + 1:
+                        self.element_start = i
+                    elif char == b'[' and self.target_depth is None and self._is_result_path(depth):
+                        self.target_depth = depth
+                        self.found = True
+                    elif char == b'{':
+                        self.keys.pop(depth, None)
+            else:
+                stack.pop()
+                depth = len(stack)
+                if self.element_start is not None and depth == self.target_depth:
+                    elements.append(self.codec.loads(buf[self.element_start:i + 1]))
+                    self.element_start = None
+                elif self.target_depth is not None and depth == self.target_depth - 1:
+                    self.target_depth = None
+            pos = i + 1
+
+        # Drop everything already consumed; keep the whole body until the
+        # result array shows up so error responses can still be decoded
+        if self.found:
+            keep = self.element_start if self.element_start is not None else pos
+            buf = buf[keep:]
+            pos -= keep
+            if self.element_start is not None:
+                self.element_start = 0
+        self.buffer = buf
+        self.pos = pos
+        return elements
+
+    def close(self):
+        """
+        Finish parsing
+
+        Returns:
+            object: The decoded response if it had no result array (e.g. an
+                    error response), otherwise None
+        """
+        if self.found or not self.buffer.strip():
+            return None
+        return self.codec.loads(self.buffer)
+
+    def _is_result_path(self, depth):
+        path = tuple(self.keys.get(d) for d in range(1, depth))
+        return path in _RESULT_PATHS
+
+    @staticmethod
+    def _string_end(buf, start):
+        end = start + 1
+        while True:
+            end = buf.find(b'"', end)
+            if end == -1:
+                return None
+            backslashes = 0
+            k = end - 1
+            while k > start and buf[k] == 0x5c:
+                backslashes += 1
+                k -= 1
+            if backslashes % 2 == 0:
+                return end
+            end += 1
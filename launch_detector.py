@@ -0,0 +1,386 @@
+import re
+import json
+import time
+import base64
+import struct
+import hashlib
+import queue
+import logging
+import threading
+from collections import OrderedDict, deque
+import base58
+from pump_api import PumpFunAPI
+
+logger = logging.getLogger(__name__)
+
+# Anchor emits events as "Program data: <base64>" log lines whose first
+# 8 bytes are sha256("event:<EventName>")[:8]
+CREATE_EVENT_DISCRIMINATOR = hashlib.sha256(b"event:CreateEvent").digest()[:8]
+PROGRAM_DATA_PREFIX = "Program data: "
+
+class LaunchEvent:
+    """A token launch decoded from the Pump.fun program's CreateEvent"""
+    def __init__(self, mint, bonding_curve, creator, name, symbol, uri, signature=None, slot=None, detected_at=None):
+        self.mint = mint
+        self.bonding_curve = bonding_curve
+        self.creator = creator
+        self.name = name
+        self.symbol = symbol
+        self.uri = uri
+        self.signature = signature
+        self.slot = slot
+        self.detected_at = detected_at  # time.perf_counter() when the notification arrived
+
+    def to_dict(self):
+        return {
+            'mint': self.mint,
+            'bonding_curve': self.bonding_curve,
+            'creator': self.creator,
+            'name': self.name,
+            'symbol': self.symbol,
+            'uri': self.uri,
+            'signature': self.signature,
+            'slot': self.slot
+        }
+
+def _read_string(data, offset):
+    (length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    return data[offset:offset + length].decode('utf-8', errors='replace'), offset + length
+
+def _read_pubkey(data, offset):
+    if offset + 32 > len(data):
+        raise ValueError("Truncated public key")
+    return base58.b58encode(data[offset:offset + 32]).decode('ascii'), offset + 32
+
+def decode_create_event(data):
+    """
+    Decode a CreateEvent payload
+
+    Args:
+        data (bytes): Event bytes, including the 8-byte discriminator
+
+    Returns:
+        LaunchEvent: Decoded launch, or None if the data is not a CreateEvent
+    """
+    if data[:8] != CREATE_EVENT_DISCRIMINATOR:
+        return None
+    try:
+        offset = 8
+        name, offset = _read_string(data, offset)
+        symbol, offset = _read_string(data, offset)
+        uri, offset = _read_string(data, offset)
+        mint, offset = _read_pubkey(data, offset)
+        bonding_curve, offset = _read_pubkey(data, offset)
+        creator, offset = _read_pubkey(data, offset)
+        # Newer program versions append more fields; they are not needed here
+        return LaunchEvent(mint, bonding_curve, creator, name, symbol, uri)
+    except (struct.error, ValueError) as e:
+        logger.debug(f"Malformed CreateEvent: {str(e)}")
+        return None
+
+def parse_create_events(logs):
+    """
+    Find every CreateEvent in a transaction's log lines
+
+    Args:
+        logs (list): Log lines from a logsNotification
+
+    Returns:
+        list: LaunchEvent instances
+    """
+    events = []
+    for line in logs:
+        if not line.startswith(PROGRAM_DATA_PREFIX):
+            continue
+        try:
+            data = base64.b64decode(line[len(PROGRAM_DATA_PREFIX):])
+        except ValueError:
+            continue
+        event = decode_create_event(data)
+        if event is not None:
+            events.append(event)
+    return events
+
+class LaunchFilters:
+    """Configurable checks a launch must pass before it is bought"""
+    def __init__(self, name_pattern=None, symbol_pattern=None, allow_creators=None, deny_creators=None,
+                 require_uri=False):
+        """
+        Initialize launch filters
+
+        Args:
+            name_pattern (str): Regex the token name must match (optional)
+            symbol_pattern (str): Regex the token symbol must match (optional)
+            allow_creators (list): Only buy launches from these creators (optional)
+            deny_creators (list): Never buy launches from these creators (optional)
+            require_uri (bool): Skip launches without a metadata URI
+        """
+        self.name_pattern = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
+        self.symbol_pattern = re.compile(symbol_pattern, re.IGNORECASE) if symbol_pattern else None
+        self.allow_creators = set(allow_creators or ())
+        self.deny_creators = set(deny_creators or ())
+        self.require_uri = require_uri
+
+    @classmethod
+    def from_config(cls, config):
+        """Build filters from a BotConfig's LAUNCH_FILTERS settings"""
+        filters = config.launch_filters
+        return cls(
+            name_pattern=filters.name_pattern,
+            symbol_pattern=filters.symbol_pattern,
+            allow_creators=filters.allow_creators,
+            deny_creators=filters.deny_creators,
+            require_uri=filters.require_uri
+        )
+
+    def check(self, event):
+        """
+        Check a launch against the filters
+
+        Returns:
+            str: Why the launch was rejected, or None if it passes
+        """
+        if event.creator in self.deny_creators:
+            return "creator denied"
+        if self.allow_creators and event.creator not in self.allow_creators:
+            return "creator not allowed"
+        if self.name_pattern and not self.name_pattern.search(event.name):
+            return "name does not match"
+        if self.symbol_pattern and not self.symbol_pattern.search(event.symbol):
+            return "symbol does not match"
+        if self.require_uri and not event.uri:
+            return "no metadata URI"
+        return None
+
+class LatencyStats:
+    """Rolling window of latency samples"""
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def stats(self):
+        """Get latency percentiles in milliseconds"""
+        samples = sorted(self.samples)
+        if not samples:
+            return {'count': self.count}
+
+        def percentile(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+        return {
+            'count': self.count,
+            'last_ms': round(self.samples[-1] * 1000, 3),
+            'min_ms': round(samples[0] * 1000, 3),
+            'p50_ms': percentile(0.5),
+            'p99_ms': percentile(0.99),
+            'max_ms': round(samples[-1] * 1000, 3)
+        }
+
+class LaunchDetector:
+    """
+    Watches the Pump.fun program for new launches and hands them to the buy path
+
+    A logsSubscribe on the program delivers each create transaction's logs as
+    soon as the node processes it; the CreateEvent is decoded straight from the
+    log line, so no extra RPC round trip sits between detection and the buy.
+    Notifications are handled on the RPC event loop, so on_launch must not
+    block (CampaignManager.add_campaign only queues work).
+    """
+    def __init__(self, solana_client, on_launch, program_id=PumpFunAPI.PROGRAM_ID, filters=None,
+                 commitment="processed", record_path=None, max_seen=10000):
+        """
+        Initialize launch detector
+
+        Args:
+            solana_client (SolanaClient): Client used for the logs subscription
+            on_launch (callable): Called with each LaunchEvent that passes the filters
+            program_id (str): Program whose create events are watched
+            filters (LaunchFilters): Launch filters (optional)
+            commitment (str): Commitment level of the logs subscription
+            record_path (str): Append raw create notifications to this JSONL file for replay (optional)
+            max_seen (int): Number of recent mints remembered for de-duplication
+        """
+        self.solana_client = solana_client
+        self.on_launch = on_launch
+        self.program_id = program_id
+        self.filters = filters or LaunchFilters()
+        self.commitment = commitment
+        self.record_path = record_path
+        self.max_seen = max_seen
+        self.subscription = None
+        self.latency = LatencyStats()
+        self.notifications = 0
+        self.detected = 0
+        self.filtered = 0
+        self.launched = 0
+        self._seen = OrderedDict()
+        self._records = queue.SimpleQueue()
+        self._recorder = None
+        self._record_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.subscription is not None
+
+    def start(self):
+        """
+        Subscribe to the program's logs
+
+        Returns:
+            bool: True if the subscription is active
+        """
+        if self.subscription is None:
+            self.subscription = self.solana_client.subscribe_logs(self.program_id, self.handle_logs, self.commitment)
+            if self.subscription is not None:
+                logger.info(f"Watching {self.program_id} for new launches")
+        return self.subscription is not None
+
+    def stop(self):
+        """Cancel the logs subscription and finish writing recorded notifications"""
+        subscription, self.subscription = self.subscription, None
+        self.solana_client.unsubscribe(subscription)
+        with self._record_lock:
+            recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            self._records.put(None)
+            recorder.join(timeout=5)
+
+    def handle_logs(self, result):
+        """
+        Process one logsNotification result
+
+        Args:
+            result (dict): Notification result ({"context": ..., "value": {...}})
+        """
+        detected_at = time.perf_counter()
+        self.notifications += 1
+        value = (result or {}).get('value') or {}
+        if value.get('err'):
+            return
+
+        events = parse_create_events(value.get('logs') or [])
+        if not events:
+            return
+
+        for event in events:
+            if event.mint in self._seen:
+                continue
+            self._seen[event.mint] = None
+            if len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+
+            event.signature = value.get('signature')
+            event.slot = ((result or {}).get('context') or {}).get('slot')
+            event.detected_at = detected_at
+            self.detected += 1
+
+            rejected = self.filters.check(event)
+            if rejected:
+                self.filtered += 1
+                logger.debug(f"Skipping launch {event.mint} ({event.symbol}): {rejected}")
+                continue
+
+            logger.info(f"New launch detected: {event.name} ({event.symbol}) mint {event.mint}")
+            self.launched += 1
+            try:
+                self.on_launch(event)
+            except Exception as e:
+                logger.error(f"Error handing off launch {event.mint}: {str(e)}")
+
+        # Recorded only after the hand-off, and written off the event loop
+        if self.record_path:
+            self._record(result)
+
+    def record_submission(self, event, submitted_at):
+        """
+        Record when the first buy for a launch was sent
+
+        Args:
+            event (LaunchEvent): The detected launch
+            submitted_at (float): time.perf_counter() when the buy was sent
+        """
+        latency = submitted_at - event.detected_at
+        self.latency.record(latency)
+        logger.info(f"Launch {event.mint}: detection to submission {latency * 1000:.1f} ms")
+
+    def _record(self, result):
+        """Queue a notification for the recording thread"""
+        if self._recorder is None:
+            with self._record_lock:
+                if self._recorder is None:
+                    self._recorder = threading.Thread(target=self._write_records, name="launch-recorder",
+                                                      daemon=True)
+                    self._recorder.start()
+        self._records.put((time.time(), result))
+
+    def _write_records(self):
+        """Append queued notifications to record_path until stop() queues None"""
+        f = None
+        try:
+            while True:
+                entries = [self._records.get()]
+                # Write everything already queued with one flush
+                while True:
+                    try:
+                        entries.append(self._records.get_nowait())
+                    except queue.Empty:
+                        break
+                done = None in entries
+                try:
+                    if f is None:
+                        f = open(self.record_path, 'a')
+                    f.writelines(json.dumps({'t': t, 'result': result}) + "\n"
+                                 for t, result in (entry for entry in entries if entry is not None))
+                    f.flush()
+                except OSError as e:
+                    logger.warning(f"Could not record launch notification: {str(e)}")
+                    if f is not None:
+                        f.close()
+                        f = None
+                if done:
+                    return
+        finally:
+            if f is not None:
+                f.close()
+
+    def replay(self, path, speed=1.0):
+        """
+        Feed recorded notifications through the detector as if they were live
+
+        Args:
+            path (str): JSONL file written with record_path
+            speed (float): Replay speed multiplier (0 replays without pauses)
+
+        Returns:
+            int: Number of notifications replayed
+        """
+        count = 0
+        previous = None
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if previous is not None and speed > 0:
+                    time.sleep(max(0.0, entry['t'] - previous) / speed)
+                previous = entry['t']
+                self.handle_logs(entry['result'])
+                count += 1
+        return count
+
+    def stats(self):
+        """Get detection counters and detection-to-submission latency"""
+        return {
+            'running': self.running,
+            'program_id': self.program_id,
+            'notifications': self.notifications,
+            'detected': self.detected,
+            'filtered': self.filtered,
+            'launched': self.launched,
+            'detection_to_submission': self.latency.stats()
+        }
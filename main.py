@@ -1,10 +1,14 @@
 import os
 import logging
 import time
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, flash, redirect, url_for, stream_with_context
 import configparser
 import traceback
 from bot import PumpBot
+from bot_config import config_store
+from status_stream import publisher, encode_event, StatusCache
+import metrics
+from trade_trace import traces
 import json
 
 # Configure logging
@@ -19,13 +23,17 @@ app.secret_key = os.environ.get("SESSION_SECRET", "pump_fun_bot_secret")
 # Initialize bot instance
 bot = None
 
+# Longest a single /status_stream response stays open
+STATUS_STREAM_SECONDS = 300
+
+# Parse config.ini once and re-read it only when it changes
+config_store.start_watching()
+
 @app.route('/')
 def index():
     """Main page for the Pump.fun bot interface"""
-    config = configparser.ConfigParser()
-    if os.path.exists('config.ini'):
-        config.read('config.ini')
-    else:
+    if not os.path.exists(config_store.path):
+        config = configparser.ConfigParser()
         # Default configuration
         config['SETTINGS'] = {
             'rpc_url': 'https://api.mainnet-beta.solana.com',
@@ -45,8 +53,13 @@ def index():
             'num_buyers': '10'
         }
         
-        with open('config.ini', 'w') as f:
-            config.write(f)
+        config_store.write(config)
+        
+    config = config_store.current
+    if config is None:
+        # The file on disk does not validate; show it as-is so it can be fixed
+        config = configparser.ConfigParser()
+        config.read(config_store.path)
     
     return render_template('index.html', config=config)
 
@@ -54,39 +67,48 @@ def index():
 def save_config():
     """Save bot configuration"""
     try:
+        # Start from the current file so settings the form does not show
+        # (ws_url, rpc_hedge, journal_path, [LAUNCH_FILTERS], ...) are kept
         config = configparser.ConfigParser()
+        if config_store.current is not None:
+            config.read_dict(config_store.current.sections)
+        else:
+            config.read(config_store.path)
         
         # Settings section
-        config['SETTINGS'] = {
+        config.read_dict({'SETTINGS': {
             'rpc_url': request.form.get('rpc_url'),
             'slippage': request.form.get('slippage'),
             'buy_delay': request.form.get('buy_delay'),
-        }
+        }})
         
         # Wallets section
-        config['WALLETS'] = {}
+        if not config.has_section('WALLETS'):
+            config.add_section('WALLETS')
         for i in range(1, 5):  # Support up to 4 wallets
             wallet_key = request.form.get(f'wallet_key_{i}')
             if wallet_key and wallet_key.strip():
                 config['WALLETS'][f'wallet_{i}'] = wallet_key.strip()
+            else:
+                config.remove_option('WALLETS', f'wallet_{i}')
         
         # Buy amounts
-        config['BUY_AMOUNTS'] = {
+        config.read_dict({'BUY_AMOUNTS': {
             'amount1': request.form.get('amount1', '0.01'),
             'amount2': request.form.get('amount2', '0.05'),
             'amount3': request.form.get('amount3', '0.001'),
             'amount4': request.form.get('amount4', '0.1')
-        }
+        }})
         
         # Sell conditions
-        config['SELL_CONDITIONS'] = {
+        config.read_dict({'SELL_CONDITIONS': {
             'profit_percentage': request.form.get('profit_percentage', '50'),
             'timeout_seconds': request.form.get('timeout_seconds', '300'),
             'num_buyers': request.form.get('num_buyers', '10')
-        }
+        }})
         
-        with open('config.ini', 'w') as f:
-            config.write(f)
+        # Validated, written atomically and applied without a restart
+        config_store.write(config)
             
         flash('Configuration saved successfully!', 'success')
         return redirect(url_for('index'))
@@ -125,13 +147,37 @@ def start_bot():
         flash(f'Error starting bot: {str(e)}', 'danger')
         return redirect(url_for('index'))
 
+@app.route('/start_detector', methods=['POST'])
+def start_detector():
+    """Watch the Pump.fun program and snipe every launch that passes the filters"""
+    global bot
+    try:
+        # Create bot instance if it doesn't exist
+        if bot is None:
+            bot = PumpBot()
+            
+        success, message = bot.start_launch_detector()
+        
+        if success:
+            flash(f'Launch detector started! {message}', 'success')
+        else:
+            flash(f'Failed to start launch detector: {message}', 'danger')
+            
+        return redirect(url_for('index'))
+    except Exception as e:
+        logger.error(f"Error starting launch detector: {str(e)}")
+        logger.error(traceback.format_exc())
+        flash(f'Error starting launch detector: {str(e)}', 'danger')
+        return redirect(url_for('index'))
+
 @app.route('/stop_bot', methods=['POST'])
 def stop_bot():
     """Stop the Pump.fun sniper bot"""
     global bot
     try:
         if bot:
-            bot.stop()
+            # Stop a single campaign if a token is given, otherwise all of them
+            bot.stop(request.form.get('token_address', '').strip() or None)
             flash('Bot stopped successfully!', 'success')
         else:
             flash('Bot is not running!', 'warning')
@@ -142,23 +188,182 @@ def stop_bot():
         flash(f'Error stopping bot: {str(e)}', 'danger')
         return redirect(url_for('index'))
 
+def current_status():
+    """Full bot status, or the idle defaults before the bot exists"""
+    if bot:
+        return bot.get_status()
+    return {
+        'running': False,
+        'token': None,
+        'wallets': 0,
+        'transactions': [],
+        'campaigns': [],
+        'launch_detector': None,
+        'last_seq': 0
+    }
+    
+# Full status and its JSON body, rebuilt only when the status version moves
+status_cache = StatusCache(current_status, lambda status: app.json.dumps(status))
+# Versions restart with the process; tag ETags so old ones never match
+STATUS_EPOCH = f"{int(time.time()):x}"
+    
 @app.route('/bot_status', methods=['GET'])
 def bot_status():
-    """Get current bot status"""
+    """
+    Get current bot status
+    
+    Query parameters:
+        since (int): Only include transactions after this sequence number
+                     (the last_seq of a previous response)
+    
+    Responses carry the status version (plus the bot's counters) as an
+    ETag; a poll with a matching If-None-Match gets 304 Not Modified
+    without a body.
+    """
+    try:
+        since = request.args.get('since', type=int)
+        # Counters that move without a status event are part of the version
+        version = (publisher.version, bot.counters_key() if bot else ())
+        tag = f"{STATUS_EPOCH}-{version[0]}-{hash(version[1]) & 0xffffffffffffffff:x}"
+        etag = tag if since is None else f"{tag}-{since}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+            
+        status, body = status_cache.get(version)
+        if since is not None:
+            status = dict(status)
+            status['transactions'] = [tx for tx in status['transactions'] if tx['seq'] > since]
+            body = app.json.dumps(status)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        logger.error(f"Error getting bot status: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+        
+@app.route('/status_stream', methods=['GET'])
+def status_stream():
+    """
+    Stream status changes as server-sent events
+    
+    The stream opens with a full snapshot, then carries only new
+    transactions, campaign changes and bot summaries as they happen. It
+    ends after STATUS_STREAM_SECONDS so no worker thread is held
+    indefinitely; the browser reconnects and gets a fresh snapshot.
+    """
+    subscription = publisher.subscribe()
+    deadline = time.monotonic() + STATUS_STREAM_SECONDS
+    
+    def events():
+        try:
+            # Reconnect quickly once the server ends the stream
+            yield "retry: 1000\n\n"
+            # Subscribed first, so nothing published after the snapshot is missed
+            yield encode_event('snapshot', current_status())
+            while not subscription.overflowed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                message = subscription.get(timeout=min(15, remaining))
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield message
+                # Finishing a campaign can stop the bot; follow with a fresh summary
+                if message.startswith('event: campaign') and bot:
+                    yield encode_event('status', bot.get_summary())
+        finally:
+            publisher.unsubscribe(subscription)
+            
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics"""
+    try:
+        body = metrics.render(bot.collect_metrics() if bot else [])
+        return Response(body, mimetype='text/plain; version=0.0.4')
+    except Exception as e:
+        logger.error(f"Error rendering metrics: {str(e)}")
+        logger.error(traceback.format_exc())
+        return Response(f"# error: {str(e)}\n", status=500, mimetype='text/plain')
+        
+@app.route('/traces', methods=['GET'])
+def trade_traces():
+    """Per-trade stage timelines, newest first"""
+    try:
+        limit = request.args.get('limit', 100, type=int)
+        return jsonify({'traces': traces.snapshot(limit, request.args.get('token') or None)})
+    except Exception as e:
+        logger.error(f"Error reading trade traces: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+        
+@app.route('/traces/export', methods=['GET'])
+def export_traces():
+    """Download every stored trade timeline as JSON"""
+    return Response(traces.export(), mimetype='application/json',
+                    headers={'Content-Disposition': f'attachment; filename=trade-traces-{int(time.time())}.json'})
+        
+@app.route('/campaigns', methods=['GET'])
+def list_campaigns():
+    """Get the status of every campaign"""
     global bot
     try:
-        if bot:
-            status = bot.get_status()
-        else:
-            status = {
-                'running': False,
-                'token': None,
-                'wallets': 0,
-                'transactions': []
-            }
+        campaigns = bot.get_status()['campaigns'] if bot else []
+        return jsonify({'campaigns': campaigns})
+    except Exception as e:
+        logger.error(f"Error listing campaigns: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+        
+@app.route('/campaigns/<token_address>', methods=['GET', 'DELETE'])
+def campaign(token_address):
+    """Get one campaign's status, or stop and remove it"""
+    global bot
+    try:
+        if request.method == 'DELETE':
+            if bot and bot.remove_campaign(token_address):
+                return jsonify({'success': True})
+            return jsonify({'error': 'Campaign not found'}), 404
+            
+        status = bot.get_campaign_status(token_address) if bot else None
+        if status is None:
+            return jsonify({'error': 'Campaign not found'}), 404
         return jsonify(status)
     except Exception as e:
-        logger.error(f"Error getting bot status: {str(e)}")
+        logger.error(f"Error handling campaign {token_address}: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+        
+@app.route('/trades', methods=['GET'])
+def trades():
+    """Page through the trade journal, newest first"""
+    global bot
+    try:
+        def number(name, cast):
+            value = request.args.get(name)
+            return cast(value) if value not in (None, '') else None
+            
+        rows, next_cursor = bot.get_trades(
+            token=request.args.get('token') or None,
+            wallet=request.args.get('wallet') or None,
+            tx_type=request.args.get('type') or None,
+            since=number('since', float),
+            until=number('until', float),
+            cursor=number('cursor', int),
+            limit=number('limit', int) or 100
+        ) if bot else ([], None)
+        return jsonify({'trades': rows, 'next_cursor': next_cursor})
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    except Exception as e:
+        logger.error(f"Error reading trade journal: {str(e)}")
         logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
         
@@ -231,7 +436,10 @@ def test_wallet():
         wallet = Wallet(wallet_key, solana_client)
         
         # Test wallet connection
-        balance = wallet.get_balance()
+        try:
+            balance = wallet.get_balance()
+        finally:
+            solana_client.close()
         
         return jsonify({
             'success': True, 
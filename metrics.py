@@ -0,0 +1,171 @@
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds: sub-millisecond RPC hits up to slow confirmations
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_metrics = []
+_metrics_lock = threading.Lock()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """
+    Base of the lock-free metrics
+
+    Every thread records into its own shard, so the hot path is a dict
+    lookup and an in-place add with no lock and no contention. A scrape
+    copies each shard and adds them up.
+    """
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        """
+        Initialize metric
+
+        Args:
+            name (str): Prometheus metric name
+            help_text (str): HELP line
+            labels (tuple): Label names; record calls pass values in this order
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._local = threading.local()
+        with _metrics_lock:
+            _metrics.append(self)
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            # First record from this thread
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshots(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() runs without releasing the GIL, so it never sees a half-done insert
+        return [shard.copy() for shard in shards]
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    kind = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def values(self):
+        """Get label values -> total"""
+        totals = {}
+        for shard in self._snapshots():
+            for label_values, value in shard.items():
+                totals[label_values] = totals.get(label_values, 0) + value
+        return totals
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+                for label_values, value in sorted(self.values().items())]
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        shard = self._shard()
+        cell = shard.get(label_values)
+        if cell is None:
+            # One count per bucket, the +Inf bucket, then the sum
+            cell = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def values(self):
+        """Get label values -> (per-bucket counts, sum)"""
+        totals = {}
+        for shard in self._snapshots():
+            for label_values, cell in shard.items():
+                cell = cell[:]
+                total = totals.get(label_values)
+                if total is None:
+                    totals[label_values] = cell
+                else:
+                    for i, value in enumerate(cell):
+                        total[i] += value
+        return {label_values: (cell[:-1], cell[-1]) for label_values, cell in totals.items()}
+
+    def render(self):
+        lines = []
+        for label_values, (counts, total) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, ('le', _format_value(bound)))} "
+                             f"{cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+def render(samples=()):
+    """
+    Render every metric in the Prometheus text exposition format
+
+    Args:
+        samples (list): Extra (name, kind, help, [(labels dict, value)]) families
+                        read at scrape time, e.g. cache and queue gauges
+
+    Returns:
+        str: Exposition text
+    """
+    with _metrics_lock:
+        metrics = list(_metrics)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for name, kind, help_text, values in samples:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in values:
+            if value is None:
+                continue
+            label_text = _format_labels(labels.keys(), labels.values()) if labels else ''
+            lines.append(f"{name}{label_text} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+# Metrics recorded across the bot
+RPC_LATENCY = Histogram('pumpbot_rpc_request_duration_seconds', 'JSON-RPC request latency by method', ('method',))
+RPC_ERRORS = Counter('pumpbot_rpc_errors_total', 'JSON-RPC requests that returned an error, by method', ('method',))
+SEND_TO_CONFIRM = Histogram('pumpbot_send_to_confirm_seconds', 'Time from sending a trade to its confirmation',
+                            ('side',))
+BUY_FAN_OUT = Histogram('pumpbot_buy_fan_out_seconds', "Time from a campaign's first buy starting to its last finishing")
+MONITOR_LAG = Histogram('pumpbot_monitor_lag_seconds', 'Time from a token update arriving to its sell check starting')
+TIMER_LAG = Histogram('pumpbot_timer_lag_seconds', 'How late campaign timers (stagger, timeout, polls) fired')
@@ -1,13 +1,20 @@
 import logging
 import time
-import base64
 import json
-from typing import Tuple, Dict, Any, List, Optional, Union
+import struct
+from typing import Dict, Any, List, Optional, Union
 from wallet import PublicKey, Transaction
+from solana_client import ClientResponse
+from bonding_curve import BondingCurve, LAMPORTS_PER_SOL, TOKEN_UNIT, slippage_basis_points
+from account_layouts import BONDING_CURVE_LAYOUT, account_data_bytes, account_data_field
+import addresses
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Simplified token data: 8-byte header, buyer count, price in lamports
+TOKEN_INFO_LAYOUT = struct.Struct('<8xQQ')
+
 class PumpFunAPI:
     """API client for Pump.fun platform"""
     
@@ -26,35 +33,216 @@ class PumpFunAPI:
             else:
                 token_pubkey = token_address
                 
-            # Get token account data from Solana
-            resp = self.solana_client.get_account_info(token_pubkey)
+            # Get token account data from Solana (shared short-TTL cache)
+            resp = self.solana_client.get_cached_account_info(token_pubkey)
+            
+            return self.parse_token_info(token_pubkey, resp)
+        except Exception as e:
+            logger.error(f"Error getting token info: {str(e)}")
+            return None
+            
+    def get_tokens_info(self, token_addresses):
+        """
+        Get information about many tokens with bulk account reads
+        
+        Args:
+            token_addresses (list): Token mint addresses
+            
+        Returns:
+            dict: Token address -> token info (None if not found)
+        """
+        token_addresses = [str(token_address) for token_address in token_addresses]
+        accounts = self.solana_client.get_multiple_accounts(token_addresses)
+        return {
+            token_address: self.parse_token_info(token_address, ClientResponse(account))
+            for token_address, account in zip(token_addresses, accounts)
+        }
             
+    def parse_token_info(self, token_address, resp):
+        """
+        Parse a getAccountInfo response for a token into token info
+        
+        Args:
+            token_address: Token mint address
+            resp (ClientResponse): Account info response
+            
+        Returns:
+            dict: Token info, or None if the account does not exist
+        """
+        try:
+            if resp is not None and resp.error:
+                # Rate limiting or a node failure, not a missing token
+                logger.warning(f"RPC error reading token {token_address}: {resp.error}")
+                return None
+                
             if not resp or not resp.value:
                 logger.warning(f"Token {token_address} not found")
                 return None
                 
-            # Parse account data
-            data = resp.value.data
+            # Parse account data (RPC delivers [base64, "base64"])
+            data = account_data_field(resp.value)
             if not data:
                 return None
                 
+            # Curve reserves give the exact spot price and local trade quotes.
+            # A curve has no buyer count, so the key is left out and the
+            # num_buyers sell rule is skipped rather than fed a fake 0.
+            curve = BondingCurve.from_account_data(data)
+            if curve is not None:
+                return {
+                    'token_address': str(token_address),
+                    'price': curve.spot_price(),
+                    'curve': curve
+                }
+                
             # Simple parsing of the token data structure
             # This is a simplified approach - in a real implementation,
             # you'd need to properly decode the account data according to
             # Pump.fun's specific data structure
-            buyers_count = int.from_bytes(data[8:16], byteorder='little')
-            price = int.from_bytes(data[16:24], byteorder='little') / 1e9  # Convert lamports to SOL
+            data = account_data_bytes(data)
+            if data is None or len(data) < TOKEN_INFO_LAYOUT.size:
+                return None
+            buyers_count, price_lamports = TOKEN_INFO_LAYOUT.unpack_from(data)
             
             return {
-                'token_address': str(token_pubkey),
+                'token_address': str(token_address),
                 'buyers_count': buyers_count,
-                'price': price,
-                'raw_data': base64.b64encode(data).decode('utf-8')
+                'price': price_lamports / 1e9,  # Convert lamports to SOL
+                'curve': None
             }
         except Exception as e:
-            logger.error(f"Error getting token info: {str(e)}")
+            logger.error(f"Error parsing token info: {str(e)}")
             return None
     
+    def iter_bonding_curves(self, page_size=256):
+        """
+        Stream every bonding curve owned by the Pump.fun program
+        
+        The node filters on the account discriminator, and each curve is
+        decoded straight from its base64 payload without decoding the rest.
+        
+        Args:
+            page_size (int): Accounts handed over from the event loop at a time
+            
+        Yields:
+            tuple: (bonding curve address, BondingCurve)
+            
+        Raises:
+            RateLimited, RpcError, httpx.HTTPError: If the scan did not run to the end
+        """
+        accounts = self.solana_client.iter_program_accounts(
+            self.PROGRAM_ID,
+            filters=[BONDING_CURVE_LAYOUT.memcmp_filter()],
+            page_size=page_size
+        )
+        for account in accounts:
+            curve = BondingCurve.from_account_data(account_data_field(account.get('account')))
+            if curve is not None:
+                yield account.get('pubkey'), curve
+                
+    def subscribe_token_info(self, token_address, callback):
+        """
+        Push fresh token info to a callback whenever the token account changes
+        
+        Args:
+            token_address (str): Token mint address
+            callback (callable): Called with the parsed token info dict
+            
+        Returns:
+            Subscription: Handle for SolanaClient.unsubscribe(), or None
+        """
+        def on_account_update(result):
+            resp = ClientResponse((result or {}).get('value'))
+            # Pushed state is the freshest we have; serve cache readers from it
+            if resp.value is not None:
+                self.solana_client.account_cache.put(str(token_address), resp)
+            token_info = self.parse_token_info(token_address, resp)
+            if token_info:
+                callback(token_info)
+                
+        return self.solana_client.subscribe_account(token_address, on_account_update)
+        
+    def wait_for_confirmation(self, signature, max_wait=30, trace=None):
+        """
+        Wait for a transaction to be confirmed
+        
+        The signature is registered with the client's shared confirmation
+        tracker, which checks all pending transactions in one batched call
+        per tick and resolves early on a signatureSubscribe notification.
+        
+        Args:
+            signature (str): Transaction signature
+            max_wait (float): Maximum wait time in seconds
+            trace (TradeTrace): Timeline to mark first-seen and confirmed on (optional)
+            
+        Returns:
+            tuple: (confirmed, error message)
+        """
+        try:
+            on_seen = (lambda: trace.mark('first-seen')) if trace is not None else None
+            confirmed, error = self.solana_client.track_signature(signature, max_wait, on_seen).result(max_wait + 5)
+            if confirmed and trace is not None:
+                trace.mark('confirmed')
+            return confirmed, error
+        except Exception as e:
+            logger.error(f"Error waiting for confirmation: {str(e)}")
+            return False, f"Confirmation error: {str(e) or type(e).__name__}"
+    
+    def get_curve(self, token_address):
+        """
+        Get a token's bonding curve account from the shared account cache
+        
+        Args:
+            token_address (str): Token mint address
+            
+        Returns:
+            BondingCurve: Current curve, or None if it could not be read or decoded
+        """
+        curve_address = addresses.bonding_curve_address(str(token_address), self.PROGRAM_ID)
+        try:
+            resp = self.solana_client.get_cached_account_info(curve_address)
+        except Exception as e:
+            logger.error(f"Error getting bonding curve: {str(e)}")
+            return None
+        if resp is None or resp.error or not resp.value:
+            return None
+        return BondingCurve.from_account_data(account_data_field(resp.value))
+        
+    def quote_buys(self, token_address, amounts_sol, slippage=10.0, sequential=True, fresh_launch=False):
+        """
+        Quote several buys of one token with a single curve read
+        
+        Args:
+            token_address (str): Token mint address
+            amounts_sol (list): SOL to spend per buy
+            slippage (float): Slippage tolerance percentage
+            sequential (bool): Each buy sees the curve moved by the buys before it
+            fresh_launch (bool): The launch detector saw this token's create moments
+                                 ago, so an unreadable curve is still the initial one
+            
+        Returns:
+            list: Quotes from BondingCurve.quote_buy(), or None if the curve is
+                  unknown (buys then go out without a quote)
+        """
+        curve = self.get_curve(token_address)
+        estimated = False
+        if curve is None:
+            if not fresh_launch:
+                return None
+            curve, estimated = BondingCurve.initial(), True
+        quotes = curve.quote_buys([int(amount_sol * LAMPORTS_PER_SOL) for amount_sol in amounts_sol],
+                                  slippage_basis_points(slippage), sequential)
+        if estimated:
+            # Bounds the fill, but its price is not an observed one
+            for quote in quotes:
+                quote['estimated'] = True
+        return quotes
+        
+    def invalidate(self, token_address):
+        """Drop a token's cached mint and curve after a trade moved them"""
+        self.solana_client.invalidate_account(token_address)
+        self.solana_client.invalidate_account(addresses.bonding_curve_address(str(token_address), self.PROGRAM_ID))
+        
     def buy_token(self, token_address, wallet, amount_sol, slippage=10.0):
         """
         Buy tokens on Pump.fun
@@ -68,56 +256,166 @@ class PumpFunAPI:
         Returns:
             tuple: (success, transaction_info)
         """
-        try:
-            # Convert string to PublicKey if necessary
-            if isinstance(token_address, str):
-                token_pubkey = PublicKey(token_address)
-            else:
-                token_pubkey = token_address
-                
-            # Create Pump.fun PDA (Program Derived Address) - simplified for demo
-            seed_str = f"bonding_curve_{token_pubkey}"
-            pump_pda = PublicKey(f"pda-{seed_str}-{self.PROGRAM_ID}")
-            
-            # Convert SOL amount to lamports
-            amount_lamports = int(amount_sol * 1e9)
+        success, tx_info = self.send_buy(token_address, wallet, amount_sol, slippage)
+        if not success:
+            return False, tx_info
+        return self.confirm_buy(token_address, tx_info)
+        
+    def send_buy(self, token_address, wallet, amount_sol, slippage=10.0, quote=None, trace=None, fresh_launch=False):
+        """
+        Build, sign and send a buy without waiting for confirmation
+        
+        Args:
+            token_address (str): Token mint address
+            wallet (Wallet): Wallet instance
+            amount_sol (float): Amount of SOL to spend
+            slippage (float): Slippage tolerance percentage
+            quote (dict): Quote to buy at (optional, quoted from the current curve if omitted)
+            trace (TradeTrace): Timeline to mark stages on (optional)
+            fresh_launch (bool): See quote_buys()
             
-            # Build transaction - for Pump.fun, we create a simple instruction to simulate transfer
-            transaction = Transaction()
-            # Simplified instruction for demo (in real implementation, this would be an actual transfer instruction)
-            instruction = {
-                'programId': self.PROGRAM_ID,
-                'accounts': [
-                    {'pubkey': wallet.get_public_key(), 'isSigner': True, 'isWritable': True},
-                    {'pubkey': pump_pda, 'isSigner': False, 'isWritable': True}
-                ],
-                'data': f"buy:{amount_lamports}"
-            }
-            transaction.add(instruction)
+        Returns:
+            tuple: (success, transaction_info or error message)
+        """
+        try:
+            if quote is None:
+                quotes = self.quote_buys(token_address, [amount_sol], slippage, fresh_launch=fresh_launch)
+                quote = quotes[0] if quotes else None
+            transaction = self.build_buy_transaction(token_address, wallet, amount_sol, slippage, quote)
+            if trace is not None:
+                trace.mark('build')
             
             # Sign and send transaction
-            signature = wallet.send_transaction(transaction)
+            signature = wallet.send_transaction(transaction, trace)
             
             if not signature:
                 return False, "Failed to send transaction"
                 
+            return True, {
+                'transaction_hash': signature,
+                'amount_sol': amount_sol,
+                'quote': quote
+            }
+            
+        except Exception as e:
+            logger.error(f"Error buying token: {str(e)}")
+            return False, str(e)
+            
+    def trade_accounts(self, token_address, wallet):
+        """
+        Get the accounts a trade of a token by a wallet touches
+        
+        Addresses come from the derivation cache (warmed by warm_addresses),
+        so nothing is derived on the send path.
+        
+        Args:
+            token_address (str): Token mint address
+            wallet (Wallet): Wallet instance
+            
+        Returns:
+            tuple: (bonding curve, bonding curve token account, wallet token account)
+        """
+        mint = str(token_address)
+        return (
+            addresses.bonding_curve_address(mint, self.PROGRAM_ID),
+            addresses.associated_bonding_curve(mint, self.PROGRAM_ID),
+            addresses.associated_token_address(str(wallet.get_public_key()), mint)
+        )
+        
+    def warm_addresses(self, token_address, wallets):
+        """Derive a token's trade accounts for every wallet ahead of the first trade"""
+        addresses.warm(token_address, [wallet.get_public_key() for wallet in wallets], self.PROGRAM_ID)
+        
+    def build_buy_transaction(self, token_address, wallet, amount_sol, slippage=10.0, quote=None):
+        """
+        Build an unsigned buy transaction
+        
+        Args:
+            token_address (str): Token mint address
+            wallet (Wallet): Wallet instance
+            amount_sol (float): Amount of SOL to spend
+            slippage (float): Slippage tolerance percentage
+            quote (dict): Buy quote; its token amount and max SOL cost go into
+                          the instruction so slippage bounds the fill (optional)
+            
+        Returns:
+            Transaction: Transaction with the buy instruction in place
+        """
+        # Pump.fun PDA (Program Derived Address) and token accounts - simplified for demo
+        pump_pda, curve_account, user_account = self.trade_accounts(token_address, wallet)
+        
+        # Convert SOL amount to lamports
+        amount_lamports = int(amount_sol * 1e9)
+        
+        # Build transaction - for Pump.fun, we create a simple instruction to simulate transfer
+        transaction = Transaction()
+        # Simplified instruction for demo (in real implementation, this would be an actual transfer instruction)
+        instruction = {
+            'programId': self.PROGRAM_ID,
+            'accounts': [
+                {'pubkey': wallet.get_public_key(), 'isSigner': True, 'isWritable': True},
+                {'pubkey': pump_pda, 'isSigner': False, 'isWritable': True},
+                {'pubkey': curve_account, 'isSigner': False, 'isWritable': True},
+                {'pubkey': user_account, 'isSigner': False, 'isWritable': True}
+            ],
+            'data': f"buy:{amount_lamports}"
+        }
+        if quote is not None:
+            # Buy exactly the quoted tokens, paying no more than the slippage allows
+            instruction['data'] = f"buy:{quote['amount_out']}:{quote['max_sol_cost']}"
+        transaction.add(instruction)
+        return transaction
+        
+    def confirm_buy(self, token_address, tx_info, trace=None):
+        """
+        Wait for a sent buy to confirm and estimate the tokens received
+        
+        Args:
+            token_address (str): Token mint address
+            tx_info (dict): Transaction info returned by send_buy()
+            trace (TradeTrace): Timeline to mark first-seen and confirmed on (optional)
+            
+        Returns:
+            tuple: (success, transaction_info)
+        """
+        try:
             # Wait for confirmation
-            start_time = time.time()
-            max_wait = 30  # Maximum wait time in seconds
+            confirmed, error = self.wait_for_confirmation(tx_info['transaction_hash'], trace=trace)
+            if not confirmed:
+                return False, error
+            return self.settle_buy(token_address, tx_info)
             
-            while time.time() - start_time < max_wait:
-                confirm_status = self.solana_client.get_signature_statuses([signature], search_transaction_history=True)
-                
-                if confirm_status and confirm_status.value[0]:
-                    if confirm_status.value[0].err:
-                        return False, f"Transaction failed: {confirm_status.value[0].err}"
-                    elif confirm_status.value[0].confirmation_status == "confirmed" or confirm_status.value[0].confirmation_status == "finalized":
-                        break
-                        
-                time.sleep(1)
-                
-            if time.time() - start_time >= max_wait:
-                return False, "Transaction confirmation timeout"
+        except Exception as e:
+            logger.error(f"Error buying token: {str(e)}")
+            return False, str(e)
+            
+    def settle_buy(self, token_address, tx_info):
+        """
+        Work out a confirmed buy's fill
+        
+        Callers that confirm through SolanaClient.track_signature() themselves
+        call this once the buy has confirmed.
+        
+        Args:
+            token_address (str): Token mint address
+            tx_info (dict): Transaction info returned by send_buy()
+            
+        Returns:
+            tuple: (success, transaction_info)
+        """
+        try:
+            # The buy moved the curve, so bypass the cached state
+            self.invalidate(token_address)
+            
+            quote = tx_info.get('quote')
+            if quote is not None and not quote.get('estimated'):
+                # The fill is known from a quote against the real curve
+                return True, {
+                    'transaction_hash': tx_info['transaction_hash'],
+                    'amount_sol': tx_info['amount_sol'],
+                    'token_amount': quote['amount_out'] / TOKEN_UNIT,
+                    'price': quote['price']
+                }
                 
             # Get token account to determine received tokens
             # This would require knowledge of the token account structure
@@ -126,10 +424,15 @@ class PumpFunAPI:
             # Estimate token amount received
             # This is a simplified calculation - real implementation needs 
             # to use the actual bonding curve formula from Pump.fun
-            estimated_token_amount = amount_sol / (token_info.get('price', 0.001) if token_info else 0.001)
+            amount_sol = tx_info['amount_sol']
+            if quote is not None:
+                # An exact-out buy: the amount is fixed even if the curve was assumed
+                estimated_token_amount = quote['amount_out'] / TOKEN_UNIT
+            else:
+                estimated_token_amount = amount_sol / (token_info.get('price', 0.001) if token_info else 0.001)
             
             return True, {
-                'transaction_hash': signature,
+                'transaction_hash': tx_info['transaction_hash'],
                 'amount_sol': amount_sol,
                 'token_amount': estimated_token_amount,
                 'price': token_info.get('price', 0) if token_info else 0
@@ -149,24 +452,55 @@ class PumpFunAPI:
             token_amount (float): Amount of tokens to sell
             slippage (float): Slippage tolerance percentage
             
+        Returns:
+            tuple: (success, transaction_info)
+        """
+        success, tx_info = self.send_sell(token_address, wallet, token_amount, slippage)
+        if not success:
+            return False, tx_info
+            
+        # Wait for confirmation
+        confirmed, error = self.wait_for_confirmation(tx_info['transaction_hash'])
+        if not confirmed:
+            return False, error
+            
+        # The sale moved the curve; later readers must refetch
+        self.invalidate(token_address)
+        
+        return True, tx_info
+        
+    def send_sell(self, token_address, wallet, token_amount, slippage=10.0, trace=None):
+        """
+        Build, sign and send a sell without waiting for confirmation
+        
+        Callers confirm the returned transaction_hash themselves, e.g. through
+        SolanaClient.track_signature(), so many sells can be in flight at once.
+        
+        Args:
+            token_address (str): Token mint address
+            wallet (Wallet): Wallet instance
+            token_amount (float): Amount of tokens to sell
+            slippage (float): Slippage tolerance percentage
+            trace (TradeTrace): Timeline to mark stages on (optional)
+            
         Returns:
             tuple: (success, transaction_info)
         """
         try:
-            # Convert string to PublicKey if necessary
-            if isinstance(token_address, str):
-                token_pubkey = PublicKey(token_address)
-            else:
-                token_pubkey = token_address
-                
             # Get current token info
             token_info = self.get_token_info(token_address)
             if not token_info:
                 return False, "Token not found"
                 
-            # Create Pump.fun PDA (Program Derived Address) - simplified for demo
-            seed_str = f"bonding_curve_{token_pubkey}"
-            pump_pda = PublicKey(f"pda-{seed_str}-{self.PROGRAM_ID}")
+            curve = self.get_curve(token_address)
+            quote = None
+            if curve is not None:
+                quote = curve.quote_sell(int(round(token_amount * TOKEN_UNIT)), slippage_basis_points(slippage))
+            if trace is not None:
+                trace.mark('pre-checks')
+                
+            # Pump.fun PDA (Program Derived Address) and token accounts - simplified for demo
+            pump_pda, curve_account, user_account = self.trade_accounts(token_address, wallet)
             
             # In a real implementation, you'd create a transaction to call 
             # Pump.fun's sell instruction. Here, we're simulating it with a simple transfer.
@@ -181,39 +515,30 @@ class PumpFunAPI:
                 'programId': self.PROGRAM_ID,
                 'accounts': [
                     {'pubkey': wallet.get_public_key(), 'isSigner': True, 'isWritable': True},
-                    {'pubkey': pump_pda, 'isSigner': False, 'isWritable': True}
+                    {'pubkey': pump_pda, 'isSigner': False, 'isWritable': True},
+                    {'pubkey': curve_account, 'isSigner': False, 'isWritable': True},
+                    {'pubkey': user_account, 'isSigner': False, 'isWritable': True}
                 ],
                 'data': f"sell:{token_amount}"
             }
+            if quote is not None:
+                # Refuse to fill below the slippage-bounded proceeds
+                instruction['data'] = f"sell:{quote['amount_in']}:{quote['min_sol_output']}"
             transaction.add(instruction)
+            if trace is not None:
+                trace.mark('build')
             
             # Sign and send transaction
-            signature = wallet.send_transaction(transaction)
+            signature = wallet.send_transaction(transaction, trace)
             
             if not signature:
                 return False, "Failed to send transaction"
                 
-            # Wait for confirmation
-            start_time = time.time()
-            max_wait = 30  # Maximum wait time in seconds
-            
-            while time.time() - start_time < max_wait:
-                confirm_status = self.solana_client.get_signature_statuses([signature], search_transaction_history=True)
-                
-                if confirm_status and confirm_status.value[0]:
-                    if confirm_status.value[0].err:
-                        return False, f"Transaction failed: {confirm_status.value[0].err}"
-                    elif confirm_status.value[0].confirmation_status == "confirmed" or confirm_status.value[0].confirmation_status == "finalized":
-                        break
-                        
-                time.sleep(1)
-                
-            if time.time() - start_time >= max_wait:
-                return False, "Transaction confirmation timeout"
-                
-            # Estimate SOL received from the sale
-            # This is a simplified calculation
-            estimated_sol_amount = token_amount * token_info.get('price', 0)
+            # SOL received from the sale, after fees
+            if quote is not None:
+                estimated_sol_amount = quote['amount_out'] / LAMPORTS_PER_SOL
+            else:
+                estimated_sol_amount = token_amount * token_info.get('price', 0)
             
             return True, {
                 'transaction_hash': signature,
@@ -0,0 +1,194 @@
+import logging
+import time
+import heapq
+import asyncio
+import itertools
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower values are served first
+CRITICAL = 0
+NORMAL = 1
+BACKGROUND = 2
+
+# Methods that must never queue behind polling
+METHOD_PRIORITIES = {
+    "sendTransaction": CRITICAL,
+    "getSignatureStatuses": CRITICAL,
+    "getLatestBlockhash": CRITICAL,
+    "getProgramAccounts": BACKGROUND,
+    "getTokenAccountsByOwner": BACKGROUND,
+}
+
+# Providers meter these separately from ordinary reads
+METHOD_CLASSES = {
+    "sendTransaction": "send",
+    "getProgramAccounts": "heavy",
+}
+
+def method_priority(method):
+    return METHOD_PRIORITIES.get(method, NORMAL)
+
+def method_class(method):
+    return METHOD_CLASSES.get(method, "default")
+
+class RateLimited(Exception):
+    """Raised when an RPC node answers 429 Too Many Requests"""
+    def __init__(self, retry_after=None):
+        super().__init__("Rate limited" + (f" (retry after {retry_after}s)" if retry_after else ""))
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds; returns None if absent or invalid"""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    Token bucket with priority lanes and AIMD rate adaptation
+
+    The rate grows additively on success and is halved when the node starts
+    answering 429, so the bucket converges on the highest rate it accepts.
+    """
+    def __init__(self, rate=50.0, burst=None, min_rate=1.0, max_rate=500.0, increase=0.1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate (float): Initial requests per second (raised to min_rate if lower)
+            burst (float): Bucket capacity (defaults to one second of rate)
+            min_rate (float): Lowest rate a 429 can push the bucket to
+            max_rate (float): Highest rate successes can raise it to
+            increase (float): Requests/second added per successful request
+        """
+        if min_rate <= 0:
+            raise ValueError("min_rate must be positive")
+        # A zero rate would never refill the bucket
+        self.rate = max(rate, min_rate)
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self._waiters = []  # heap of (priority, seq, cost, future)
+        self._seq = itertools.count()
+        self._drainer = None
+
+    @property
+    def capacity(self):
+        return self.burst if self.burst is not None else max(1.0, self.rate)
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _try_take(self, cost, now):
+        if now < self.blocked_until:
+            return False
+        self._refill(now)
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    async def acquire(self, priority=NORMAL, cost=1):
+        """Wait for permission to send a request"""
+        cost = min(cost, self.capacity)
+        if not self._waiters and self._try_take(cost, time.monotonic()):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), cost, future))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.ensure_future(self._drain())
+        await future
+
+    async def _drain(self):
+        try:
+            await self._serve_waiters()
+        except BaseException as e:
+            # Fail the queued requests rather than leave them waiting on a drainer that is gone
+            waiters, self._waiters = self._waiters, []
+            for _, _, _, future in waiters:
+                if not future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            logger.error(f"Rate limiter drain failed: {str(e)}")
+
+    async def _serve_waiters(self):
+        while self._waiters:
+            priority, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            now = time.monotonic()
+            if self._try_take(cost, now):
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+
+            if now < self.blocked_until:
+                delay = self.blocked_until - now
+            else:
+                delay = (cost - self.tokens) / self.rate
+            await asyncio.sleep(max(delay, 0.001))
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttled(self, retry_after=None):
+        """Back off after a 429, honouring Retry-After if given"""
+        now = time.monotonic()
+        self.throttled += 1
+        self.tokens = 0.0
+        pause = retry_after if retry_after is not None else 1.0 / self.rate
+        self.blocked_until = max(self.blocked_until, now + pause)
+
+        # A burst of requests sent at the old rate comes back as a burst of
+        # 429s; halve once per second rather than once per response
+        if now - self.last_decrease < 1.0:
+            return
+        self.last_decrease = now
+        self.rate = max(self.min_rate, self.rate / 2)
+        logger.warning(f"RPC rate limited; lowering rate to {self.rate:.1f} req/s for {pause:.2f}s")
+
+class EndpointLimiter:
+    """One adaptive token bucket per method class for a single RPC node"""
+    def __init__(self, rate=50.0, max_rate=500.0):
+        self.initial_rate = rate
+        self.max_rate = max_rate
+        self.buckets = {}
+
+    def bucket(self, method):
+        name = method_class(method)
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            bucket = TokenBucket(rate=self.initial_rate, max_rate=self.max_rate)
+            self.buckets[name] = bucket
+        return bucket
+
+    async def acquire(self, method, priority=None, cost=1):
+        await self.bucket(method).acquire(method_priority(method) if priority is None else priority, cost)
+
+    def on_success(self, method):
+        self.bucket(method).on_success()
+
+    def on_throttled(self, method, retry_after=None):
+        self.bucket(method).on_throttled(retry_after)
+
+    def stats(self):
+        return {
+            name: {'rate': round(bucket.rate, 2), 'throttled': bucket.throttled}
+            for name, bucket in self.buckets.items()
+        }
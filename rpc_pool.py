@@ -0,0 +1,172 @@
+import logging
+import time
+import asyncio
+from rate_limiter import EndpointLimiter, RateLimited
+
+logger = logging.getLogger(__name__)
+
+class RpcEndpoint:
+    """Health and latency statistics for a single RPC node"""
+    def __init__(self, url, alpha=0.2, rate_limit=50.0):
+        self.url = url
+        self.alpha = alpha
+        self.limiter = EndpointLimiter(rate=rate_limit)
+        self.latency = None  # Moving average latency in seconds
+        self.error_rate = 0.0  # Moving average error rate (0..1)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def record_success(self, latency):
+        """Record a successful request and its latency"""
+        self.requests += 1
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.alpha * (latency - self.latency)
+        self.error_rate -= self.alpha * self.error_rate
+
+    def record_failure(self):
+        """Record a failed request"""
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+
+    def is_healthy(self, now=None):
+        return (now or time.monotonic()) >= self.ejected_until
+
+    def score(self):
+        """Lower is better; untried nodes score 0 so they get probed"""
+        latency = self.latency or 0.0
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 4),
+            'requests': self.requests,
+            'errors': self.errors,
+            'healthy': self.is_healthy(),
+            'rate_limits': self.limiter.stats()
+        }
+
+class RpcPool:
+    """Pool of RPC endpoints with latency-aware routing and hedged requests"""
+    def __init__(self, urls, hedge=1, alpha=0.2, eject_after=3, error_threshold=0.5, cooldown=30.0,
+                 rate_limit=50.0):
+        """
+        Initialize RPC pool
+
+        Args:
+            urls (list): RPC endpoint URLs
+            hedge (int): Number of nodes latency-critical calls are sent to
+            alpha (float): Smoothing factor for the moving averages
+            eject_after (int): Consecutive failures before a node is ejected
+            error_threshold (float): Error rate above which a node is ejected
+            cooldown (float): Seconds an ejected node is kept out of rotation
+            rate_limit (float): Initial requests/second per node and method class
+        """
+        if not urls:
+            raise ValueError("RPC pool needs at least one endpoint")
+
+        self.endpoints = [RpcEndpoint(url, alpha=alpha, rate_limit=rate_limit) for url in urls]
+        self.hedge = max(1, int(hedge))
+        self.eject_after = eject_after
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+
+    def select(self, count=1):
+        """
+        Pick the best endpoints for a request
+
+        Args:
+            count (int): Number of endpoints wanted
+
+        Returns:
+            list: Healthy endpoints ordered by score, or the endpoint
+                  closest to the end of its cooldown if none are healthy
+        """
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.is_healthy(now)]
+        if not healthy:
+            return [min(self.endpoints, key=lambda endpoint: endpoint.ejected_until)]
+        healthy.sort(key=lambda endpoint: endpoint.score())
+        return healthy[:count]
+
+    def record_failure(self, endpoint):
+        """Count a failed request against a node, ejecting it once it keeps failing"""
+        endpoint.record_failure()
+        if (endpoint.consecutive_failures >= self.eject_after or
+                (endpoint.requests >= self.eject_after and endpoint.error_rate >= self.error_threshold)):
+            endpoint.ejected_until = time.monotonic() + self.cooldown
+            endpoint.consecutive_failures = 0
+            logger.warning(f"Ejecting RPC endpoint {endpoint.url} for {self.cooldown}s")
+
+    async def _post_to(self, endpoint, send, method=None, priority=None, cost=1):
+        await endpoint.limiter.acquire(method, priority, cost)
+        start = time.perf_counter()
+        try:
+            result = await send(endpoint.url)
+        except RateLimited as e:
+            # The node is fine, we are just too fast for it
+            endpoint.limiter.on_throttled(method, e.retry_after)
+            raise
+        except Exception:
+            # Cancellation (losing a hedge race) is not an Exception and is not counted
+            self.record_failure(endpoint)
+            raise
+        endpoint.limiter.on_success(method)
+        endpoint.record_success(time.perf_counter() - start)
+        return result
+
+    async def request(self, send, hedge=False, method=None, priority=None, cost=1):
+        """
+        Run a request against the pool
+
+        Args:
+            send (callable): Coroutine function taking an endpoint URL
+            hedge (bool): Race the request across `self.hedge` nodes
+            method (str): RPC method, used to pick the rate-limit bucket and lane
+            priority (int): Rate-limiter lane, overriding the method default
+            cost (int): Number of RPC calls the request carries (batches)
+
+        Returns:
+            object: Result of the first successful attempt
+        """
+        if hedge and self.hedge > 1:
+            return await self._hedged(send, self.select(self.hedge), method, priority, cost)
+
+        # Single attempt on the best node, failing over once to the next best
+        candidates = self.select(2)
+        last_error = None
+        for endpoint in candidates:
+            try:
+                return await self._post_to(endpoint, send, method, priority, cost)
+            except Exception as e:
+                last_error = e
+                logger.debug(f"RPC endpoint {endpoint.url} failed: {str(e) or type(e).__name__}")
+        raise last_error
+
+    async def _hedged(self, send, endpoints, method=None, priority=None, cost=1):
+        tasks = [asyncio.ensure_future(self._post_to(endpoint, send, method, priority, cost))
+                 for endpoint in endpoints]
+        last_error = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except Exception as e:
+                    last_error = e
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self):
+        """Get per-endpoint statistics"""
+        return [endpoint.to_dict() for endpoint in self.endpoints]
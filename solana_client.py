@@ -1,12 +1,116 @@
 import logging
 import json
-import requests
+import asyncio
+import threading
 import base64
+import time
+import httpx
+import websockets
 from typing import Optional, List, Dict, Any, Union
 from wallet import PublicKey
+from rpc_pool import RpcPool
+from rate_limiter import RateLimited, CRITICAL, method_priority, parse_retry_after
+from json_codec import get_codec, ResultArrayParser
+from blockhash_cache import BlockhashProvider
+from account_cache import AccountCache
+from confirmation import ConfirmationTracker
+from metrics import RPC_LATENCY, RPC_ERRORS
 
 logger = logging.getLogger(__name__)
 
+# Default per-call timeout for RPC requests (seconds)
+DEFAULT_TIMEOUT = 10.0
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# getMultipleAccounts accepts at most this many accounts per call
+MAX_ACCOUNTS_PER_CALL = 100
+
+# Latency-critical methods that are hedged across several RPC nodes
+HEDGED_METHODS = {"sendTransaction", "getSignatureStatuses"}
+
+def _ws_url(rpc_url):
+    """Derive the PubSub WebSocket URL from an HTTP RPC URL"""
+    url = _split_urls(rpc_url)[0]
+    if url.startswith('https://'):
+        return 'wss://' + url[len('https://'):]
+    if url.startswith('http://'):
+        return 'ws://' + url[len('http://'):]
+    return url
+
+def _split_urls(rpc_url):
+    """Normalize a URL, comma-separated URL string or list of URLs into a list"""
+    if isinstance(rpc_url, (list, tuple)):
+        return [url.strip() for url in rpc_url if url and url.strip()]
+    return [url.strip() for url in rpc_url.split(',') if url.strip()]
+
+class _EventLoopThread:
+    """Background thread running the shared asyncio event loop"""
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="solana-rpc-loop")
+        self.thread.daemon = True
+        self.thread.start()
+
+    @classmethod
+    def get(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+def get_event_loop():
+    """Get the shared event loop used for all asynchronous RPC traffic"""
+    return _EventLoopThread.get().loop
+
+def submit(coro):
+    """
+    Schedule a coroutine on the shared event loop
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        concurrent.futures.Future: Future for the coroutine result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+def run_sync(coro, timeout=None):
+    """
+    Run a coroutine on the shared event loop and block until it finishes
+
+    Args:
+        coro: Coroutine to run
+        timeout (float): Maximum time to wait in seconds
+
+    Returns:
+        object: Coroutine result
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _EventLoopThread.get().thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the RPC event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+async def _next_page(stream, size):
+    """Collect up to `size` items from an async iterator"""
+    page = []
+    try:
+        while len(page) < size:
+            page.append(await stream.__anext__())
+    except StopAsyncIteration:
+        pass
+    return page
+
+class RpcError(Exception):
+    """The node answered a request with a JSON-RPC error, or cut the response short"""
+    def __init__(self, error):
+        super().__init__(error.get("message", str(error)) if isinstance(error, dict) else str(error))
+        self.error = error
+
 class TokenAccount:
     """Simple implementation of token account"""
     def __init__(self, account_data):
@@ -24,121 +128,688 @@ class ParsedData:
 
 class ClientResponse:
     """Simple implementation of Solana client response"""
-    def __init__(self, value):
+    def __init__(self, value, error=None):
         self.value = value
+        self.error = error  # RPC or transport error, if the call failed
         
     def __getitem__(self, index):
         if isinstance(index, (int, slice)):
             return self.value[index]
         return self.value  # Allow .value access for compatibility
 
-class Client:
-    """Simple implementation of Solana RPC client"""
-    def __init__(self, rpc_url):
+def _unwrap_value(response, default):
+    """Wrap the `result.value` of an RPC response, falling back to default"""
+    if "result" in response and isinstance(response["result"], dict) and "value" in response["result"]:
+        return ClientResponse(response["result"]["value"])
+    return ClientResponse(default, error=response.get("error"))
+
+def _unwrap_accounts(response):
+    """
+    Wrap a getProgramAccounts result
+
+    The node returns a plain list of accounts, or {"context", "value"} when
+    withContext is set.
+    """
+    result = response.get("result")
+    if isinstance(result, list):
+        return ClientResponse(result)
+    return _unwrap_value(response, [])
+
+def _account_config(encoding, commitment=None):
+    """Build the config object for account reads"""
+    config = {"encoding": encoding}
+    if commitment:
+        config["commitment"] = commitment
+    return config
+
+class BatchResult:
+    """Placeholder for the response of one call in an RpcBatch"""
+    __slots__ = ('method', 'params', 'transform', '_response', '_done')
+
+    def __init__(self, method, params, transform):
+        self.method = method
+        self.params = params
+        self.transform = transform
+        self._response = None
+        self._done = False
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        """Get the response, converted like the equivalent single call"""
+        if not self._done:
+            raise RuntimeError("Batch has not been executed yet")
+        return self._response
+
+    def _set(self, response):
+        self._response = self.transform(response)
+        self._done = True
+
+class RpcBatch:
+    """Collects several RPC calls to be sent as one JSON-RPC batch"""
+    def __init__(self, executor):
+        self._executor = executor
+        self._results = []
+
+    def __len__(self):
+        return len(self._results)
+
+    def add(self, method, params=None, transform=None):
+        """
+        Add a raw call to the batch
+
+        Args:
+            method (str): RPC method name
+            params (list): RPC params
+            transform (callable): Converts the raw response dict (optional)
+
+        Returns:
+            BatchResult: Result placeholder filled in by execute()
+        """
+        result = BatchResult(method, params, transform or (lambda response: response))
+        self._results.append(result)
+        return result
+
+    def get_balance(self, public_key):
+        if hasattr(public_key, 'value'):
+            public_key = public_key.value
+        return self.add("getBalance", [public_key], lambda r: _unwrap_value(r, 0))
+
+    def get_account_info(self, public_key, encoding="base64", commitment=None):
+        if hasattr(public_key, 'value'):
+            public_key = public_key.value
+        return self.add(
+            "getAccountInfo",
+            [public_key, _account_config(encoding, commitment)],
+            lambda r: _unwrap_value(r, None)
+        )
+
+    def get_multiple_accounts(self, public_keys, encoding="base64", commitment=None):
+        public_keys = [public_key.value if hasattr(public_key, 'value') else public_key for public_key in public_keys]
+        return self.add(
+            "getMultipleAccounts",
+            [public_keys, _account_config(encoding, commitment)],
+            lambda r: _unwrap_value(r, [None] * len(public_keys))
+        )
+
+    def get_recent_blockhash(self):
+        return self.add("getRecentBlockhash")
+
+    def get_latest_blockhash(self, commitment="confirmed"):
+        return self.add("getLatestBlockhash", [{"commitment": commitment}])
+
+    def get_signature_statuses(self, signatures, search_transaction_history=False):
+        return self.add(
+            "getSignatureStatuses",
+            [signatures, {"searchTransactionHistory": search_transaction_history}],
+            lambda r: _unwrap_value(r, [])
+        )
+
+    def get_token_accounts_by_owner(self, owner, filters=None, encoding="jsonParsed"):
+        if hasattr(owner, 'value'):
+            owner = owner.value
+        return self.add(
+            "getTokenAccountsByOwner",
+            [owner, filters, {"encoding": encoding}],
+            lambda r: _unwrap_value(r, [])
+        )
+
+    def calls(self):
+        return [(result.method, result.params) for result in self._results]
+
+    def resolve(self, responses):
+        for result, response in zip(self._results, responses):
+            result._set(response)
+
+    def execute(self, timeout=None):
+        """Send the batch (returns a coroutine for AsyncClient batches)"""
+        return self._executor(self, timeout=timeout)
+
+class AsyncClient:
+    """Asyncio implementation of Solana RPC client"""
+    def __init__(self, rpc_url, timeout=DEFAULT_TIMEOUT, max_connections=100, max_keepalive_connections=20,
+                 batch_window=None, hedge=1, rate_limit=50.0, max_retries=2, codec=None):
         self.rpc_url = rpc_url
-        self.session = requests.Session()
+        self.timeout = timeout
+        self.codec = codec or get_codec()
+        # rpc_url may be a list or comma-separated string of endpoints
+        self.pool = RpcPool(_split_urls(rpc_url), hedge=hedge, rate_limit=rate_limit)
+        # Retries after a 429; the limiter holds them until Retry-After passes
+        self.max_retries = max_retries
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=30.0
+        )
+        self.session = None
         self.request_id = 0
-        
-    def _make_request(self, method, params=None):
-        """Make a JSON-RPC request to the Solana node"""
+        # Auto-coalescing: requests made within batch_window seconds share one POST
+        self.batch_window = batch_window
+        self._pending = []
+        self._flush_handle = None
+
+    def _get_session(self):
+        """Get the pooled HTTP session, creating it on first use"""
+        if self.session is None or self.session.is_closed:
+            self.session = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self.session
+
+    def _build_payload(self, method, params=None):
+        """Build a JSON-RPC request payload with a fresh id"""
         self.request_id += 1
         payload = {
             "jsonrpc": "2.0",
             "id": self.request_id,
             "method": method
         }
-        
+
         if params:
             payload["params"] = params
-            
-        try:
-            response = self.session.post(self.rpc_url, json=payload)
+        return payload
+
+    async def _post(self, payload, timeout=None, hedge=False, priority=None):
+        """POST a JSON-RPC payload (single request or batch array) through the endpoint pool"""
+        session = self._get_session()
+        timeout = timeout if timeout is not None else self.timeout
+
+        body = self.codec.dumps(payload)
+
+        async def send(url):
+            response = await session.post(url, content=body, headers=JSON_HEADERS, timeout=timeout)
+            if response.status_code == 429:
+                raise RateLimited(parse_retry_after(response.headers.get("Retry-After")))
             response.raise_for_status()
-            return response.json()
+            return self.codec.loads(response.content)
+
+        if isinstance(payload, list):
+            # Providers count every call in a batch against the quota
+            method = payload[0]["method"]
+            if priority is None:
+                priority = min(method_priority(item["method"]) for item in payload)
+            cost = len(payload)
+        else:
+            method = payload["method"]
+            cost = 1
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.pool.request(send, hedge=hedge, method=method, priority=priority, cost=cost)
+            except RateLimited:
+                if attempt == self.max_retries:
+                    raise
+
+    async def _make_request(self, method, params=None, timeout=None, priority=None):
+        """Make a JSON-RPC request to the Solana node"""
+        started = time.perf_counter()
+        response = await self._request(method, params, timeout, priority)
+        RPC_LATENCY.observe(time.perf_counter() - started, method)
+        if not isinstance(response, dict) or "error" in response:
+            RPC_ERRORS.inc(method)
+        return response
+
+    async def _request(self, method, params=None, timeout=None, priority=None):
+        payload = self._build_payload(method, params)
+
+        # Only reads are coalesced; sends and confirmation checks go out at
+        # once, hedged, rather than waiting out the batch window
+        hedge = method in HEDGED_METHODS
+        critical = (priority if priority is not None else method_priority(method)) == CRITICAL
+        if self.batch_window and not hedge and not critical:
+            return await self._enqueue(payload, timeout)
+
+        try:
+            return await self._post(payload, timeout, hedge=hedge, priority=priority)
+        except RateLimited as e:
+            logger.warning(f"RPC rate limited: {method}")
+            return {"error": {"code": 429, "message": str(e)}}
         except Exception as e:
-            logger.error(f"RPC request error: {str(e)}")
-            return {"error": str(e)}
-    
-    def get_balance(self, public_key):
+            logger.error(f"RPC request error: {str(e) or type(e).__name__}")
+            return {"error": str(e) or type(e).__name__}
+
+    async def _make_batch_request(self, calls, timeout=None):
+        """
+        Send several JSON-RPC calls in a single POST
+
+        Args:
+            calls (list): (method, params) tuples
+            timeout (float): Per-call timeout in seconds (optional)
+
+        Returns:
+            list: Response dicts in the same order as calls
+        """
+        payloads = [self._build_payload(method, params) for method, params in calls]
+        started = time.perf_counter()
+        responses = await self._send_batch(payloads, timeout)
+        RPC_LATENCY.observe(time.perf_counter() - started, "batch")
+        for (method, _), response in zip(calls, responses):
+            if not isinstance(response, dict) or "error" in response:
+                RPC_ERRORS.inc(method)
+        return responses
+
+    async def _send_batch(self, payloads, timeout=None):
+        """POST a batch and route the responses back by id"""
+        if not payloads:
+            return []
+
+        try:
+            responses = await self._post(payloads, timeout)
+        except RateLimited as e:
+            logger.warning("RPC batch rate limited")
+            error = {"error": {"code": 429, "message": str(e)}}
+            return [error for _ in payloads]
+        except Exception as e:
+            logger.error(f"RPC batch request error: {str(e) or type(e).__name__}")
+            error = {"error": str(e) or type(e).__name__}
+            return [error for _ in payloads]
+
+        # A node may reject the whole batch with a single error object
+        if not isinstance(responses, list):
+            return [responses for _ in payloads]
+
+        by_id = {item.get("id"): item for item in responses if isinstance(item, dict)}
+        missing = {"error": "Missing response in batch"}
+        return [by_id.get(payload["id"], missing) for payload in payloads]
+
+    async def _enqueue(self, payload, timeout=None):
+        """Queue a request for the next coalesced batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future))
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"RPC request error: timeout waiting for {payload['method']}")
+            return {"error": "Timeout"}
+
+    def _flush(self):
+        """Send every queued request as one batch"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            asyncio.ensure_future(self._flush_batch(pending))
+
+    async def _flush_batch(self, pending):
+        responses = await self._send_batch([payload for payload, _ in pending])
+        for (_, future), response in zip(pending, responses):
+            if not future.done():
+                future.set_result(response)
+
+    def batch(self):
+        """Start an explicit batch; `await batch.execute()` sends it in one POST"""
+        return RpcBatch(self._execute_batch)
+
+    async def _execute_batch(self, batch, timeout=None):
+        responses = await self._make_batch_request(batch.calls(), timeout=timeout)
+        batch.resolve(responses)
+        return batch
+
+    async def close(self):
+        """Close pooled connections"""
+        if self.session is not None:
+            await self.session.aclose()
+            self.session = None
+
+    async def get_balance(self, public_key, timeout=None):
         """Get balance of an account"""
         if hasattr(public_key, 'value'):
             public_key = public_key.value
-            
-        response = self._make_request("getBalance", [public_key])
-        if "result" in response and "value" in response["result"]:
-            return ClientResponse(response["result"]["value"])
-        return ClientResponse(0)
-    
-    def get_account_info(self, public_key, encoding="base64"):
+
+        response = await self._make_request("getBalance", [public_key], timeout=timeout)
+        return _unwrap_value(response, 0)
+
+    async def get_account_info(self, public_key, encoding="base64", commitment=None, timeout=None):
         """Get account info"""
         if hasattr(public_key, 'value'):
             public_key = public_key.value
-            
-        response = self._make_request("getAccountInfo", [public_key, {"encoding": encoding}])
-        if "result" in response and "value" in response["result"]:
-            return ClientResponse(response["result"]["value"])
-        return ClientResponse(None)
-    
-    def get_recent_blockhash(self):
+
+        response = await self._make_request(
+            "getAccountInfo",
+            [public_key, _account_config(encoding, commitment)],
+            timeout=timeout
+        )
+        return _unwrap_value(response, None)
+
+    async def get_multiple_accounts(self, public_keys, encoding="base64", commitment=None, timeout=None):
+        """Get account info for up to 100 accounts"""
+        public_keys = [public_key.value if hasattr(public_key, 'value') else public_key for public_key in public_keys]
+
+        response = await self._make_request(
+            "getMultipleAccounts",
+            [public_keys, _account_config(encoding, commitment)],
+            timeout=timeout
+        )
+        return _unwrap_value(response, [None] * len(public_keys))
+
+    async def get_recent_blockhash(self, timeout=None):
         """Get recent blockhash"""
-        response = self._make_request("getRecentBlockhash")
+        response = await self._make_request("getRecentBlockhash", timeout=timeout)
         return response
-    
-    def get_signature_statuses(self, signatures, search_transaction_history=False):
+
+    async def get_latest_blockhash(self, commitment="confirmed", timeout=None):
+        """Get latest blockhash and its last valid block height"""
+        response = await self._make_request("getLatestBlockhash", [{"commitment": commitment}], timeout=timeout)
+        return response
+
+    async def get_signature_statuses(self, signatures, search_transaction_history=False, timeout=None):
         """Get signature statuses"""
-        response = self._make_request("getSignatureStatuses", [signatures, {"searchTransactionHistory": search_transaction_history}])
-        if "result" in response and "value" in response["result"]:
-            return ClientResponse(response["result"]["value"])
-        return ClientResponse([])
-    
-    def get_token_accounts_by_owner(self, owner, filters=None, encoding="jsonParsed"):
+        response = await self._make_request(
+            "getSignatureStatuses",
+            [signatures, {"searchTransactionHistory": search_transaction_history}],
+            timeout=timeout
+        )
+        return _unwrap_value(response, [])
+
+    async def get_token_accounts_by_owner(self, owner, filters=None, encoding="jsonParsed", timeout=None):
         """Get token accounts by owner"""
         if hasattr(owner, 'value'):
             owner = owner.value
-            
+
         params = [owner, filters, {"encoding": encoding}]
-        response = self._make_request("getTokenAccountsByOwner", params)
-        if "result" in response and "value" in response["result"]:
-            return ClientResponse(response["result"]["value"])
-        return ClientResponse([])
-    
-    def get_program_accounts(self, program_id, encoding="base64", filters=None):
+        response = await self._make_request("getTokenAccountsByOwner", params, timeout=timeout)
+        return _unwrap_value(response, [])
+
+    async def get_program_accounts(self, program_id, encoding="base64", filters=None, timeout=None):
         """Get program accounts"""
         if hasattr(program_id, 'value'):
             program_id = program_id.value
-            
+
         params = [program_id, {"encoding": encoding}]
         if filters:
             params[1]["filters"] = filters
-            
-        response = self._make_request("getProgramAccounts", params)
-        if "result" in response and "value" in response["result"]:
-            return ClientResponse(response["result"]["value"])
-        return ClientResponse([])
-    
-    def send_transaction(self, transaction, *signers, opts=None):
+
+        response = await self._make_request("getProgramAccounts", params, timeout=timeout)
+        return _unwrap_accounts(response)
+
+    async def iter_program_accounts(self, program_id, encoding="base64", filters=None, timeout=None):
+        """
+        Stream the accounts owned by a program
+
+        Accounts are decoded and yielded one at a time as the response body
+        arrives, so a program-wide scan runs in roughly constant memory.
+
+        Raises:
+            RateLimited: If the node answered 429
+            RpcError: If the node answered with an error or the response was cut short
+            httpx.HTTPError: On transport errors
+        """
+        if hasattr(program_id, 'value'):
+            program_id = program_id.value
+
+        params = [program_id, {"encoding": encoding}]
+        if filters:
+            params[1]["filters"] = filters
+        body = self.codec.dumps(self._build_payload("getProgramAccounts", params))
+
+        endpoint = self.pool.select(1)[0]
+        await endpoint.limiter.acquire("getProgramAccounts")
+        parser = ResultArrayParser(self.codec)
+        start = time.perf_counter()
+        try:
+            async with self._get_session().stream(
+                "POST", endpoint.url, content=body, headers=JSON_HEADERS,
+                timeout=timeout if timeout is not None else self.timeout
+            ) as response:
+                if response.status_code == 429:
+                    raise RateLimited(parse_retry_after(response.headers.get("Retry-After")))
+                response.raise_for_status()
+                # Time to the response headers; the body of a full scan takes
+                # far longer and says nothing about the node's latency
+                latency = time.perf_counter() - start
+                async for chunk in response.aiter_bytes():
+                    for account in parser.feed(chunk):
+                        yield account
+            error = parser.close()
+            if parser.stack:
+                raise RpcError("Truncated getProgramAccounts response")
+        except RateLimited as e:
+            endpoint.limiter.on_throttled("getProgramAccounts", e.retry_after)
+            logger.warning("RPC rate limited: getProgramAccounts")
+            raise
+        except Exception as e:
+            # A transport error or malformed body counts against the node
+            self.pool.record_failure(endpoint)
+            logger.error(f"RPC stream error: {str(e) or type(e).__name__}")
+            raise
+        endpoint.limiter.on_success("getProgramAccounts")
+        endpoint.record_success(latency)
+
+        # The node is healthy; the request itself was refused
+        if error is not None:
+            logger.error(f"RPC request error: {error.get('error', error)}")
+            raise RpcError(error.get("error", error))
+
+    async def send_transaction(self, transaction, *signers, opts=None, timeout=None):
         """Send transaction"""
         # Simulate sending transaction
         logger.info("Simulating transaction send")
         return ClientResponse("tx-signature-" + str(self.request_id))
 
+    async def send_raw_transaction(self, payload, opts=None, timeout=None):
+        """Send an already signed and serialized transaction"""
+        # Simulate sending transaction; a live node takes
+        # sendTransaction [base64(payload), {"encoding": "base64"}]
+        logger.info("Simulating raw transaction send")
+        return ClientResponse("tx-signature-" + str(self.request_id))
+
+class Client:
+    """Blocking Solana RPC client backed by AsyncClient on the shared event loop"""
+    def __init__(self, rpc_url, timeout=DEFAULT_TIMEOUT, batch_window=None, hedge=1, rate_limit=50.0):
+        self.rpc_url = rpc_url
+        self.async_client = AsyncClient(
+            rpc_url, timeout=timeout, batch_window=batch_window, hedge=hedge, rate_limit=rate_limit
+        )
+
+    @property
+    def request_id(self):
+        return self.async_client.request_id
+
+    def _make_request(self, method, params=None, timeout=None):
+        """Make a JSON-RPC request to the Solana node"""
+        return run_sync(self.async_client._make_request(method, params, timeout=timeout))
+
+    def close(self):
+        """Close pooled connections"""
+        run_sync(self.async_client.close())
+
+    def batch(self):
+        """Start an explicit batch; `batch.execute()` sends it in one POST"""
+        return RpcBatch(self._execute_batch)
+
+    def _execute_batch(self, batch, timeout=None):
+        return run_sync(self.async_client._execute_batch(batch, timeout=timeout))
+
+    def get_balance(self, public_key, timeout=None):
+        """Get balance of an account"""
+        return run_sync(self.async_client.get_balance(public_key, timeout=timeout))
+
+    def get_account_info(self, public_key, encoding="base64", commitment=None, timeout=None):
+        """Get account info"""
+        return run_sync(self.async_client.get_account_info(
+            public_key, encoding=encoding, commitment=commitment, timeout=timeout
+        ))
+
+    def get_multiple_accounts(self, public_keys, encoding="base64", commitment=None, timeout=None):
+        """Get account info for up to 100 accounts"""
+        return run_sync(self.async_client.get_multiple_accounts(
+            public_keys, encoding=encoding, commitment=commitment, timeout=timeout
+        ))
+
+    def get_recent_blockhash(self, timeout=None):
+        """Get recent blockhash"""
+        return run_sync(self.async_client.get_recent_blockhash(timeout=timeout))
+
+    def get_latest_blockhash(self, commitment="confirmed", timeout=None):
+        """Get latest blockhash and its last valid block height"""
+        return run_sync(self.async_client.get_latest_blockhash(commitment=commitment, timeout=timeout))
+
+    def get_signature_statuses(self, signatures, search_transaction_history=False, timeout=None):
+        """Get signature statuses"""
+        return run_sync(self.async_client.get_signature_statuses(
+            signatures,
+            search_transaction_history=search_transaction_history,
+            timeout=timeout
+        ))
+
+    def get_token_accounts_by_owner(self, owner, filters=None, encoding="jsonParsed", timeout=None):
+        """Get token accounts by owner"""
+        return run_sync(self.async_client.get_token_accounts_by_owner(
+            owner, filters, encoding=encoding, timeout=timeout
+        ))
+
+    def get_program_accounts(self, program_id, encoding="base64", filters=None, timeout=None):
+        """Get program accounts"""
+        return run_sync(self.async_client.get_program_accounts(
+            program_id, encoding=encoding, filters=filters, timeout=timeout
+        ))
+
+    def send_transaction(self, transaction, *signers, opts=None, timeout=None):
+        """Send transaction"""
+        return run_sync(self.async_client.send_transaction(transaction, *signers, opts=opts, timeout=timeout))
+
+    def send_raw_transaction(self, payload, opts=None, timeout=None):
+        """Send an already signed and serialized transaction"""
+        return run_sync(self.async_client.send_raw_transaction(payload, opts=opts, timeout=timeout))
+
 class SolanaClient:
     """Wrapper for Solana RPC client"""
     
-    def __init__(self, rpc_url=None):
+    def __init__(self, rpc_url=None, hedge=1, ws_url=None, rate_limit=50.0):
         """
         Initialize Solana client
         
         Args:
-            rpc_url (str): Solana RPC URL
+            rpc_url (str): Solana RPC URL, or several comma-separated URLs
+            hedge (int): Number of RPC nodes latency-critical calls are raced across
+            ws_url (str): PubSub WebSocket URL (derived from rpc_url if omitted)
+            rate_limit (float): Initial requests/second per node and method class;
+                                adapts to the node's 429 responses
         """
         if not rpc_url:
             rpc_url = "https://api.mainnet-beta.solana.com"
             
-        self.client = Client(rpc_url)
+        self.client = Client(rpc_url, hedge=hedge, rate_limit=rate_limit)
         self.rpc_url = rpc_url
+        self.ws_url = ws_url or _ws_url(rpc_url)
+        self.subscriptions = None  # SubscriptionClient, created on first use
+        # Shared by every wallet using this client
+        self.blockhash_provider = BlockhashProvider(self.client.async_client)
+        self.account_cache = AccountCache(self.client.async_client)
+        self.confirmation_tracker = ConfirmationTracker(
+            self.client.async_client,
+            get_subscriptions=self.get_subscription_client
+        )
+        # Async view sharing the same connection pool
+        self.async_client = AsyncSolanaClient(rpc_url, client=self.client.async_client)
         logger.info(f"Initialized Solana client with RPC URL: {rpc_url}")
         
+    def close(self):
+        """Close pooled RPC connections and the PubSub socket"""
+        try:
+            get_event_loop().call_soon_threadsafe(self.blockhash_provider.stop)
+            if self.subscriptions is not None:
+                run_sync(self.subscriptions.stop())
+            self.client.close()
+        except Exception as e:
+            logger.error(f"Error closing Solana client: {str(e)}")
+            
+    def start_blockhash_refresh(self):
+        """Start refreshing the shared blockhash in the background"""
+        get_event_loop().call_soon_threadsafe(self.blockhash_provider.start)
+        
+    def get_blockhash(self):
+        """
+        Get a recent blockhash from the shared background cache
+        
+        Returns:
+            str: Blockhash, or None if none could be fetched
+        """
+        try:
+            if self.blockhash_provider.is_fresh():
+                return self.blockhash_provider.blockhash
+            return run_sync(self.blockhash_provider.get_blockhash())
+        except Exception as e:
+            logger.error(f"Error getting blockhash: {str(e)}")
+            return None
+            
+    def get_subscription_client(self):
+        """Get the shared PubSub client, creating it on first use"""
+        if self.subscriptions is None:
+            self.subscriptions = SubscriptionClient(self.ws_url)
+        return self.subscriptions
+        
+    def subscribe_signature(self, signature, callback, commitment="confirmed"):
+        """
+        Subscribe to a transaction signature's confirmation
+        
+        Args:
+            signature (str): Transaction signature
+            callback (callable): Called on the RPC event loop with the notification result
+            commitment (str): Commitment level
+            
+        Returns:
+            Subscription: Handle for unsubscribe(), or None on error
+        """
+        try:
+            return run_sync(self.get_subscription_client().signature_subscribe(signature, callback, commitment))
+        except Exception as e:
+            logger.error(f"Error subscribing to signature: {str(e)}")
+            return None
+            
+    def subscribe_account(self, public_key, callback, encoding="base64", commitment="confirmed"):
+        """
+        Subscribe to changes of an account
+        
+        Args:
+            public_key: Account public key
+            callback (callable): Called on the RPC event loop with the notification result
+            encoding (str): Account data encoding
+            commitment (str): Commitment level
+            
+        Returns:
+            Subscription: Handle for unsubscribe(), or None on error
+        """
+        try:
+            return run_sync(self.get_subscription_client().account_subscribe(public_key, callback, encoding, commitment))
+        except Exception as e:
+            logger.error(f"Error subscribing to account: {str(e)}")
+            return None
+            
+    def subscribe_logs(self, mentions, callback, commitment="confirmed"):
+        """
+        Subscribe to transaction logs mentioning an address
+        
+        Args:
+            mentions: Address (e.g. program id) the logs must mention
+            callback (callable): Called on the RPC event loop with the notification result
+            commitment (str): Commitment level
+            
+        Returns:
+            Subscription: Handle for unsubscribe(), or None on error
+        """
+        try:
+            return run_sync(self.get_subscription_client().logs_subscribe(mentions, callback, commitment))
+        except Exception as e:
+            logger.error(f"Error subscribing to logs: {str(e)}")
+            return None
+            
+    def unsubscribe(self, subscription):
+        """Cancel a subscription returned by one of the subscribe_* methods"""
+        if subscription is None or self.subscriptions is None:
+            return
+        try:
+            run_sync(self.subscriptions.unsubscribe(subscription))
+        except Exception as e:
+            logger.error(f"Error unsubscribing: {str(e)}")
+            
+    def get_endpoint_stats(self):
+        """Get latency and health statistics for each RPC endpoint"""
+        return self.client.async_client.pool.stats()
+        
     def get_balance(self, public_key):
         """
         Get SOL balance for an account
@@ -158,6 +829,25 @@ class SolanaClient:
             logger.error(f"Error getting balance: {str(e)}")
             return 0
             
+    def get_balances(self, public_keys):
+        """
+        Get SOL balances for several accounts in one batched request
+        
+        Args:
+            public_keys (list): Account public keys
+            
+        Returns:
+            list: SOL balances in the same order
+        """
+        try:
+            batch = self.client.batch()
+            results = [batch.get_balance(public_key) for public_key in public_keys]
+            batch.execute()
+            return [result.result().value / 1e9 for result in results]
+        except Exception as e:
+            logger.error(f"Error getting balances: {str(e)}")
+            return [0 for _ in public_keys]
+            
     def get_account_info(self, public_key, encoding="base64"):
         """
         Get account info
@@ -175,6 +865,65 @@ class SolanaClient:
             logger.error(f"Error getting account info: {str(e)}")
             return None
             
+    def get_multiple_accounts(self, public_keys, encoding="base64", commitment="confirmed"):
+        """
+        Get account info for any number of accounts
+        
+        Accounts are split into chunks of 100 (the getMultipleAccounts
+        limit) and all chunks are sent as one batched request.
+        
+        Args:
+            public_keys (list): Account public keys
+            encoding (str): Response encoding
+            commitment (str): Commitment level
+            
+        Returns:
+            list: Account info values (None for missing accounts), in the same order
+        """
+        try:
+            public_keys = list(public_keys)
+            batch = self.client.batch()
+            results = [
+                batch.get_multiple_accounts(public_keys[i:i + MAX_ACCOUNTS_PER_CALL], encoding, commitment)
+                for i in range(0, len(public_keys), MAX_ACCOUNTS_PER_CALL)
+            ]
+            batch.execute()
+            accounts = []
+            for result in results:
+                accounts.extend(result.result().value)
+            return accounts
+        except Exception as e:
+            logger.error(f"Error getting multiple accounts: {str(e)}")
+            return [None for _ in public_keys]
+            
+    def get_cached_account_info(self, public_key, commitment="confirmed"):
+        """
+        Get account info through the short-TTL account cache
+        
+        Concurrent callers asking for the same account share one request.
+        
+        Args:
+            public_key: Account public key
+            commitment (str): Commitment level
+            
+        Returns:
+            object: Account info response
+        """
+        try:
+            return run_sync(self.account_cache.get(public_key, commitment=commitment))
+        except Exception as e:
+            logger.error(f"Error getting account info: {str(e)}")
+            return None
+            
+    def invalidate_account(self, public_key=None):
+        """
+        Drop an account (or every account) from the account cache
+        
+        Args:
+            public_key: Account public key (optional)
+        """
+        get_event_loop().call_soon_threadsafe(self.account_cache.invalidate, public_key)
+        
     def get_signature_statuses(self, signatures, search_transaction_history=False):
         """
         Get transaction signature statuses
@@ -195,6 +944,20 @@ class SolanaClient:
             logger.error(f"Error getting signature statuses: {str(e)}")
             return None
             
+    def track_signature(self, signature, max_wait=30, on_seen=None):
+        """
+        Register a transaction with the shared confirmation tracker
+        
+        Args:
+            signature (str): Transaction signature
+            max_wait (float): Maximum wait time in seconds
+            on_seen (callable): Called (on the event loop) once the node first reports the transaction (optional)
+            
+        Returns:
+            concurrent.futures.Future: Resolves to (confirmed, error message)
+        """
+        return submit(self.confirmation_tracker.wait(signature, max_wait, on_seen))
+        
     def get_token_accounts_by_owner(self, owner, mint=None, program_id=None):
         """
         Get token accounts by owner
@@ -255,6 +1018,32 @@ class SolanaClient:
             logger.error(f"Error getting program accounts: {str(e)}")
             return []
             
+    def iter_program_accounts(self, program_id, filters=None, encoding="base64", page_size=256):
+        """
+        Stream all accounts owned by a program in roughly constant memory
+        
+        Args:
+            program_id: Program ID
+            filters (list): Filters to apply
+            encoding (str): Response encoding
+            page_size (int): Accounts handed over from the event loop at a time
+            
+        Yields:
+            dict: Program account ({'pubkey': ..., 'account': ...})
+            
+        Raises:
+            RateLimited, RpcError, httpx.HTTPError: If the scan did not run to the end
+        """
+        stream = self.client.async_client.iter_program_accounts(program_id, encoding=encoding, filters=filters)
+        try:
+            while True:
+                page = run_sync(_next_page(stream, page_size))
+                yield from page
+                if len(page) < page_size:
+                    break
+        finally:
+            run_sync(stream.aclose())
+            
     def send_transaction(self, transaction, signers, opts=None):
         """
         Send transaction
@@ -276,3 +1065,486 @@ class SolanaClient:
         except Exception as e:
             logger.error(f"Error sending transaction: {str(e)}")
             return None
+            
+    def send_raw_transaction(self, payload, opts=None):
+        """
+        Send an already signed and serialized transaction
+        
+        Args:
+            payload (bytes): Serialized signed transaction
+            opts: Transaction options
+            
+        Returns:
+            ClientResponse: Transaction signature
+        """
+        try:
+            return self.client.send_raw_transaction(payload, opts=opts)
+        except Exception as e:
+            logger.error(f"Error sending transaction: {str(e)}")
+            return None
+
+class AsyncSolanaClient:
+    """Asyncio wrapper for Solana RPC client"""
+    
+    def __init__(self, rpc_url=None, client=None):
+        """
+        Initialize async Solana client
+        
+        Args:
+            rpc_url (str): Solana RPC URL
+            client (AsyncClient): Existing client to share connections with (optional)
+        """
+        if not rpc_url:
+            rpc_url = "https://api.mainnet-beta.solana.com"
+            
+        self.client = client or AsyncClient(rpc_url)
+        self.rpc_url = rpc_url
+        
+    async def close(self):
+        """Close pooled RPC connections"""
+        await self.client.close()
+        
+    async def get_balance(self, public_key, timeout=None):
+        """
+        Get SOL balance for an account
+        
+        Args:
+            public_key: Account public key
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            float: SOL balance
+        """
+        try:
+            response = await self.client.get_balance(public_key, timeout=timeout)
+            if response and hasattr(response, 'value'):
+                return response.value / 1e9  # Convert lamports to SOL
+            return 0
+        except Exception as e:
+            logger.error(f"Error getting balance: {str(e)}")
+            return 0
+            
+    async def get_balances(self, public_keys, timeout=None):
+        """
+        Get SOL balances for several accounts in one batched request
+        
+        Args:
+            public_keys (list): Account public keys
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            list: SOL balances in the same order
+        """
+        try:
+            batch = self.client.batch()
+            results = [batch.get_balance(public_key) for public_key in public_keys]
+            await batch.execute(timeout=timeout)
+            return [result.result().value / 1e9 for result in results]
+        except Exception as e:
+            logger.error(f"Error getting balances: {str(e)}")
+            return [0 for _ in public_keys]
+            
+    async def get_account_info(self, public_key, encoding="base64", timeout=None):
+        """
+        Get account info
+        
+        Args:
+            public_key: Account public key
+            encoding (str): Response encoding
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            object: Account info response
+        """
+        try:
+            return await self.client.get_account_info(public_key, encoding=encoding, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error getting account info: {str(e)}")
+            return None
+            
+    async def get_multiple_accounts(self, public_keys, encoding="base64", commitment="confirmed", timeout=None):
+        """
+        Get account info for any number of accounts
+        
+        Accounts are split into chunks of 100 (the getMultipleAccounts
+        limit) and all chunks are sent as one batched request.
+        
+        Args:
+            public_keys (list): Account public keys
+            encoding (str): Response encoding
+            commitment (str): Commitment level
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            list: Account info values (None for missing accounts), in the same order
+        """
+        try:
+            public_keys = list(public_keys)
+            batch = self.client.batch()
+            results = [
+                batch.get_multiple_accounts(public_keys[i:i + MAX_ACCOUNTS_PER_CALL], encoding, commitment)
+                for i in range(0, len(public_keys), MAX_ACCOUNTS_PER_CALL)
+            ]
+            await batch.execute(timeout=timeout)
+            accounts = []
+            for result in results:
+                accounts.extend(result.result().value)
+            return accounts
+        except Exception as e:
+            logger.error(f"Error getting multiple accounts: {str(e)}")
+            return [None for _ in public_keys]
+            
+    async def get_signature_statuses(self, signatures, search_transaction_history=False, timeout=None):
+        """
+        Get transaction signature statuses
+        
+        Args:
+            signatures (list): List of transaction signatures
+            search_transaction_history (bool): Whether to search transaction history
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            object: Signature statuses response
+        """
+        try:
+            return await self.client.get_signature_statuses(
+                signatures,
+                search_transaction_history=search_transaction_history,
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.error(f"Error getting signature statuses: {str(e)}")
+            return None
+            
+    async def get_token_accounts_by_owner(self, owner, mint=None, program_id=None, timeout=None):
+        """
+        Get token accounts by owner
+        
+        Args:
+            owner: Owner public key
+            mint: Token mint (optional)
+            program_id: Token program ID (optional)
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            list: Token accounts
+        """
+        try:
+            filters = {}
+            
+            if mint:
+                filters['mint'] = mint
+                
+            if program_id:
+                filters['programId'] = program_id
+                
+            response = await self.client.get_token_accounts_by_owner(
+                owner,
+                filters,
+                encoding="jsonParsed",
+                timeout=timeout
+            )
+            
+            if response and hasattr(response, 'value'):
+                return response.value
+            return []
+        except Exception as e:
+            logger.error(f"Error getting token accounts: {str(e)}")
+            return []
+            
+    async def get_program_accounts(self, program_id, filters=None, encoding="base64", timeout=None):
+        """
+        Get all accounts owned by a program
+        
+        Args:
+            program_id: Program ID
+            filters (list): Filters to apply
+            encoding (str): Response encoding
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            list: Program accounts
+        """
+        try:
+            response = await self.client.get_program_accounts(
+                program_id,
+                encoding=encoding,
+                filters=filters,
+                timeout=timeout
+            )
+            
+            if response and hasattr(response, 'value'):
+                return response.value
+            return []
+        except Exception as e:
+            logger.error(f"Error getting program accounts: {str(e)}")
+            return []
+            
+    async def iter_program_accounts(self, program_id, filters=None, encoding="base64", timeout=None):
+        """
+        Stream all accounts owned by a program in roughly constant memory
+        
+        Args:
+            program_id: Program ID
+            filters (list): Filters to apply
+            encoding (str): Response encoding
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Yields:
+            dict: Program account ({'pubkey': ..., 'account': ...})
+            
+        Raises:
+            RateLimited, RpcError, httpx.HTTPError: If the scan did not run to the end
+        """
+        async for account in self.client.iter_program_accounts(
+            program_id, encoding=encoding, filters=filters, timeout=timeout
+        ):
+            yield account
+            
+    async def send_transaction(self, transaction, signers, opts=None, timeout=None):
+        """
+        Send transaction
+        
+        Args:
+            transaction: Transaction to send
+            signers: Transaction signers
+            opts: Transaction options
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            str: Transaction signature
+        """
+        try:
+            return await self.client.send_transaction(
+                transaction,
+                *signers,
+                opts=opts,
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.error(f"Error sending transaction: {str(e)}")
+            return None
+            
+    async def send_raw_transaction(self, payload, opts=None, timeout=None):
+        """
+        Send an already signed and serialized transaction
+        
+        Args:
+            payload (bytes): Serialized signed transaction
+            opts: Transaction options
+            timeout (float): Per-call timeout in seconds (optional)
+            
+        Returns:
+            ClientResponse: Transaction signature
+        """
+        try:
+            return await self.client.send_raw_transaction(payload, opts=opts, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error sending transaction: {str(e)}")
+            return None
+
+class Subscription:
+    """A PubSub subscription registered with a SubscriptionClient"""
+    def __init__(self, method, params, notification, callback, one_shot=False):
+        self.method = method
+        self.params = params
+        self.notification = notification
+        self.callback = callback
+        self.one_shot = one_shot
+        self.server_id = None
+        self.active = True
+
+    @property
+    def unsubscribe_method(self):
+        return self.method.replace("Subscribe", "Unsubscribe")
+
+class SubscriptionClient:
+    """Multiplexes Solana PubSub subscriptions over one auto-reconnecting WebSocket"""
+    def __init__(self, ws_url, reconnect_delay=0.5, max_reconnect_delay=30.0, codec=None):
+        """
+        Initialize subscription client
+        
+        Args:
+            ws_url (str): Solana PubSub WebSocket URL
+            reconnect_delay (float): Initial delay before reconnecting
+            max_reconnect_delay (float): Maximum reconnect backoff
+            codec (JsonCodec): JSON codec (defaults to json_codec.get_codec())
+        """
+        self.ws_url = ws_url
+        self.codec = codec or get_codec()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.request_id = 0
+        self.subscriptions = set()
+        self.connected = None  # asyncio.Event, created on the loop
+        self._ws = None
+        self._task = None
+        self._by_server_id = {}
+        self._pending = {}  # request id -> subscription awaiting its server id
+        
+    def start(self):
+        """Start the connection task (must be called on the event loop)"""
+        if self._task is None or self._task.done():
+            self.connected = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+            
+    async def stop(self):
+        """Close the socket and drop all subscriptions"""
+        self.subscriptions.clear()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+            
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, max_size=None, ping_interval=20) as ws:
+                    self._ws = ws
+                    delay = self.reconnect_delay
+                    logger.info(f"PubSub connected: {self.ws_url}")
+                    # Subscriptions made from here on are sent directly;
+                    # re-establish every earlier one on the new socket
+                    restore = list(self.subscriptions)
+                    self.connected.set()
+                    for subscription in restore:
+                        await self._send_subscribe(subscription)
+                    async for message in ws:
+                        self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"PubSub connection error: {str(e) or type(e).__name__}")
+            finally:
+                self._ws = None
+                self._by_server_id.clear()
+                self._pending.clear()
+                if self.connected is not None:
+                    self.connected.clear()
+                    
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+            
+    async def _send(self, method, params):
+        self.request_id += 1
+        await self._ws.send(self.codec.dumps_text({
+            "jsonrpc": "2.0",
+            "id": self.request_id,
+            "method": method,
+            "params": params
+        }))
+        return self.request_id
+        
+    async def _send_subscribe(self, subscription):
+        request_id = await self._send(subscription.method, subscription.params)
+        self._pending[request_id] = subscription
+        
+    def _handle_message(self, message):
+        try:
+            data = self.codec.loads(message)
+        except ValueError:
+            logger.error("PubSub: invalid JSON message")
+            return
+            
+        # Subscription acknowledgement carrying the server-side id
+        if "id" in data:
+            subscription = self._pending.pop(data["id"], None)
+            if subscription is None:
+                return
+            if "error" in data:
+                logger.error(f"PubSub {subscription.method} failed: {data['error']}")
+            elif subscription.active:
+                subscription.server_id = data.get("result")
+                self._by_server_id[subscription.server_id] = subscription
+            elif data.get("result") is not None:
+                # Cancelled before the node acknowledged it; the node still
+                # holds it, so cancel it there too
+                asyncio.ensure_future(self._send_unsubscribe(subscription.unsubscribe_method, data["result"]))
+            return
+            
+        params = data.get("params") or {}
+        subscription = self._by_server_id.get(params.get("subscription"))
+        if subscription is None or not subscription.active:
+            return
+            
+        if subscription.one_shot:
+            # The node drops one-shot subscriptions after the first notification
+            self._forget(subscription)
+            
+        try:
+            result = subscription.callback(params.get("result"))
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            logger.error(f"PubSub callback error: {str(e)}")
+            
+    def _forget(self, subscription):
+        subscription.active = False
+        self.subscriptions.discard(subscription)
+        self._by_server_id.pop(subscription.server_id, None)
+        
+    async def subscribe(self, method, params, notification, callback, one_shot=False):
+        """
+        Register a subscription; it is (re)sent whenever the socket connects
+        
+        Returns:
+            Subscription: Handle for unsubscribe()
+        """
+        self.start()
+        subscription = Subscription(method, params, notification, callback, one_shot=one_shot)
+        self.subscriptions.add(subscription)
+        if self._ws is not None and self.connected.is_set():
+            await self._send_subscribe(subscription)
+        return subscription
+        
+    async def unsubscribe(self, subscription):
+        """Cancel a subscription"""
+        server_id = subscription.server_id
+        was_active = subscription.active
+        self._forget(subscription)
+        if was_active and server_id is not None:
+            await self._send_unsubscribe(subscription.unsubscribe_method, server_id)
+            
+    async def _send_unsubscribe(self, method, server_id):
+        if self._ws is None:
+            # The subscription died with the old socket
+            return
+        try:
+            await self._send(method, [server_id])
+        except Exception as e:
+            logger.debug(f"PubSub unsubscribe error: {str(e)}")
+                
+    async def signature_subscribe(self, signature, callback, commitment="confirmed"):
+        """Notify once when a transaction signature reaches the commitment level"""
+        return await self.subscribe(
+            "signatureSubscribe",
+            [signature, {"commitment": commitment}],
+            "signatureNotification",
+            callback,
+            one_shot=True
+        )
+        
+    async def account_subscribe(self, public_key, callback, encoding="base64", commitment="confirmed"):
+        """Notify on every change to an account's data or lamports"""
+        if hasattr(public_key, 'value'):
+            public_key = public_key.value
+        return await self.subscribe(
+            "accountSubscribe",
+            [public_key, {"encoding": encoding, "commitment": commitment}],
+            "accountNotification",
+            callback
+        )
+        
+    async def logs_subscribe(self, mentions, callback, commitment="confirmed"):
+        """Notify on transaction logs that mention an address (e.g. a program id)"""
+        if hasattr(mentions, 'value'):
+            mentions = mentions.value
+        return await self.subscribe(
+            "logsSubscribe",
+            [{"mentions": [mentions]}, {"commitment": commitment}],
+            "logsNotification",
+            callback
+        )
@@ -46,84 +46,198 @@ function isValidSolanaAddress(address) {
     return /^[1-9A-HJ-NP-Za-km-z]{32,44}$/.test(address);
 }
 
-// Update bot status UI
+// Latest transactions shown in the history table (oldest first)
+const MAX_TRANSACTIONS = 100;
+let transactions = [];
+
+// Update status indicators from a bot status or summary
+function renderBotStatus(data) {
+    const statusElement = document.getElementById('statusValue');
+    if (data.running) {
+        statusElement.textContent = 'Running';
+        statusElement.className = 'badge bg-success';
+        
+        // Start stays enabled: more tokens can be sniped alongside the running ones
+        document.getElementById('stopBtn').disabled = false;
+    } else {
+        statusElement.textContent = 'Stopped';
+        statusElement.className = 'badge bg-secondary';
+        
+        document.getElementById('stopBtn').disabled = true;
+    }
+    
+    // Update token info
+    const tokenElement = document.getElementById('tokenValue');
+    if (data.token) {
+        tokenElement.textContent = shortenAddress(data.token);
+        tokenElement.setAttribute('title', data.token);
+        tokenElement.classList.add('text-truncate');
+    } else {
+        tokenElement.textContent = 'N/A';
+        tokenElement.removeAttribute('title');
+    }
+    
+    // Update wallet count
+    document.getElementById('walletsValue').textContent = data.wallets || 0;
+}
+
+// Redraw the transaction count and history table
+function renderTransactions() {
+    document.getElementById('transactionsValue').textContent = transactions.length;
+    
+    const txListElement = document.getElementById('transactionsList');
+    if (transactions.length === 0) {
+        txListElement.innerHTML = '<tr><td colspan="6" class="text-center">No transactions yet</td></tr>';
+        return;
+    }
+    
+    // Newest first
+    let txHtml = '';
+    transactions.slice().reverse().forEach(tx => {
+        let txClass = '';
+        if (tx.type.includes('ERROR') || tx.type.includes('FAILED')) {
+            txClass = 'text-danger';
+        } else if (tx.type.includes('BUY')) {
+            txClass = 'text-info';
+        } else if (tx.type.includes('SELL')) {
+            txClass = 'text-success';
+        }
+        
+        txHtml += `<tr class="${txClass}">
+            <td>${tx.timestamp}</td>
+            <td>${tx.wallet}</td>
+            <td>${tx.type}</td>
+            <td>${typeof tx.amount === 'number' ? tx.amount.toFixed(4) : tx.amount} SOL</td>
+            <td>${tx.token_amount !== null && tx.token_amount !== undefined ? tx.token_amount : 'N/A'}</td>
+            <td>${tx.tx_hash ?
+                `<a href="https://solscan.io/tx/${tx.tx_hash}" target="_blank" class="text-truncate d-inline-block" style="max-width: 100px;">${tx.tx_hash}</a>` :
+                'N/A'}</td>
+        </tr>`;
+    });
+    txListElement.innerHTML = txHtml;
+}
+
+// Campaigns shown in the status card, by token
+let campaigns = new Map();
+
+// Redraw the campaign list with a stop button for each running campaign
+function renderCampaigns() {
+    const listElement = document.getElementById('campaignsList');
+    if (campaigns.size === 0) {
+        listElement.innerHTML = '<li>None</li>';
+        return;
+    }
+    
+    let html = '';
+    campaigns.forEach(campaign => {
+        html += `<li class="d-flex align-items-center gap-2 mb-1">
+            <span class="text-truncate" title="${campaign.token}">${shortenAddress(campaign.token)}</span>
+            <span class="badge ${campaign.running ? 'bg-success' : 'bg-secondary'}">${campaign.state}</span>
+            ${campaign.running ?
+                `<button type="button" class="btn btn-sm btn-outline-danger stop-campaign" data-token="${campaign.token}">Stop</button>` :
+                ''}
+        </li>`;
+    });
+    listElement.innerHTML = html;
+}
+
+// Stop a single campaign; the others and the launch detector keep running
+function stopCampaign(tokenAddress) {
+    const body = new FormData();
+    body.append('token_address', tokenAddress);
+    fetch('/stop_bot', { method: 'POST', body: body })
+        .then(response => {
+            if (response.redirected) {
+                window.location.href = response.url;
+            }
+        })
+        .catch(error => console.error('Error stopping campaign:', error));
+}
+
+// Replace everything shown with a full bot status
+function renderFullStatus(data) {
+    renderBotStatus(data);
+    transactions = data.transactions || [];
+    renderTransactions();
+    campaigns = new Map((data.campaigns || []).map(campaign => [campaign.token, campaign]));
+    renderCampaigns();
+}
+
+// Fetch the full bot status once
 function updateBotStatus() {
     fetch('/bot_status')
         .then(response => response.json())
-        .then(data => {
-            // Update status indicators
-            const statusElement = document.getElementById('statusValue');
-            if (data.running) {
-                statusElement.textContent = 'Running';
-                statusElement.className = 'badge bg-success';
-                
-                // Enable stop button, disable start button
-                document.getElementById('stopBtn').disabled = false;
-                document.getElementById('startBtn').disabled = true;
-            } else {
-                statusElement.textContent = 'Stopped';
-                statusElement.className = 'badge bg-secondary';
-                
-                // Enable start button, disable stop button
-                document.getElementById('stopBtn').disabled = true;
-                document.getElementById('startBtn').disabled = false;
-            }
-            
-            // Update token info
-            const tokenElement = document.getElementById('tokenValue');
-            if (data.token) {
-                tokenElement.textContent = shortenAddress(data.token);
-                tokenElement.setAttribute('title', data.token);
-                tokenElement.classList.add('text-truncate');
-            } else {
-                tokenElement.textContent = 'N/A';
-                tokenElement.removeAttribute('title');
-            }
-            
-            // Update wallet count
-            document.getElementById('walletsValue').textContent = data.wallets;
-            
-            // Update transaction count and list
-            const txCount = data.transactions ? data.transactions.length : 0;
-            document.getElementById('transactionsValue').textContent = txCount;
-            
-            // Update transaction list if there are transactions
-            const txListElement = document.getElementById('transactionsList');
-            if (txCount > 0) {
-                let txHtml = '';
-                
-                // Sort transactions by timestamp (newest first)
-                const sortedTx = [...data.transactions].reverse();
-                
-                sortedTx.forEach(tx => {
-                    let txClass = '';
-                    if (tx.type.includes('BUY')) {
-                        txClass = tx.type.includes('FAILED') ? 'table-danger' : 'table-info';
-                    } else if (tx.type.includes('SELL')) {
-                        txClass = tx.type.includes('FAILED') ? 'table-danger' : 'table-success';
-                    } else if (tx.type.includes('ERROR')) {
-                        txClass = 'table-warning';
-                    }
-                    
-                    txHtml += `<tr class="${txClass}">
-                        <td>${tx.timestamp}</td>
-                        <td>${tx.wallet}</td>
-                        <td>${tx.type}</td>
-                        <td>${tx.amount} SOL</td>
-                        <td>${tx.token_amount || 'N/A'}</td>
-                        <td>${tx.tx_hash ? `<a href="#" onclick="copyToClipboard('${tx.tx_hash}'); return false;" title="Copy TX hash">
-                            ${shortenAddress(tx.tx_hash, 4)}</a>` : 'N/A'}</td>
-                    </tr>`;
-                });
-                
-                txListElement.innerHTML = txHtml;
-            } else {
-                txListElement.innerHTML = '<tr><td colspan="6" class="text-center">No transactions yet</td></tr>';
-            }
-        })
+        .then(renderFullStatus)
         .catch(error => console.error('Error fetching bot status:', error));
 }
 
+// Poll /bot_status while the status stream is unavailable
+let pollTimer = null;
+
+function startPolling() {
+    if (pollTimer === null) {
+        updateBotStatus();
+        pollTimer = setInterval(updateBotStatus, 5000);
+    }
+}
+
+function stopPolling() {
+    if (pollTimer !== null) {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+}
+
+// Follow status changes as the server pushes them
+function connectStatusStream() {
+    if (!window.EventSource) {
+        // No server-sent events; fall back to polling
+        startPolling();
+        return;
+    }
+    
+    // The server ends each stream after a few minutes and the browser
+    // reconnects on its own; each connection opens with a snapshot
+    const stream = new EventSource('/status_stream');
+    stream.addEventListener('snapshot', event => {
+        stopPolling();
+        renderFullStatus(JSON.parse(event.data));
+    });
+    stream.addEventListener('status', event => renderBotStatus(JSON.parse(event.data)));
+    stream.addEventListener('campaign', event => {
+        const campaign = JSON.parse(event.data);
+        campaigns.set(campaign.token, campaign);
+        renderCampaigns();
+    });
+    stream.addEventListener('campaign_removed', event => {
+        campaigns.delete(JSON.parse(event.data).token);
+        renderCampaigns();
+    });
+    stream.addEventListener('transaction', event => {
+        const tx = JSON.parse(event.data);
+        if (transactions.some(known => known.seq === tx.seq)) {
+            // Already in the snapshot
+            return;
+        }
+        // Insert by seq, in case events ever arrive out of order
+        let index = transactions.length;
+        while (index > 0 && transactions[index - 1].seq > tx.seq) {
+            index--;
+        }
+        transactions.splice(index, 0, tx);
+        if (transactions.length > MAX_TRANSACTIONS) {
+            transactions.shift();
+        }
+        renderTransactions();
+    });
+    stream.onerror = () => {
+        // Keep the page current until the stream is back (or for good, if the
+        // browser gave up reconnecting)
+        console.warn('Status stream interrupted, polling until it reconnects...');
+        startPolling();
+    };
+}
+
 // Handle form validation
 document.addEventListener('DOMContentLoaded', function() {
     // Validate token address on bot start form
@@ -157,6 +271,18 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Setup per-campaign stop buttons (the list is redrawn, so delegate)
+    const campaignsList = document.getElementById('campaignsList');
+    if (campaignsList) {
+        campaignsList.addEventListener('click', function(e) {
+            const button = e.target.closest('.stop-campaign');
+            if (button) {
+                button.disabled = true;
+                stopCampaign(button.getAttribute('data-token'));
+            }
+        });
+    }
+    
     // Validate test token address (if provided)
     const testBotForm = document.getElementById('testBotForm');
     if (testBotForm) {
@@ -232,7 +358,6 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
-    // Poll for bot status updates
-    updateBotStatus();
-    setInterval(updateBotStatus, 5000); // Update every 5 seconds
+    // Live bot status updates
+    connectStatusStream();
 });
@@ -0,0 +1,152 @@
+import json
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class StatusSubscription:
+    """One connected viewer's queue of pending server-sent events"""
+    def __init__(self, max_pending):
+        self.queue = queue.Queue(max_pending)
+        self.overflowed = False
+
+    def get(self, timeout=None):
+        """
+        Wait for the next event
+
+        Returns:
+            str: Encoded event, or None if nothing arrived in time
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+def encode_event(event, data, event_id=None):
+    """Encode one server-sent event"""
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+class StatusPublisher:
+    """
+    Fans bot events out to every connected status stream
+
+    Each event is encoded once and the same string is queued to every
+    subscriber. With nobody connected, publish() returns before building
+    anything, so idle dashboards cost the trading threads nothing. A viewer
+    that falls too far behind is dropped; its browser reconnects and starts
+    over from a fresh snapshot.
+
+    Every publish (and touch) also bumps the status version, which polling
+    clients use as an ETag and which keys the cached /bot_status body.
+    """
+    def __init__(self, max_pending=1000):
+        """
+        Initialize status publisher
+
+        Args:
+            max_pending (int): Events queued per subscriber before it is dropped
+        """
+        self.max_pending = max_pending
+        self._subscribers = ()  # replaced, never mutated, so publish() needs no lock
+        self._lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self.version = 0
+        self.published = 0
+
+    @property
+    def active(self):
+        return bool(self._subscribers)
+
+    def subscribe(self):
+        subscription = StatusSubscription(self.max_pending)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    def touch(self):
+        """Note a status change that has no event of its own"""
+        with self._version_lock:
+            self.version += 1
+
+    def publish(self, event, data, event_id=None):
+        """
+        Send an event to every subscriber
+
+        Args:
+            event (str): Event name
+            data: JSON-serializable payload, or a callable producing it (only
+                  called when someone is listening)
+            event_id: SSE event id (optional)
+        """
+        self.touch()
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        try:
+            message = encode_event(event, data() if callable(data) else data, event_id)
+        except Exception as e:
+            logger.error(f"Error encoding {event} event: {str(e)}")
+            return
+        self.published += 1
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+                logger.warning("Dropped a status stream that fell behind")
+
+    def stats(self):
+        return {'subscribers': len(self._subscribers), 'published': self.published, 'version': self.version}
+
+class StatusCache:
+    """
+    Bot status built once per status version
+
+    Polls that arrive while nothing has changed get the same status dict and
+    the same serialized body; only the first poll after a change rebuilds.
+    """
+    def __init__(self, build, serialize):
+        """
+        Initialize status cache
+
+        Args:
+            build (callable): Returns the current status dict
+            serialize (callable): Turns a status dict into a response body
+        """
+        self.build = build
+        self.serialize = serialize
+        self._lock = threading.Lock()
+        self._entry = (None, None, None)  # (version, status, body)
+        self.builds = 0
+
+    def get(self, version):
+        """
+        Get the status and its serialized body for a version
+
+        Returns:
+            tuple: (status dict, body)
+        """
+        cached_version, status, body = self._entry
+        if cached_version == version:
+            return status, body
+        with self._lock:
+            # Another poll may have rebuilt it while this one waited
+            cached_version, status, body = self._entry
+            if cached_version != version:
+                status = self.build()
+                body = self.serialize(status)
+                self._entry = (version, status, body)
+                self.builds += 1
+            return status, body
+
+# Shared by the bot, its campaigns and the web server
+publisher = StatusPublisher()
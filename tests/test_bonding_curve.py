@@ -0,0 +1,116 @@
+import base64
+import pytest
+import addresses
+from account_layouts import BONDING_CURVE_LAYOUT
+from bonding_curve import BondingCurve, LAMPORTS_PER_SOL, slippage_basis_points
+from pump_api import PumpFunAPI
+from solana_client import ClientResponse
+
+MINT = "4vJ9JU1bJJE96FWSJKvHsmmFADCg4gpZQff4P3bkLKi"
+
+def curve_account(virtual_token, virtual_sol, real_token, real_sol, supply, complete=False):
+    """Bonding curve account value as getAccountInfo returns it"""
+    data = BONDING_CURVE_LAYOUT.discriminator + BONDING_CURVE_LAYOUT.struct.pack(
+        virtual_token, virtual_sol, real_token, real_sol, supply, complete)
+    return {'data': [base64.b64encode(data).decode('ascii'), 'base64'], 'owner': PumpFunAPI.PROGRAM_ID}
+
+class StubSolanaClient:
+    """Serves fixed account values from the account cache lookup"""
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.requested = []
+
+    def get_cached_account_info(self, public_key, commitment="confirmed"):
+        self.requested.append(str(public_key))
+        account = self.accounts.get(str(public_key))
+        if isinstance(account, ClientResponse):
+            return account
+        return ClientResponse(account)
+
+def test_buy_quote_matches_integer_math():
+    quote = BondingCurve.initial().quote_buy(LAMPORTS_PER_SOL, slippage_bps=1000)
+
+    # The 1% fee comes off the top: sol_in = 1e9 * 10000 // 10100
+    assert quote['curve_amount'] == 990_099_009
+    assert quote['fee'] == 9_900_990
+    assert quote['amount_out'] == 34_281_150_129_545
+    assert quote['max_sol_cost'] == 1_100_000_000
+    assert quote['min_amount_out'] == 30_853_035_116_590
+
+def test_sell_quote_matches_integer_math():
+    curve = BondingCurve.initial()
+    quote = curve.quote_sell(34_281_150_129_545, slippage_bps=1000)
+
+    assert quote['curve_amount'] == 30_000_000_000 * 34_281_150_129_545 // (1_073_000_000_000_000 + 34_281_150_129_545)
+    assert quote['fee'] == quote['curve_amount'] * 100 // 10000
+    assert quote['amount_out'] == quote['curve_amount'] - quote['fee']
+    assert quote['min_sol_output'] == quote['amount_out'] * 9000 // 10000
+
+def test_buy_then_sell_round_trip_loses_only_fees_and_rounding():
+    curve = BondingCurve.initial()
+    buy = curve.quote_buy(LAMPORTS_PER_SOL)
+    after_buy = curve.after_buy(buy)
+    sell = after_buy.quote_sell(buy['amount_out'])
+    after_sell = after_buy.after_sell(sell)
+
+    assert sell['amount_out'] == 980_198_018
+    # Rounding always favours the curve, never the trader
+    assert sell['curve_amount'] <= buy['curve_amount']
+    assert after_sell.virtual_token_reserves == curve.virtual_token_reserves
+    assert after_sell.virtual_sol_reserves >= curve.virtual_sol_reserves
+
+def test_slippage_boundaries():
+    curve = BondingCurve.initial()
+    assert slippage_basis_points(10.0) == 1000
+    assert slippage_basis_points(-5) == 0
+
+    exact = curve.quote_buy(LAMPORTS_PER_SOL, slippage_bps=0)
+    assert exact['max_sol_cost'] == LAMPORTS_PER_SOL
+    assert exact['min_amount_out'] == exact['amount_out']
+
+    # Beyond 100% the minimum output bottoms out at zero instead of going negative
+    loose = curve.quote_buy(LAMPORTS_PER_SOL, slippage_bps=20000)
+    assert loose['max_sol_cost'] == 3 * LAMPORTS_PER_SOL
+    assert loose['min_amount_out'] == 0
+    assert curve.quote_sell(10 ** 12, slippage_bps=20000)['min_sol_output'] == 0
+
+def test_sequential_buys_see_earlier_buys():
+    first, second = BondingCurve.initial().quote_buys([LAMPORTS_PER_SOL] * 2, sequential=True)
+    assert second['amount_out'] < first['amount_out']
+    assert second['price'] > first['price']
+
+def test_buys_are_capped_by_curve_state():
+    curve = BondingCurve(1_073_000_000_000_000, 30_000_000_000, real_token_reserves=1_000)
+    assert curve.quote_buy(LAMPORTS_PER_SOL)['amount_out'] == 1_000
+
+    migrated = BondingCurve(1_073_000_000_000_000, 30_000_000_000, complete=True)
+    assert migrated.quote_buy(LAMPORTS_PER_SOL)['amount_out'] == 0
+
+def test_get_curve_reads_the_curve_pda():
+    curve_address = str(addresses.bonding_curve_address(MINT, PumpFunAPI.PROGRAM_ID))
+    client = StubSolanaClient({
+        # The mint holds nothing that decodes as a curve; reading it was the old bug
+        MINT: {'data': ["", 'base64']},
+        curve_address: curve_account(1_000_000_000_000_000, 40_000_000_000, 700_000_000_000_000,
+                                     10_000_000_000, 1_000_000_000_000_000),
+    })
+
+    curve = PumpFunAPI(client).get_curve(MINT)
+
+    assert client.requested == [curve_address]
+    assert curve.virtual_sol_reserves == 40_000_000_000
+    assert curve.real_token_reserves == 700_000_000_000_000
+
+@pytest.mark.parametrize('account', [
+    None,
+    {'data': [base64.b64encode(b'\0' * 64).decode('ascii'), 'base64']},
+    curve_account(0, 0, 0, 0, 0),
+    ClientResponse(None, error={'code': -32000, 'message': 'node unavailable'}),
+])
+def test_get_curve_returns_none_when_the_account_does_not_decode(account):
+    curve_address = str(addresses.bonding_curve_address(MINT, PumpFunAPI.PROGRAM_ID))
+    api = PumpFunAPI(StubSolanaClient({curve_address: account}))
+
+    assert api.get_curve(MINT) is None
+    # No curve means no quote, rather than a made-up initial price
+    assert api.quote_buys(MINT, [0.1]) is None
@@ -0,0 +1,68 @@
+import os
+import time
+from launch_detector import LaunchDetector, LaunchFilters
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'launches.jsonl')
+
+MOON_DOG = "4vJ9JU1bJJE96FWSJKvHsmmFADCg4gpZQff4P3bkLKi"
+RUG_COIN = "GgBaCs3NCBuZN12kCJgAW63ydqohFkHEdfdEXBPzLHq"
+CAT_WIF_HAT = "YMN9Qj5jPNp7j14VPcML1B6xGgcPWVZUGLFU3Mnyfaf"
+RUG_CREATOR = "cGfHiC6Kgg3FpFZvgwGcswsCRtp4aBP2fzuXRQPizuN"
+
+class StubSolanaClient:
+    """Stands in for the subscription side of SolanaClient; replay needs no RPC"""
+    def unsubscribe(self, subscription):
+        pass
+
+def make_detector(filters=None, record_path=None):
+    launches = []
+    detector = LaunchDetector(StubSolanaClient(), launches.append, filters=filters, record_path=record_path)
+    return detector, launches
+
+def test_replay_hands_off_each_new_launch():
+    detector, launches = make_detector()
+
+    assert detector.replay(FIXTURE, speed=0) == 6
+
+    assert [event.mint for event in launches] == [MOON_DOG, RUG_COIN, CAT_WIF_HAT]
+    first = launches[0]
+    assert (first.name, first.symbol, first.uri) == ("Moon Dog", "MDOG", "https://example.com/a.json")
+    assert first.signature == "sigA"
+    assert first.slot == 250000001
+    assert first.detected_at is not None
+
+    # The repeated mint and the failed transaction are not bought
+    stats = detector.stats()
+    assert stats['notifications'] == 6
+    assert stats['detected'] == 3
+    assert stats['launched'] == 3
+    assert stats['filtered'] == 0
+
+def test_replay_applies_filters():
+    filters = LaunchFilters(deny_creators=[RUG_CREATOR], require_uri=True)
+    detector, launches = make_detector(filters)
+
+    detector.replay(FIXTURE, speed=0)
+
+    assert [event.mint for event in launches] == [MOON_DOG]
+    assert detector.filtered == 2
+
+def test_replay_keeps_recorded_pacing():
+    detector, _ = make_detector()
+
+    started = time.monotonic()
+    detector.replay(FIXTURE, speed=10)
+
+    # The fixture spans 1.9 s of recorded time
+    assert time.monotonic() - started >= 0.15
+
+def test_recorded_notifications_replay_identically(tmp_path):
+    record_path = str(tmp_path / 'recorded.jsonl')
+    detector, launches = make_detector(record_path=record_path)
+    detector.replay(FIXTURE, speed=0)
+    detector.stop()
+
+    # Only notifications carrying a create event are recorded
+    replayer, replayed = make_detector()
+    assert replayer.replay(record_path, speed=0) == 4
+    assert [event.mint for event in replayed] == [event.mint for event in launches]
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+import rate_limiter
+from rate_limiter import TokenBucket, CRITICAL, NORMAL, BACKGROUND, parse_retry_after
+
+class FakeClock:
+    """Stands in for the time module inside rate_limiter; only moves when told to"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+def test_zero_rate_is_raised_to_min_rate(clock):
+    bucket = TokenBucket(rate=0, min_rate=2.0)
+    assert bucket.rate == 2.0
+    with pytest.raises(ValueError):
+        TokenBucket(rate=10, min_rate=0)
+
+def test_zero_rate_bucket_refills(clock):
+    # The drainer sleeps in real time for as long as the fake clock says a
+    # token takes, so keep that short
+    bucket = TokenBucket(rate=0, burst=1, min_rate=100.0)
+
+    async def run():
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        clock.advance(0.015)
+        await asyncio.wait_for(waiter, 1.0)
+
+    asyncio.run(run())
+
+def test_burst_is_spent_then_refilled(clock):
+    bucket = TokenBucket(rate=10.0)
+    for _ in range(10):
+        assert bucket._try_take(1, clock.now)
+    assert not bucket._try_take(1, clock.now)
+
+    clock.advance(0.1)
+    assert bucket._try_take(1, clock.now)
+    assert not bucket._try_take(1, clock.now)
+
+def test_successes_raise_rate_up_to_max(clock):
+    bucket = TokenBucket(rate=10.0, max_rate=10.25, increase=0.1)
+    bucket.on_success()
+    assert bucket.rate == pytest.approx(10.1)
+    for _ in range(5):
+        bucket.on_success()
+    assert bucket.rate == 10.25
+
+def test_throttling_halves_rate_once_per_second(clock):
+    bucket = TokenBucket(rate=40.0, min_rate=8.0)
+
+    bucket.on_throttled()
+    bucket.on_throttled()
+    assert bucket.rate == 20.0
+    assert bucket.throttled == 2
+
+    clock.advance(1.0)
+    bucket.on_throttled()
+    assert bucket.rate == 10.0
+
+    clock.advance(1.0)
+    bucket.on_throttled()
+    assert bucket.rate == 8.0
+
+def test_retry_after_blocks_until_it_passes(clock):
+    bucket = TokenBucket(rate=10.0)
+    bucket.on_throttled(retry_after=2.0)
+
+    clock.advance(1.9)
+    assert not bucket._try_take(1, clock.now)
+    clock.advance(0.2)
+    assert bucket._try_take(1, clock.now)
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+def test_waiters_are_served_by_priority(clock):
+    bucket = TokenBucket(rate=100.0, burst=1)
+    served = []
+
+    async def request(name, priority):
+        await bucket.acquire(priority)
+        served.append(name)
+
+    async def run():
+        await bucket.acquire()
+        tasks = [asyncio.ensure_future(request(name, priority)) for name, priority in
+                 (('background', BACKGROUND), ('normal', NORMAL), ('critical', CRITICAL))]
+        await asyncio.sleep(0.05)
+        assert served == []
+        for _ in tasks:
+            clock.advance(0.015)
+            await asyncio.sleep(0.05)
+        await asyncio.wait_for(asyncio.gather(*tasks), 1.0)
+
+    asyncio.run(run())
+    assert served == ['critical', 'normal', 'background']
+
+def test_failed_drain_fails_waiters(clock, monkeypatch):
+    bucket = TokenBucket(rate=1.0, burst=1)
+
+    async def broken():
+        raise ZeroDivisionError("float division by zero")
+
+    monkeypatch.setattr(bucket, '_serve_waiters', broken)
+
+    async def run():
+        await bucket.acquire()
+        # Fails instead of waiting forever on a drainer that died
+        with pytest.raises(ZeroDivisionError):
+            await asyncio.wait_for(bucket.acquire(), 1.0)
+
+    asyncio.run(run())
+    assert bucket._waiters == []
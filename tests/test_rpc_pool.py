@@ -0,0 +1,185 @@
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from solana_client import Client, SolanaClient, RpcError, run_sync
+from rate_limiter import RateLimited
+
+ACCOUNT = "11111111111111111111111111111111"
+
+class StubRpcServer:
+    """
+    Local JSON-RPC stand-in
+
+    Answers every request with getBalance's result shape, a given result or
+    raw body, or fails it with an HTTP status.
+    """
+    def __init__(self, balance=None, status=200, result=None, body=None, headers=None):
+        self.requests = 0
+        self.payloads = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stub.requests += 1
+                stub.payloads.append(payload)
+                if status != 200:
+                    self.send_response(status)
+                    for name, value in (headers or {}).items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                reply = body
+                if reply is None:
+                    value = result if result is not None else {'context': {'slot': 1}, 'value': balance}
+                    reply = json.dumps({'jsonrpc': '2.0', 'id': payload['id'], 'result': value}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def servers():
+    bad = StubRpcServer(status=500)
+    good = StubRpcServer(balance=42)
+    yield bad, good
+    bad.close()
+    good.close()
+
+@pytest.fixture
+def client(servers):
+    bad, good = servers
+    # The failing node comes first, so it is tried first while both are untried
+    client = Client(f"{bad.url},{good.url}")
+    yield client
+    client.close()
+
+def test_request_fails_over_to_next_endpoint(servers, client):
+    bad, good = servers
+
+    response = client.get_balance(ACCOUNT)
+
+    assert response.error is None
+    assert response.value == 42
+    assert bad.requests == 1
+    assert good.requests == 1
+
+def test_failing_endpoint_is_ejected(servers, client):
+    bad, good = servers
+    pool = client.async_client.pool
+
+    for _ in range(pool.eject_after):
+        assert client.get_balance(ACCOUNT).value == 42
+
+    bad_endpoint, good_endpoint = pool.endpoints
+    assert bad_endpoint.ejected_until > time.monotonic()
+    assert pool.select(2) == [good_endpoint]
+    assert [stats['healthy'] for stats in pool.stats()] == [False, True]
+
+    # Ejected nodes are left alone until their cooldown ends
+    requests = bad.requests
+    for _ in range(5):
+        assert client.get_balance(ACCOUNT).value == 42
+    assert bad.requests == requests
+
+def test_ejected_endpoint_returns_after_cooldown(servers, client):
+    pool = client.async_client.pool
+    pool.cooldown = 0.2
+
+    for _ in range(pool.eject_after):
+        client.get_balance(ACCOUNT)
+    bad_endpoint = pool.endpoints[0]
+    assert not bad_endpoint.is_healthy()
+
+    time.sleep(0.3)
+    assert bad_endpoint.is_healthy()
+    assert bad_endpoint in pool.select(2)
+
+def test_all_endpoints_failing_reports_error(servers):
+    bad, _ = servers
+    other = StubRpcServer(status=500)
+    client = Client([bad.url, other.url])
+    try:
+        response = client.get_balance(ACCOUNT)
+        assert response.value == 0
+        assert response.error is not None
+    finally:
+        client.close()
+        other.close()
+
+def test_critical_methods_skip_coalescing(servers):
+    _, good = servers
+    client = Client(good.url, batch_window=0.5)
+    try:
+        started = time.monotonic()
+        response = client._make_request("getSignatureStatuses", [["sig"]])
+        assert time.monotonic() - started < 0.4
+        assert response['result']['value'] == 42
+        # Sent on its own, not as part of a batch
+        assert isinstance(good.payloads[0], dict)
+    finally:
+        client.close()
+
+PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+
+def scan(server):
+    client = SolanaClient(server.url)
+    try:
+        return list(client.iter_program_accounts(PROGRAM, page_size=2))
+    finally:
+        client.close()
+
+def test_program_scan_streams_every_account():
+    accounts = [{'pubkey': f"account{i}", 'account': {'data': ["", "base64"]}} for i in range(5)]
+    server = StubRpcServer(result=accounts)
+    try:
+        assert scan(server) == accounts
+    finally:
+        server.close()
+
+def test_program_scan_raises_instead_of_ending_early():
+    failures = [
+        (StubRpcServer(status=429, headers={'Retry-After': '1'}), RateLimited),
+        (StubRpcServer(body=b'{"jsonrpc":"2.0","id":1,"error":{"code":-32010,"message":"excluded"}}'), RpcError),
+        (StubRpcServer(body=b'{"jsonrpc":"2.0","id":1,"result":[{"pubkey":"a"},'), RpcError),
+        (StubRpcServer(status=500), Exception),
+    ]
+    try:
+        for server, error in failures:
+            with pytest.raises(error):
+                scan(server)
+    finally:
+        for server, _ in failures:
+            server.close()
+
+def test_program_scan_failures_count_against_node():
+    bad = StubRpcServer(status=500)
+    client = Client(bad.url)
+    try:
+        async_client = client.async_client
+        for _ in range(async_client.pool.eject_after):
+            with pytest.raises(Exception):
+                run_sync(_drain(async_client.iter_program_accounts(PROGRAM)))
+        assert not async_client.pool.endpoints[0].is_healthy()
+    finally:
+        client.close()
+        bad.close()
+
+async def _drain(stream):
+    return [account async for account in stream]
@@ -0,0 +1,147 @@
+import json
+import time
+import queue
+import asyncio
+import threading
+import pytest
+import websockets
+from solana_client import SubscriptionClient, run_sync
+
+ACCOUNT = "11111111111111111111111111111111"
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for condition")
+        time.sleep(0.01)
+
+class StubPubSubServer:
+    """Local PubSub stand-in that acknowledges subscriptions and can drop connections"""
+    def __init__(self, ack=True):
+        self.ack = ack
+        self.messages = []  # (connection number, message) in arrival order
+        self.connections = []
+        self.next_server_id = 100
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = self.call(self._serve())
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def _serve(self):
+        return await websockets.serve(self._handle, '127.0.0.1', 0)
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout=5)
+
+    async def _handle(self, ws):
+        self.connections.append(ws)
+        number = len(self.connections)
+        async for message in ws:
+            data = json.loads(message)
+            self.messages.append((number, data))
+            if data['method'].endswith('Subscribe') and self.ack:
+                await self.acknowledge(ws, data['id'])
+
+    async def acknowledge(self, ws, request_id):
+        server_id = self.next_server_id
+        self.next_server_id += 1
+        await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': server_id}))
+        return server_id
+
+    def requests(self, method, connection=None):
+        return [data for number, data in self.messages
+                if data['method'] == method and connection in (None, number)]
+
+    def drop(self):
+        """Close the newest connection from the server side"""
+        self.call(self.connections[-1].close())
+
+    def notify(self, method, server_id, result):
+        message = json.dumps({'jsonrpc': '2.0', 'method': method,
+                              'params': {'subscription': server_id, 'result': result}})
+        self.call(self.connections[-1].send(message))
+
+    def close(self):
+        self.server.close()
+        self.call(self.server.wait_closed())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+@pytest.fixture
+def server():
+    server = StubPubSubServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(url):
+        client = SubscriptionClient(url, reconnect_delay=0.05)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        run_sync(client.stop())
+
+def test_resubscribes_after_reconnect(server, make_client):
+    client = make_client(server.url)
+    notifications = queue.Queue()
+    subscription = run_sync(client.account_subscribe(ACCOUNT, notifications.put))
+
+    wait_for(lambda: subscription.server_id is not None)
+    first_id = subscription.server_id
+    assert server.requests('accountSubscribe', connection=1)[0]['params'][0] == ACCOUNT
+
+    server.drop()
+
+    # The client reconnects and sends the subscription again on the new socket
+    wait_for(lambda: len(server.connections) == 2 and server.requests('accountSubscribe', connection=2))
+    wait_for(lambda: subscription.server_id not in (None, first_id))
+    assert server.requests('accountSubscribe', connection=2)[0]['params'][0] == ACCOUNT
+
+    server.notify('accountNotification', subscription.server_id, {'value': {'lamports': 7}})
+    assert notifications.get(timeout=5) == {'value': {'lamports': 7}}
+
+    # Notifications for the id from the dead socket are not routed
+    server.notify('accountNotification', first_id, {'value': {'lamports': 8}})
+    with pytest.raises(queue.Empty):
+        notifications.get(timeout=0.2)
+
+def test_one_shot_subscription_is_not_restored(server, make_client):
+    client = make_client(server.url)
+    notifications = queue.Queue()
+    subscription = run_sync(client.signature_subscribe("sig", notifications.put))
+
+    wait_for(lambda: subscription.server_id is not None)
+    server.notify('signatureNotification', subscription.server_id, {'value': {'err': None}})
+    assert notifications.get(timeout=5) == {'value': {'err': None}}
+    assert not subscription.active
+
+    server.drop()
+    wait_for(lambda: len(server.connections) == 2)
+    time.sleep(0.1)
+    assert server.requests('signatureSubscribe', connection=2) == []
+
+def test_late_ack_after_unsubscribe_cancels_on_node(make_client):
+    server = StubPubSubServer(ack=False)
+    try:
+        client = make_client(server.url)
+        subscription = run_sync(client.account_subscribe(ACCOUNT, lambda result: None))
+        wait_for(lambda: server.requests('accountSubscribe'))
+
+        # Cancelled while the subscribe is still unacknowledged
+        run_sync(client.unsubscribe(subscription))
+        assert server.requests('accountUnsubscribe') == []
+
+        request_id = server.requests('accountSubscribe')[0]['id']
+        server_id = server.call(server.acknowledge(server.connections[-1], request_id))
+
+        wait_for(lambda: server.requests('accountUnsubscribe'))
+        assert server.requests('accountUnsubscribe')[0]['params'] == [server_id]
+    finally:
+        server.close()
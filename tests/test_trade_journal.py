@@ -0,0 +1,44 @@
+import pytest
+from trade_journal import TradeJournal
+from tx_history import TransactionRecord
+
+# Times arrive slightly out of id order, with ties, as they do from racing campaign threads
+TIMES = [100.0, 101.0, 100.5, 102.0, 102.0, 103.0, 102.5, 104.0, 105.0, 105.0]
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / 'trades.db'))
+    for seq, t in enumerate(TIMES, 1):
+        journal.record(TransactionRecord(seq, t, 'mint', 0, 'BUY' if seq % 2 else 'SELL', 0.1))
+    assert journal.flush()
+    yield journal
+    journal.close()
+
+def pages(journal, **filters):
+    rows, cursor = journal.query(limit=3, **filters)
+    result = list(rows)
+    while cursor is not None:
+        rows, cursor = journal.query(limit=3, cursor=cursor, **filters)
+        result.extend(rows)
+    return result
+
+def test_pages_by_id_without_time_range(journal):
+    assert [row['id'] for row in pages(journal)] == list(range(10, 0, -1))
+    assert [row['id'] for row in pages(journal, tx_type='SELL')] == [10, 8, 6, 4, 2]
+
+def test_time_range_pages_by_time_then_id(journal):
+    rows = pages(journal, since=100.5, until=105.0)
+
+    expected = sorted(((t, i) for i, t in enumerate(TIMES, 1) if 100.5 <= t < 105.0), reverse=True)
+    assert [(row['time'], row['id']) for row in rows] == expected
+
+def test_time_range_walks_the_index_without_sorting(journal):
+    connection = journal._reader()
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM trades WHERE time >= ? AND time < ? "
+        "AND time <= ? AND (time, id) < (?, ?) ORDER BY time DESC, id DESC LIMIT 4",
+        (100.0, 105.0, 103.0, 103.0, 6)
+    ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "trades_time_id" in details
+    assert "TEMP B-TREE" not in details
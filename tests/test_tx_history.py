@@ -0,0 +1,33 @@
+import re
+import sys
+import threading
+from status_stream import publisher
+from tx_history import TransactionHistory
+
+def test_streamed_transactions_arrive_in_seq_order():
+    # Switch threads often so appends from different campaigns interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    subscription = publisher.subscribe()
+    try:
+        histories = [TransactionHistory(100, token=f"mint{i}") for i in range(8)]
+
+        def trade(history):
+            for _ in range(100):
+                history.append(0, 'BUY', 0.1)
+
+        threads = [threading.Thread(target=trade, args=(history,)) for history in histories]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+        publisher.unsubscribe(subscription)
+
+    seqs = []
+    while (message := subscription.get(timeout=0)) is not None:
+        seqs.append(int(re.search(r"^id: (\d+)$", message, re.MULTILINE).group(1)))
+    assert len(seqs) == 8 * 100
+    assert seqs == sorted(seqs)
+    assert len(set(seqs)) == len(seqs)
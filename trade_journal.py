@@ -0,0 +1,206 @@
+import queue
+import atexit
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    seq INTEGER,
+    time REAL NOT NULL,
+    token TEXT,
+    wallet TEXT,
+    type TEXT NOT NULL,
+    amount REAL,
+    token_amount TEXT,
+    tx_hash TEXT,
+    latency_ms REAL
+);
+CREATE INDEX IF NOT EXISTS trades_token ON trades (token, id);
+CREATE INDEX IF NOT EXISTS trades_wallet ON trades (wallet, id);
+CREATE INDEX IF NOT EXISTS trades_type ON trades (type, id);
+DROP INDEX IF EXISTS trades_time;
+CREATE INDEX IF NOT EXISTS trades_time_id ON trades (time, id);
+"""
+
+INSERT = ("INSERT INTO trades (seq, time, token, wallet, type, amount, token_amount, tx_hash, latency_ms) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+COLUMNS = ('id', 'seq', 'time', 'token', 'wallet', 'type', 'amount', 'token_amount', 'tx_hash', 'latency_ms')
+
+class TradeJournal:
+    """
+    Durable append-only log of every trade, backed by SQLite in WAL mode
+
+    record() only queues the row; a single writer thread drains the queue
+    and commits everything waiting in one transaction, so trading threads
+    never touch the disk and a burst of fills costs one fsync. Readers use
+    their own connections and, thanks to WAL, never wait for the writer.
+    """
+    def __init__(self, path, batch_size=500):
+        """
+        Initialize trade journal
+
+        Args:
+            path (str): SQLite database file
+            batch_size (int): Maximum rows committed per transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.commits = 0
+        self._queue = queue.SimpleQueue()
+        self._local = threading.local()
+        self._closed = False
+
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._writer = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread; commit what is still queued when the process exits
+        atexit.register(self.close)
+
+    def record(self, record, wallet=None):
+        """
+        Queue a transaction for the journal
+
+        Args:
+            record (TransactionRecord): Transaction to store
+            wallet (str): Wallet address (defaults to the wallet's label)
+        """
+        if self._closed:
+            return
+        token_amount, latency = record.token_amount, record.latency
+        self._queue.put((
+            record.seq, record.time, record.token, wallet or f"Wallet {record.wallet_idx+1}", record.type,
+            record.amount, str(token_amount) if token_amount is not None else None, record.tx_hash,
+            round(latency * 1000, 3) if latency is not None else None
+        ))
+
+    def _run(self):
+        connection = sqlite3.connect(self.path)
+        # WAL with synchronous=NORMAL syncs at checkpoints, not on every commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            rows = [self._queue.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = [row for row in rows if isinstance(row, threading.Event)]
+            rows = [row for row in rows if isinstance(row, tuple)]
+            if rows:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                    self.written += len(rows)
+                    self.commits += 1
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing {len(rows)} trade(s) to the journal: {str(e)}")
+            for waiter in waiters:
+                waiter.set()
+            if self._closed and self._queue.empty():
+                break
+        connection.close()
+
+    def flush(self, timeout=5.0):
+        """
+        Wait until everything queued so far is committed
+
+        Returns:
+            bool: True if the queue was flushed in time
+        """
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what is queued and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.flush()
+        self._writer.join(timeout=5.0)
+
+    def _reader(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            self._local.connection = connection
+        return connection
+
+    def query(self, token=None, wallet=None, tx_type=None, since=None, until=None, cursor=None, limit=100):
+        """
+        Read trades newest first, one page at a time
+
+        Pages are keyed on the row id (keyset pagination), so every page is an
+        index range scan no matter how deep into the journal it is. Pages
+        with a time range are keyed on (time, id) instead, which walks the
+        time index in order rather than sorting the whole range.
+
+        Args:
+            token (str): Only trades of this token (optional)
+            wallet (str): Only trades of this wallet (optional)
+            tx_type (str): Only trades of this type, e.g. "BUY" (optional)
+            since (float): Only trades at or after this Unix time (optional)
+            until (float): Only trades before this Unix time (optional)
+            cursor (int): next_cursor of the previous page (optional)
+            limit (int): Page size
+
+        Returns:
+            tuple: (list of trade dicts, next_cursor or None on the last page)
+        """
+        clauses = []
+        params = []
+        for column, value in (('token', token), ('wallet', wallet), ('type', tx_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("time < ?")
+            params.append(until)
+
+        by_time = since is not None or until is not None
+        if cursor is not None:
+            cursor_row = (self._reader().execute("SELECT time FROM trades WHERE id = ?", (cursor,)).fetchone()
+                          if by_time else None)
+            if cursor_row is not None:
+                # The plain bound narrows the index range; the row value breaks ties on id
+                clauses.append("time <= ? AND (time, id) < (?, ?)")
+                params.extend((cursor_row[0], cursor_row[0], cursor))
+            else:
+                clauses.append("id < ?")
+                params.append(cursor)
+
+        limit = max(1, min(int(limit), 1000))
+        sql = f"SELECT {', '.join(COLUMNS)} FROM trades"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY time DESC, id DESC LIMIT ?" if by_time else " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._reader().execute(sql, params).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [dict(zip(COLUMNS, row)) for row in rows[:limit]], next_cursor
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'written': self.written,
+            'commits': self.commits,
+            'queued': self._queue.qsize()
+        }
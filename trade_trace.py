@@ -0,0 +1,114 @@
+import json
+import time
+import threading
+from collections import deque
+
+# Stages a trade passes through, in the order they normally complete
+STAGES = ('trigger', 'pre-checks', 'blockhash', 'build', 'sign', 'send', 'first-seen', 'confirmed')
+
+class TradeTrace:
+    """
+    Timeline of one buy or sell
+
+    Each mark is the time.perf_counter_ns() at which a stage finished.
+    Stages done ahead of time (an armed buy is built and signed before its
+    trigger) simply have no mark.
+    """
+    __slots__ = ('token', 'wallet_idx', 'side', 'started_at', 'marks', 'outcome', 'signature', 'error')
+
+    def __init__(self, token, wallet_idx, side, trigger_ns=None):
+        self.token = token
+        self.wallet_idx = wallet_idx
+        self.side = side
+        self.started_at = time.time()
+        self.marks = [('trigger', trigger_ns if trigger_ns is not None else time.perf_counter_ns())]
+        self.outcome = None
+        self.signature = None
+        self.error = None
+
+    def mark(self, stage, ns=None):
+        """Record that a stage finished (now, or at a perf_counter_ns() taken earlier)"""
+        self.marks.append((stage, ns if ns is not None else time.perf_counter_ns()))
+
+    def to_dict(self):
+        marks = sorted(self.marks, key=lambda mark: mark[1])
+        origin = marks[0][1]
+        previous = origin
+        stages = []
+        for stage, ns in marks:
+            stages.append({
+                'stage': stage,
+                'at_ms': round((ns - origin) / 1e6, 3),
+                'delta_ms': round((ns - previous) / 1e6, 3)
+            })
+            previous = ns
+        return {
+            'token': self.token,
+            'wallet': f"Wallet {self.wallet_idx+1}",
+            'side': self.side,
+            'started_at': self.started_at,
+            'outcome': self.outcome,
+            'signature': self.signature,
+            'error': self.error,
+            'total_ms': round((previous - origin) / 1e6, 3),
+            'stages': stages
+        }
+
+class TraceBuffer:
+    """Bounded buffer of finished trade timelines, oldest dropped first"""
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self._traces = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.finished = 0
+
+    def start(self, token, wallet_idx, side, trigger_ns=None):
+        """
+        Begin a timeline
+
+        Args:
+            token (str): Token mint address
+            wallet_idx (int): Index of the trading wallet
+            side (str): "buy" or "sell"
+            trigger_ns (int): perf_counter_ns() of the trigger, if it happened earlier (optional)
+
+        Returns:
+            TradeTrace: Timeline to mark stages on
+        """
+        return TradeTrace(token, wallet_idx, side, trigger_ns)
+
+    def finish(self, trace, success, signature=None, error=None):
+        """Store a completed timeline"""
+        trace.outcome = 'success' if success else 'failed'
+        trace.signature = signature
+        trace.error = error
+        with self._lock:
+            self._traces.append(trace)
+            self.finished += 1
+
+    def snapshot(self, limit=None, token=None):
+        """
+        Get finished timelines, newest first
+
+        Args:
+            limit (int): Maximum number of timelines (optional)
+            token (str): Only timelines of this token (optional)
+
+        Returns:
+            list: Timeline dicts
+        """
+        with self._lock:
+            traces = list(self._traces)
+        traces.reverse()
+        if token:
+            traces = [trace for trace in traces if trace.token == token]
+        if limit is not None:
+            traces = traces[:limit]
+        return [trace.to_dict() for trace in traces]
+
+    def export(self):
+        """Every stored timeline as a JSON document"""
+        return json.dumps({'stages': STAGES, 'traces': self.snapshot()}, indent=2, default=str)
+
+# Shared by every campaign
+traces = TraceBuffer()
@@ -0,0 +1,108 @@
+import time
+import itertools
+import threading
+from datetime import datetime
+from status_stream import publisher
+
+# One sequence for every history, so records from different campaigns merge in order
+_sequence = itertools.count(1)
+# Held while a record takes its number and is published, so streams see every seq in order
+_sequence_lock = threading.Lock()
+
+class TransactionRecord:
+    """One buy, sell or failure, stored as it happened and rendered only when read"""
+    __slots__ = ('seq', 'time', 'token', 'wallet_idx', 'type', 'amount', 'token_amount', 'tx_hash', 'latency')
+
+    def __init__(self, seq, timestamp, token, wallet_idx, tx_type, amount, token_amount=None, tx_hash=None,
+                 latency=None):
+        self.seq = seq
+        self.time = timestamp  # time.time()
+        self.token = token
+        self.wallet_idx = wallet_idx
+        self.type = tx_type
+        self.amount = amount
+        self.token_amount = token_amount
+        self.tx_hash = tx_hash
+        self.latency = latency  # seconds from send to confirmation
+
+    def to_dict(self):
+        tx = {
+            'seq': self.seq,
+            'timestamp': datetime.fromtimestamp(self.time).strftime("%Y-%m-%d %H:%M:%S"),
+            'time': self.time,
+            'wallet': f"Wallet {self.wallet_idx+1}",
+            'type': self.type,
+            'amount': self.amount,
+            'token_amount': self.token_amount,
+            'tx_hash': self.tx_hash
+        }
+        if self.token is not None:
+            tx['token'] = self.token
+        if self.latency is not None:
+            tx['latency_ms'] = round(self.latency * 1000, 3)
+        return tx
+
+class TransactionHistory:
+    """
+    Fixed-capacity ring buffer of the latest transactions
+
+    Appending overwrites the oldest slot in place. Writers serialize on a
+    short lock; readers never take it, they copy the slot list (a single
+    atomic operation) and order the copy by sequence number.
+    """
+    def __init__(self, capacity=100, token=None, journal=None):
+        """
+        Initialize transaction history
+
+        Args:
+            capacity (int): Number of transactions kept
+            token (str): Token the transactions belong to (optional)
+            journal (TradeJournal): Durable log every transaction is also queued to (optional)
+        """
+        self.capacity = capacity
+        self.token = token
+        self.journal = journal
+        self._slots = [None] * capacity
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, wallet_idx, tx_type, amount, token_amount=None, tx_hash=None, latency=None, wallet=None):
+        """
+        Record a transaction
+
+        Args:
+            latency (float): Seconds from send to confirmation (optional)
+            wallet (str): Wallet address, for the journal (optional)
+
+        Returns:
+            TransactionRecord: The stored record
+        """
+        with _sequence_lock:
+            record = TransactionRecord(next(_sequence), time.time(), self.token, wallet_idx, tx_type, amount,
+                                       token_amount, tx_hash, latency)
+            with self._lock:
+                self._slots[self._count % self.capacity] = record
+                self._count += 1
+            publisher.publish('transaction', record.to_dict, record.seq)
+        if self.journal is not None:
+            self.journal.record(record, wallet)
+        return record
+
+    def snapshot(self):
+        """
+        Get the stored transactions, oldest first
+
+        Returns:
+            tuple: TransactionRecord instances
+        """
+        records = [record for record in self._slots[:] if record is not None]
+        records.sort(key=lambda record: record.seq)
+        return tuple(records)
+
+    def clear(self):
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
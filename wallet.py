@@ -89,6 +89,14 @@ class Transaction:
         # Add a signature to the transaction
         signature = keypair.sign(self)
         return self
+        
+    def serialize(self):
+        """Encode the signed transaction for sendTransaction"""
+        return json.dumps({
+            'recentBlockhash': self.recent_blockhash,
+            'signatures': self.signatures,
+            'instructions': self.instructions
+        }, default=str).encode('utf-8')
 
 class Wallet:
     """Solana wallet implementation"""
@@ -182,9 +190,10 @@ class Wallet:
             Transaction: Signed transaction
         """
         try:
-            # Get recent blockhash
-            blockhash_resp = self.solana_client.client.get_recent_blockhash()
-            blockhash = blockhash_resp['result']['value']['blockhash']
+            # Get recent blockhash from the shared background cache
+            blockhash = self.solana_client.get_blockhash()
+            if not blockhash:
+                raise Exception("No recent blockhash available")
             
             # Set recent blockhash in transaction
             transaction.recent_blockhash = blockhash
@@ -197,26 +206,50 @@ class Wallet:
             logger.error(f"Error signing transaction: {str(e)}")
             return None
             
-    def send_transaction(self, transaction):
+    def sign_with_blockhash(self, transaction, blockhash):
+        """
+        Sign a transaction against a given blockhash, replacing any earlier signature
+        
+        Args:
+            transaction (Transaction): Transaction to sign
+            blockhash (str): Recent blockhash
+            
+        Returns:
+            Transaction: Signed transaction
+        """
+        transaction.recent_blockhash = blockhash
+        transaction.signatures = []
+        transaction.sign(self.keypair)
+        return transaction
+        
+    def send_transaction(self, transaction, trace=None):
         """
         Sign and send a transaction
         
         Args:
             transaction (Transaction): Transaction to send
+            trace (TradeTrace): Timeline to mark the blockhash, sign and send stages on (optional)
             
         Returns:
             str: Transaction signature
         """
         try:
-            # Get recent blockhash
-            blockhash_resp = self.solana_client.client.get_recent_blockhash()
-            blockhash = blockhash_resp['result']['value']['blockhash']
+            # Get recent blockhash from the shared background cache
+            blockhash = self.solana_client.get_blockhash()
+            if not blockhash:
+                raise Exception("No recent blockhash available")
+            if trace is not None:
+                trace.mark('blockhash')
             
-            # Set recent blockhash in transaction
-            transaction.recent_blockhash = blockhash
-            
-            # Sign and send transaction
-            result = self.solana_client.send_transaction(transaction, [self.keypair])
+            # Sign locally, then send the signed bytes
+            self.sign_with_blockhash(transaction, blockhash)
+            payload = transaction.serialize()
+            if trace is not None:
+                trace.mark('sign')
+                
+            result = self.solana_client.send_raw_transaction(payload)
+            if trace is not None:
+                trace.mark('send')
             
             if result and hasattr(result, 'value'):
                 return result.value